@@ -0,0 +1,205 @@
+"""
+Write-behind buffering for answer logging
+With ANSWER_WRITE_MODE=buffered, submit_answer hands its writes to an
+in-process buffer instead of committing them on the request path. A
+background thread flushes the buffer every ANSWER_FLUSH_INTERVAL_MS or as
+soon as ANSWER_FLUSH_ROWS answers are waiting, in one transaction per batch:
+
+- learning_sessions: one multi-row INSERT for the whole batch
+- vocabulary counters: deltas merged per word, one UPDATE per word
+- progress aggregates: deltas merged per (user, day, word type)
+
+The trade-off is durability: answers still in the buffer are lost if the
+process is killed without a shutdown (SIGKILL, OOM, power loss), at most one
+interval's worth. A clean shutdown flushes (FastAPI shutdown event and
+atexit). Stats and review order see an answer only after its flush.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import bindparam, func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import stats
+from models import LearningSession, Vocabulary
+
+logger = logging.getLogger(__name__)
+
+# Columns of learning_sessions a buffered answer carries
+SESSION_FIELDS = ("user_id", "vocabulary_id", "user_answer", "correct_answer", "is_correct", "explanation", "session_date")
+
+
+class AnswerBuffer:
+    """Collects answers and writes them in batches from a background thread.
+
+    Once `max_rows` answers are waiting (e.g. the database is down and
+    flushes keep failing), the submitting request flushes inline, so memory
+    stays bounded and failures surface as errors instead of silent loss.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], flush_interval: float = 0.25,
+                 flush_rows: int = 200, max_rows: int = 5000):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.flush_rows = flush_rows
+        self.max_rows = max_rows
+        self._pending: List[dict] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.failed_flushes = 0
+        self.last_flush_ms = 0.0
+
+    def _ensure_started(self):
+        # Started on first use in each process, so a buffer created before a
+        # pre-fork server forks gets its own thread in every worker
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="answer-buffer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def add(self, answer: dict):
+        """Queue one answer: the session fields plus its word_type"""
+        with self._lock:
+            self._ensure_started()
+            self._pending.append(answer)
+            size = len(self._pending)
+        if size >= self.max_rows:
+            self.flush(raise_errors=True)
+        elif size >= self.flush_rows:
+            self._wakeup.set()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self, raise_errors: bool = False) -> int:
+        """Write everything queued so far; returns the number of answers written"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            start = time.perf_counter()
+            db = self.session_factory()
+            try:
+                write_answers(db, batch)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                if isinstance(e, IntegrityError):
+                    # Words deleted (directly or with their user) after being answered
+                    # would fail every retry; their answers are dropped
+                    kept = answers_for_existing_words(db, batch)
+                    if len(kept) < len(batch):
+                        logger.warning("Dropping %d buffered answers for deleted words", len(batch) - len(kept))
+                    batch = kept
+                with self._lock:
+                    # Keep the batch, ahead of newer answers, for the next attempt
+                    self._pending[:0] = batch
+                self.failed_flushes += 1
+                if raise_errors:
+                    raise
+                logger.exception("Flushing %d buffered answers failed; will retry", len(batch))
+                return 0
+            finally:
+                db.close()
+            self.flushes += 1
+            self.flushed_rows += len(batch)
+            self.last_flush_ms = round((time.perf_counter() - start) * 1000, 2)
+            return len(batch)
+
+    def close(self):
+        """Stop the flusher and write whatever is left"""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval + 5)
+        try:
+            self.flush(raise_errors=True)
+        except Exception:
+            with self._lock:
+                lost = len(self._pending)
+            logger.exception("Final flush failed; %d buffered answers were not written", lost)
+
+    def stats(self) -> dict:
+        with self._lock:
+            buffered = len(self._pending)
+        return {
+            "buffered": buffered,
+            "flushes": self.flushes,
+            "flushed_rows": self.flushed_rows,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_ms": self.last_flush_ms,
+        }
+
+
+def write_answers(db: Session, answers: List[dict]):
+    """Apply a batch of answers in the caller's transaction, merging what can be merged"""
+    db.execute(insert(LearningSession), [{field: answer[field] for field in SESSION_FIELDS} for answer in answers])
+
+    counters: Dict[int, dict] = {}
+    aggregates: Dict[tuple, List[int]] = defaultdict(lambda: [0, 0])
+    for answer in answers:
+        counter = counters.setdefault(answer["vocabulary_id"], {
+            "vocab_id": answer["vocabulary_id"], "correct": 0, "incorrect": 0, "reviewed": answer["session_date"]
+        })
+        counter["correct" if answer["is_correct"] else "incorrect"] += 1
+        counter["reviewed"] = max(counter["reviewed"], answer["session_date"])
+        key = (answer["session_date"].date(), answer["user_id"], answer["word_type"])
+        aggregates[key][0] += 1
+        aggregates[key][1] += 1 if answer["is_correct"] else 0
+
+    vocabulary = Vocabulary.__table__
+    db.execute(
+        vocabulary.update()
+        .where(vocabulary.c.id == bindparam("vocab_id"))
+        .values(
+            times_correct=func.coalesce(vocabulary.c.times_correct, 0) + bindparam("correct"),
+            times_incorrect=func.coalesce(vocabulary.c.times_incorrect, 0) + bindparam("incorrect"),
+            last_reviewed=bindparam("reviewed")
+        ),
+        list(counters.values())
+    )
+
+    # Days in order, so the streak upserts see them as they happened
+    for (day, user_id, word_type), (count, correct) in sorted(aggregates.items(), key=lambda item: item[0][:2]):
+        stats.apply_answer_deltas(db, user_id, day, word_type, count, correct)
+
+
+def answers_for_existing_words(db: Session, answers: List[dict]) -> List[dict]:
+    ids = {answer["vocabulary_id"] for answer in answers}
+    existing = set(db.scalars(select(Vocabulary.id).where(Vocabulary.id.in_(ids))))
+    return [answer for answer in answers if answer["vocabulary_id"] in existing]
+
+
+def buffer_from_env(session_factory: Callable[[], Session]) -> Optional[AnswerBuffer]:
+    """An AnswerBuffer when ANSWER_WRITE_MODE=buffered, otherwise None (synchronous commits)"""
+    mode = os.getenv("ANSWER_WRITE_MODE", "sync").lower()
+    if mode == "sync":
+        return None
+    if mode != "buffered":
+        raise ValueError(f"ANSWER_WRITE_MODE must be 'sync' or 'buffered', not {mode!r}")
+    return AnswerBuffer(
+        session_factory,
+        flush_interval=float(os.getenv("ANSWER_FLUSH_INTERVAL_MS", "250")) / 1000,
+        flush_rows=int(os.getenv("ANSWER_FLUSH_ROWS", "200")),
+        max_rows=int(os.getenv("ANSWER_BUFFER_MAX_ROWS", "5000"))
+    )
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Answer feedback latency benchmark
+Compares time to first feedback for POST /api/learning/{user_id}/answer
+(one JSON response after the whole grading completion) and its SSE variant
+/answer/stream (verdict at once, explanation chunks as they are generated).
+The grading model is simulated with a configurable time to first token and
+per-token delay; the app is served by uvicorn in a background thread, against
+a throwaway SQLite database.
+
+Usage (from bonus-app/backend):
+    python benchmarks/bench_answer_stream.py [--requests 10] [--first-token-ms 400] [--token-ms 25] [--tokens 60]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_answer_stream.db"
+os.environ["OPENAI_API_KEY"] = ""
+os.environ["ANSWER_WRITE_MODE"] = "sync"
+
+import httpx
+import uvicorn
+
+import main
+from llm_client import client_from_env
+from llm_providers import TaskLLM
+from main import LearningSession, SessionLocal, User, Vocabulary, app
+from models import Base
+
+
+class SimulatedModel:
+    """Stands in for a provider: the same latency profile, complete or streamed"""
+
+    name = "simulated"
+    transient_errors = ()
+
+    def __init__(self, first_token: float, per_token: float, tokens: int):
+        self.first_token = first_token
+        self.per_token = per_token
+        self.tokens = tokens
+
+    def chat(self, model, messages, temperature, timeout):
+        time.sleep(self.first_token + self.per_token * self.tokens)
+        return json.dumps({"is_correct": True, "correct_answer": "hablar", "explanation": "word " * self.tokens})
+
+    def chat_stream(self, model, messages, temperature, timeout):
+        time.sleep(self.first_token)
+        for _ in range(self.tokens):
+            yield "word "
+            time.sleep(self.per_token)
+
+    def warm_up(self, model):
+        pass
+
+
+def seed():
+    db = SessionLocal()
+    user = User(username="bench_answer_stream", native_language="en")
+    db.add(user)
+    db.flush()
+    vocab = Vocabulary(user_id=user.id, word_spanish="hablar", word_native="to speak", word_type="verb",
+                       is_verb=True, times_correct=0, times_incorrect=0)
+    db.add(vocab)
+    db.commit()
+    ids = user.id, vocab.id
+    db.close()
+    return ids
+
+
+def session_count():
+    db = SessionLocal()
+    try:
+        return db.query(LearningSession).count()
+    finally:
+        db.close()
+
+
+def cli():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--first-token-ms", type=float, default=400)
+    parser.add_argument("--token-ms", type=float, default=25)
+    parser.add_argument("--tokens", type=int, default=60)
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=main.engine)
+    model = SimulatedModel(args.first_token_ms / 1000, args.token_ms / 1000, args.tokens)
+    main.llms.tasks["grading"] = TaskLLM("grading", model, "simulated", client_from_env())
+    user_id, vocab_id = seed()
+    # A real server: the test client would buffer the event stream
+    server = uvicorn.Server(uvicorn.Config(app, port=args.port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    client = httpx.Client(base_url=f"http://127.0.0.1:{args.port}", timeout=60)
+    payload = {"vocabulary_id": vocab_id, "user_answer": "Hablar"}
+
+    blocking = []
+    for i in range(args.requests):
+        payload["user_answer"] = f"hablar {i}"  # distinct answers, so nothing is coalesced
+        start = time.perf_counter()
+        client.post(f"/api/learning/{user_id}/answer", json=payload).raise_for_status()
+        blocking.append((time.perf_counter() - start) * 1000)
+
+    verdict, first_chunk, done = [], [], []
+    before = session_count()
+    for i in range(args.requests):
+        payload["user_answer"] = f"hablar {i}"
+        start = time.perf_counter()
+        seen = set()
+        with client.stream("POST", f"/api/learning/{user_id}/answer/stream", json=payload) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line.startswith("event: ") or line[7:] in seen:
+                    continue
+                seen.add(line[7:])
+                elapsed = (time.perf_counter() - start) * 1000
+                {"verdict": verdict, "explanation": first_chunk, "done": done}[line[7:]].append(elapsed)
+    assert session_count() - before == args.requests, "streamed answers were not all saved"
+    server.should_exit = True
+
+    print(f"simulated model: first token {args.first_token_ms:.0f} ms, {args.tokens} tokens x {args.token_ms:.0f} ms")
+    print(f"{'endpoint':<16} {'first feedback ms':>18} {'first text ms':>14} {'complete ms':>12}")
+    print(f"{'/answer':<16} {statistics.median(blocking):>18.1f} {statistics.median(blocking):>14.1f}"
+          f" {statistics.median(blocking):>12.1f}")
+    print(f"{'/answer/stream':<16} {statistics.median(verdict):>18.1f} {statistics.median(first_chunk):>14.1f}"
+          f" {statistics.median(done):>12.1f}")
+
+
+if __name__ == "__main__":
+    cli()
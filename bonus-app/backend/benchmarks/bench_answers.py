@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Answer logging benchmark
+Submits answers from concurrent threads through submit_answer() with
+synchronous commits and with the write-behind buffer, and reports answers/s,
+commits and SQL statements per answer. Grading uses the local fallback, so
+no LLM is needed.
+
+Usage (from bonus-app/backend):
+    python benchmarks/bench_answers.py [--answers 5000] [--threads 8]
+    python benchmarks/bench_answers.py --database-url postgresql://...   # migrated database
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+_args = argparse.ArgumentParser(add_help=False)
+_args.add_argument("--database-url")
+_url = _args.parse_known_args()[0].database_url
+os.environ["DATABASE_URL"] = _url or f"sqlite:///{tempfile.mkdtemp()}/bench_answers.db"
+os.environ["OPENAI_API_KEY"] = ""
+os.environ["ANSWER_WRITE_MODE"] = "sync"
+
+from sqlalchemy import event
+
+import main
+from answer_buffer import AnswerBuffer
+from main import SessionLocal, User, Vocabulary, LearningAnswer
+from models import Base
+
+WORDS = [("casa", "house", "noun"), ("hablar", "to speak", "verb"), ("rojo", "red", "adjective")]
+
+
+class Counter:
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+
+    def install(self, engine):
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        event.listen(engine, "commit", self._on_commit)
+
+    def _on_execute(self, *args):
+        self.statements += 1
+
+    def _on_commit(self, *args):
+        self.commits += 1
+
+
+def seed(users: int):
+    db = SessionLocal()
+    suffix = int(time.time())
+    targets = []
+    for i in range(users):
+        user = User(username=f"bench_answers_{suffix}_{i}", native_language="en")
+        db.add(user)
+        db.flush()
+        for spanish, native, word_type in WORDS:
+            vocab = Vocabulary(user_id=user.id, word_spanish=spanish, word_native=native, word_type=word_type,
+                               is_verb=word_type == "verb", times_correct=0, times_incorrect=0)
+            db.add(vocab)
+            db.flush()
+            targets.append((user.id, vocab.id, spanish))
+    db.commit()
+    db.close()
+    return targets
+
+
+def submit(target):
+    user_id, vocab_id, spanish = target
+    db = SessionLocal()
+    try:
+        answer = spanish if random.random() < 0.7 else "no sé"
+        main.submit_answer(user_id, LearningAnswer(vocabulary_id=vocab_id, user_answer=answer), db)
+    finally:
+        db.close()
+
+
+def run(name, targets, answers, threads, counter):
+    counter.statements = counter.commits = 0
+    work = [random.choice(targets) for _ in range(answers)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(submit, work))
+    if main.answer_buffer is not None:
+        main.answer_buffer.close()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<10} {answers / elapsed:>10.0f} {counter.commits / answers:>14.3f}"
+        f" {counter.statements / answers:>17.2f}"
+    )
+
+
+def cli():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", help="Defaults to a throwaway SQLite database")
+    parser.add_argument("--answers", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--flush-interval-ms", type=float, default=250)
+    parser.add_argument("--flush-rows", type=int, default=200)
+    args = parser.parse_args()
+
+    if not args.database_url:
+        Base.metadata.create_all(bind=main.engine)
+    random.seed(0)
+    targets = seed(args.users)
+    counter = Counter()
+    counter.install(main.engine)
+
+    print(f"{args.answers} answers, {args.threads} threads, {main.engine.dialect.name}")
+    print(f"{'mode':<10} {'answers/s':>10} {'commits/answer':>14} {'statements/answer':>17}")
+    main.answer_buffer = None
+    run("sync", targets, args.answers, args.threads, counter)
+    main.answer_buffer = AnswerBuffer(SessionLocal, args.flush_interval_ms / 1000, args.flush_rows)
+    run("buffered", targets, args.answers, args.threads, counter)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Batch upload throughput benchmark
+Words per second for adding a page of N words as N single-word image uploads
+(one OCR run and one LLM request each) and as one batch upload
+(/from-image/batch: one OCR run, one LLM request for every new word, one
+INSERT per table). OCR and the LLM are simulated with configurable latency;
+the app runs in-process against a throwaway SQLite database.
+
+Usage (from bonus-app/backend):
+    python benchmarks/bench_batch_upload.py [--words 30] [--ocr-ms 400] [--ocr-word-ms 15] [--llm-ms 500] [--llm-word-ms 150]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_batch_upload.db"
+os.environ["OPENAI_API_KEY"] = ""
+os.environ["MEDIA_CACHE_MAX_MB"] = "0"
+
+from fastapi.testclient import TestClient
+
+import main
+from llm_client import client_from_env
+from llm_providers import TaskLLM
+from main import SessionLocal, User, app
+from models import Base
+
+NOUNS = ["casa", "perro", "gato", "libro", "mesa", "silla", "ventana", "puerta", "ciudad", "calle", "coche", "tren",
+         "agua", "pan", "leche", "manzana", "naranja", "queso", "árbol", "flor", "mar", "montaña", "río", "cielo",
+         "sol", "luna", "año", "día", "noche", "semana", "amigo", "familia", "madre", "padre", "hermano", "niño"]
+VERBS = ["hablar", "comer", "vivir", "tener", "hacer", "poder", "decir", "querer", "llegar", "pensar", "abolir"]
+
+
+class SimulatedModel:
+    """Stands in for the word analysis model: a fixed cost per request plus a cost per word analyzed"""
+
+    name = "simulated"
+    transient_errors = ()
+
+    def __init__(self, per_request: float, per_word: float):
+        self.per_request = per_request
+        self.per_word = per_word
+        self.requests = 0
+
+    def chat(self, model, messages, temperature, timeout):
+        self.requests += 1
+        prompt = messages[-1]["content"]
+        batch = re.search(r"in order:\n(\[.*\])", prompt)
+        terms = json.loads(batch.group(1)) if batch else [re.search(r"The Spanish word: (.+)", prompt).group(1)]
+        time.sleep(self.per_request + self.per_word * len(terms))
+        words = [{"word_spanish": term, "word_native": f"{term} (en)", "word_type": "verb" if term in VERBS else "noun",
+                  "is_verb": term in VERBS, "conjugation": None} for term in terms]
+        return json.dumps({"words": words} if batch else words[0])
+
+    def warm_up(self, model):
+        pass
+
+
+def new_user(name: str) -> int:
+    db = SessionLocal()
+    user = User(username=name, native_language="en")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+    return user_id
+
+
+def cli():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--words", type=int, default=30)
+    parser.add_argument("--ocr-ms", type=float, default=400, help="OCR cost per image")
+    parser.add_argument("--ocr-word-ms", type=float, default=15, help="Additional OCR cost per word on the image")
+    parser.add_argument("--llm-ms", type=float, default=500, help="LLM cost per request")
+    parser.add_argument("--llm-word-ms", type=float, default=150, help="LLM cost per word analyzed")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=main.engine)
+    model = SimulatedModel(args.llm_ms / 1000, args.llm_word_ms / 1000)
+    main.llms.tasks["word"] = TaskLLM("word", model, "simulated", client_from_env())
+
+    def ocr(content: bytes) -> str:
+        text = content.decode()
+        time.sleep((args.ocr_ms + args.ocr_word_ms * len(text.splitlines())) / 1000)
+        return text
+
+    main.extract_text_from_image = ocr
+    client = TestClient(app)
+    words = (NOUNS + VERBS)[:args.words]
+    page = "\n".join(f"{i + 1}. {word} - translation" for i, word in enumerate(words)).encode()
+
+    results = {}
+    user_id = new_user("bench_batch_upload_single")
+    model.requests = 0
+    start = time.perf_counter()
+    for word in words:
+        client.post(f"/api/vocabulary/{user_id}/from-image",
+                    files={"file": ("word.png", word.encode(), "image/png")}).raise_for_status()
+    results["single uploads"] = (len(words), len(words), time.perf_counter() - start, model.requests)
+
+    user_id = new_user("bench_batch_upload_batch")
+    model.requests = 0
+    start = time.perf_counter()
+    response = client.post(f"/api/vocabulary/{user_id}/from-image/batch",
+                           files={"file": ("page.png", page, "image/png")})
+    response.raise_for_status()
+    results["one batch upload"] = (1, len(response.json()["added"]), time.perf_counter() - start, model.requests)
+
+    print(f"{len(words)} words; OCR {args.ocr_ms:.0f} ms + {args.ocr_word_ms:.0f} ms/word,"
+          f" LLM {args.llm_ms:.0f} ms + {args.llm_word_ms:.0f} ms/word")
+    print(f"{'mode':<18} {'uploads':>8} {'words':>6} {'LLM requests':>13} {'seconds':>8} {'words/s':>8}")
+    for mode, (uploads, added, seconds, requests) in results.items():
+        print(f"{mode:<18} {uploads:>8} {added:>6} {requests:>13} {seconds:>8.2f} {added / seconds:>8.1f}")
+
+
+if __name__ == "__main__":
+    cli()
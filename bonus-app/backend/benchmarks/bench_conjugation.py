@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Conjugation engine benchmark
+Checks the rule-based engine against the bundled corpus and reports accuracy,
+local hit rate (verbs answered without an LLM call) and time per verb.
+
+Usage (from bonus-app/backend):
+    python benchmarks/bench_conjugation.py
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from conjugation import PERSONS, ConjugationEngine, conjugate
+
+CORPUS = Path(__file__).resolve().parent / "conjugation_corpus.json"
+ROUNDS = 200
+
+
+def main():
+    corpus = json.loads(CORPUS.read_text(encoding="utf-8"))
+    engine = ConjugationEngine()
+
+    wrong = []
+    misses = []
+    for verb, expected in corpus.items():
+        forms = engine.conjugate(verb)
+        if forms is None:
+            misses.append(verb)
+        elif [forms[p] for p in PERSONS] != expected:
+            wrong.append((verb, [forms[p] for p in PERSONS], expected))
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for verb in corpus:
+            conjugate(verb)
+    per_call_us = (time.perf_counter() - start) / (ROUNDS * len(corpus)) * 1e6
+
+    hits = len(corpus) - len(misses)
+    print(f"Corpus verbs:      {len(corpus)}")
+    print(f"Local hit rate:    {hits / len(corpus):.1%} ({hits} hits, {len(misses)} sent to LLM)")
+    print(f"Accuracy on hits:  {(hits - len(wrong)) / hits:.1%}")
+    print(f"Time per verb:     {per_call_us:.1f} µs")
+    print(f"Hits by pattern:   {engine.stats()['hits_by_pattern']}")
+    if misses:
+        print(f"LLM fallbacks:     {', '.join(misses)}")
+    for verb, got, expected in wrong:
+        print(f"WRONG {verb}: got {got}, expected {expected}")
+
+    return 1 if wrong else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Vocabulary ingestion benchmark
+Counts commits and DB round trips per added word for the previous write path
+(commit, refresh, LLM call, second commit) and for ingest_word(), against a
+throwaway SQLite database. Conjugations come from the local engine, so no
+LLM is needed.
+
+Usage (from bonus-app/backend):
+    python benchmarks/bench_ingest.py [--words 200]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+_tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/bench_ingest.db"
+os.environ["OPENAI_API_KEY"] = ""
+
+from sqlalchemy import event
+
+import main
+from main import SessionLocal, User, Vocabulary, VerbConjugation, VocabularyResponse
+from models import Base
+
+WORDS = [
+    ("hablar", "to speak", "verb"),
+    ("casa", "house", "noun"),
+    ("comer", "to eat", "verb"),
+    ("rojo", "red", "adjective"),
+    ("tener", "to have", "verb"),
+    ("rápido", "fast", "adverb"),
+]
+
+
+class Counter:
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+
+    def install(self, engine):
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        event.listen(engine, "commit", self._on_commit)
+
+    def _on_execute(self, *args):
+        self.statements += 1
+
+    def _on_commit(self, *args):
+        self.commits += 1
+
+
+def legacy_add_word(db, user_id, word_spanish, word_native, word_type):
+    """The write path as it was before ingest_word()"""
+    user = db.query(User).filter(User.id == user_id).first()
+    vocab = Vocabulary(
+        user_id=user.id,
+        word_spanish=word_spanish,
+        word_native=word_native,
+        word_type=word_type,
+        is_verb=word_type.lower() == 'verb'
+    )
+    db.add(vocab)
+    db.commit()
+    db.refresh(vocab)
+    if vocab.is_verb:
+        conjugation_data = main.get_verb_conjugation(word_spanish)
+        db.add(VerbConjugation(vocabulary_id=vocab.id, **conjugation_data))
+        db.commit()
+    # FastAPI serialises the returned (expired) ORM object
+    return VocabularyResponse.model_validate(vocab, from_attributes=True)
+
+
+def new_add_word(db, user_id, word_spanish, word_native, word_type):
+    main.get_user_or_404(db, user_id)
+    return main.ingest_word(db, user_id, {
+        "word_spanish": word_spanish,
+        "word_native": word_native,
+        "word_type": word_type,
+        "is_verb": word_type.lower() == 'verb'
+    })
+
+
+def create_users(name, count):
+    """One user per pass through WORDS, so no user is given the same word twice"""
+    db = SessionLocal()
+    users = [User(username=f"bench_{name}_{i}", native_language="en") for i in range(count)]
+    db.add_all(users)
+    db.commit()
+    user_ids = [user.id for user in users]
+    db.close()
+    return user_ids
+
+
+def run(name, add_word, words, counter):
+    user_ids = create_users(name, -(-words // len(WORDS)))
+    counter.statements = counter.commits = 0
+    start = time.perf_counter()
+    for i in range(words):
+        spanish, native, word_type = WORDS[i % len(WORDS)]
+        db = SessionLocal()
+        try:
+            add_word(db, user_ids[i // len(WORDS)], spanish, native, word_type)
+        finally:
+            db.close()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<8} {counter.commits / words:>12.2f} {counter.statements / words:>15.2f}"
+        f" {(counter.statements + counter.commits) / words:>16.2f} {elapsed / words * 1000:>8.2f}"
+    )
+
+
+def cli():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--words", type=int, default=200)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=main.engine)
+    counter = Counter()
+    counter.install(main.engine)
+
+    print(f"{args.words} words, {sum(w[2] == 'verb' for w in WORDS)}/{len(WORDS)} verbs")
+    # Round trips = SQL statements + COMMITs
+    print(f"{'path':<8} {'commits/word':>12} {'statements/word':>15} {'round trips/word':>16} {'ms/word':>8}")
+    run("legacy", legacy_add_word, args.words, counter)
+    run("ingest", new_add_word, args.words, counter)
+
+
+if __name__ == "__main__":
+    cli()
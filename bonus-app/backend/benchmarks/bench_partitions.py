@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+learning_sessions partitioning benchmark
+Loads the same synthetic answer history into an unpartitioned table and into
+a monthly RANGE-partitioned one (the layout of migration 0004), then compares
+single-row insert latency, the hot read queries and removing the oldest month
+(DELETE vs DETACH + DROP PARTITION). Needs Postgres; everything lives in a
+scratch schema that is dropped afterwards.
+
+Usage (from bonus-app/backend):
+    python benchmarks/bench_partitions.py --database-url postgresql://... [--rows 10000000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, text
+
+SCHEMA = "bench_partitions"
+LOAD_CHUNK = 1_000_000
+
+COLUMNS = """
+    id BIGINT NOT NULL,
+    user_id INTEGER NOT NULL,
+    vocabulary_id INTEGER NOT NULL,
+    user_answer TEXT,
+    correct_answer TEXT,
+    is_correct BOOLEAN,
+    explanation TEXT,
+    session_date TIMESTAMP NOT NULL
+"""
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def timed(conn, sql, params_fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        params = params_fn()
+        start = time.perf_counter()
+        conn.execute(text(sql), params).fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def create_tables(conn, first_month: date, months: int):
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    conn.execute(text(f"CREATE TABLE {SCHEMA}.plain ({COLUMNS}, PRIMARY KEY (id))"))
+    conn.execute(text(
+        f"CREATE TABLE {SCHEMA}.partitioned ({COLUMNS}, PRIMARY KEY (id, session_date)) "
+        "PARTITION BY RANGE (session_date)"
+    ))
+    conn.execute(text(f"CREATE TABLE {SCHEMA}.partitioned_default PARTITION OF {SCHEMA}.partitioned DEFAULT"))
+    for offset in range(months + 2):
+        month = add_months(first_month, offset)
+        conn.execute(text(
+            f"CREATE TABLE {SCHEMA}.partitioned_{month:%Y_%m} PARTITION OF {SCHEMA}.partitioned "
+            f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+        ))
+    for table in ("plain", "partitioned"):
+        conn.execute(text(f"CREATE INDEX ON {SCHEMA}.{table} (user_id, session_date)"))
+        conn.execute(text(f"CREATE INDEX ON {SCHEMA}.{table} (vocabulary_id)"))
+
+
+def load(conn, table: str, rows: int, users: int, start: datetime, span_seconds: int) -> float:
+    """Bulk-load `rows` sessions spread evenly over the time span; returns seconds"""
+    began = time.perf_counter()
+    for lower in range(1, rows + 1, LOAD_CHUNK):
+        upper = min(rows, lower + LOAD_CHUNK - 1)
+        conn.execute(text(
+            f"INSERT INTO {SCHEMA}.{table} "
+            "SELECT g, (g::bigint * 7919) % :users + 1, (g::bigint * 104729) % (:users * 50) + 1, "
+            "       'respuesta', 'respuesta', g % 3 <> 0, repeat(md5(g::text), 3), "
+            "       :start + make_interval(secs => (g::bigint * :span / :rows)) "
+            "FROM generate_series(:lower, :upper) AS g"
+        ), {"users": users, "start": start, "span": span_seconds, "rows": rows, "lower": lower, "upper": upper})
+        conn.commit()
+    conn.execute(text(f"ANALYZE {SCHEMA}.{table}"))
+    conn.commit()
+    return time.perf_counter() - began
+
+
+def report(name, samples):
+    print(
+        f"  {name:<28} p50 {statistics.median(samples):>8.3f} ms"
+        f"   p95 {percentile(samples, 0.95):>8.3f} ms   p99 {percentile(samples, 0.99):>8.3f} ms"
+    )
+
+
+def cli():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"), required=not os.getenv("BENCH_DATABASE_URL"))
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--inserts", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema")
+    args = parser.parse_args()
+
+    random.seed(0)
+    engine = create_engine(args.database_url)
+    now = datetime.utcnow().replace(microsecond=0)
+    first_month = add_months(now.date().replace(day=1), -args.months)
+    start = datetime.combine(first_month, datetime.min.time())
+    span_seconds = int((now - start).total_seconds())
+
+    with engine.connect() as conn:
+        create_tables(conn, first_month, args.months)
+        conn.commit()
+
+        print(f"{args.rows:,} sessions, {args.users:,} users, {args.months} months")
+        for table in ("plain", "partitioned"):
+            seconds = load(conn, table, args.rows, args.users, start, span_seconds)
+            size = conn.execute(text(
+                "SELECT sum(pg_indexes_size(c.oid)) FROM pg_class c "
+                "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "WHERE n.nspname = :schema AND c.relkind = 'r' AND c.relname LIKE :table"
+            ), {"schema": SCHEMA, "table": f"{table}%"}).scalar()
+            print(f"{table}: loaded in {seconds:.1f} s, indexes {size / 2**20:.0f} MiB")
+
+        next_id = [args.rows]
+
+        def new_row():
+            next_id[0] += 1
+            return {"id": next_id[0], "user": random.randrange(1, args.users + 1), "at": datetime.utcnow()}
+
+        recent = lambda: {"user": random.randrange(1, args.users + 1), "since": now - timedelta(days=30)}
+        month = add_months(first_month, args.months // 2)
+        month_range = lambda: {"lower": month, "upper": add_months(month, 1),
+                               "user": random.randrange(1, args.users + 1)}
+
+        for table in ("plain", "partitioned"):
+            print(table)
+            samples = []
+            for _ in range(args.inserts):
+                params = new_row()
+                began = time.perf_counter()
+                conn.execute(text(
+                    f"INSERT INTO {SCHEMA}.{table} VALUES "
+                    "(:id, :user, 1, 'respuesta', 'respuesta', true, 'explicación', :at)"
+                ), params)
+                conn.commit()
+                samples.append((time.perf_counter() - began) * 1000)
+            report("insert + commit", samples)
+            report("user history, last 30 days", timed(conn,
+                f"SELECT * FROM {SCHEMA}.{table} WHERE user_id = :user AND session_date >= :since "
+                "ORDER BY session_date DESC LIMIT 50", recent, args.queries))
+            report("user answers in one month", timed(conn,
+                f"SELECT count(*) FROM {SCHEMA}.{table} WHERE user_id = :user "
+                "AND session_date >= :lower AND session_date < :upper", month_range, args.queries))
+            report("all answers in one month", timed(conn,
+                f"SELECT count(*) FROM {SCHEMA}.{table} "
+                "WHERE session_date >= :lower AND session_date < :upper", month_range, 5))
+            conn.commit()
+
+        print("drop the oldest month")
+        began = time.perf_counter()
+        conn.execute(text(f"DELETE FROM {SCHEMA}.plain WHERE session_date < :upper"),
+                     {"upper": add_months(first_month, 1)})
+        conn.commit()
+        print(f"  plain: DELETE                  {time.perf_counter() - began:>8.2f} s")
+        began = time.perf_counter()
+        partition = f"{SCHEMA}.partitioned_{first_month:%Y_%m}"
+        conn.execute(text(f"ALTER TABLE {SCHEMA}.partitioned DETACH PARTITION {partition}"))
+        conn.execute(text(f"DROP TABLE {partition}"))
+        conn.commit()
+        print(f"  partitioned: DETACH + DROP     {time.perf_counter() - began:>8.2f} s")
+
+        if not args.keep:
+            conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+            conn.commit()
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Vocabulary list serialization benchmark
+Times GET /api/vocabulary/{user_id} for 1k and 10k-word decks with the
+previous path (ORM objects validated into List[VocabularyResponse]) and the
+current one (selected columns serialized by orjson), and reports payload
+size uncompressed, gzip and brotli. Runs in-process against a throwaway
+SQLite database.
+
+Usage (from bonus-app/backend):
+    python benchmarks/bench_serialization.py [--sizes 1000 10000] [--repeat 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench_serialization.db"
+os.environ["OPENAI_API_KEY"] = ""
+
+from fastapi import Depends
+from fastapi.testclient import TestClient
+
+import main
+from main import SessionLocal, User, Vocabulary, VocabularyResponse, app, get_db
+from models import Base
+
+WORD_TYPES = ("noun", "verb", "adjective", "adverb")
+
+
+@app.get("/bench/legacy-vocabulary/{user_id}", response_model=List[VocabularyResponse])
+def legacy_get_vocabulary(user_id: int, db=Depends(get_db)):
+    """The list endpoint as it was before the orjson path"""
+    return db.query(Vocabulary).filter(Vocabulary.user_id == user_id).all()
+
+
+def seed(words: int) -> int:
+    db = SessionLocal()
+    user = User(username=f"bench_serialization_{words}", native_language="en")
+    db.add(user)
+    db.flush()
+    start = datetime(2026, 1, 1)
+    db.add_all([
+        Vocabulary(user_id=user.id, word_spanish=f"palabra número {i}", word_native=f"word number {i}",
+                   word_type=WORD_TYPES[i % 4], is_verb=i % 4 == 1, created_at=start + timedelta(seconds=i * 37))
+        for i in range(words)
+    ])
+    db.commit()
+    user_id = user.id
+    db.close()
+    return user_id
+
+
+def measure(client, path, repeat):
+    """(median ms, {encoding: body bytes}) for one endpoint"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(path, headers={"Accept-Encoding": "identity"})
+        timings.append((time.perf_counter() - start) * 1000)
+    sizes = {"identity": len(response.content)}
+    body = response.json()
+    for encoding in ("gzip", "br"):
+        compressed = client.get(path, headers={"Accept-Encoding": encoding})
+        assert compressed.headers.get("content-encoding") == encoding
+        assert compressed.json() == body
+        sizes[encoding] = int(compressed.headers["content-length"])
+    return statistics.median(timings), sizes, body
+
+
+def cli():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=main.engine)
+    client = TestClient(app)
+    print(f"{'words':>6} {'path':<8} {'ms/request':>10} {'identity KB':>12} {'gzip KB':>8} {'br KB':>8}")
+    for words in args.sizes:
+        user_id = seed(words)
+        results = {}
+        for name, path in (("legacy", f"/bench/legacy-vocabulary/{user_id}"), ("orjson", f"/api/vocabulary/{user_id}")):
+            measure(client, path, 2)  # warm-up
+            results[name] = measure(client, path, args.repeat)
+        assert results["legacy"][2] == results["orjson"][2], "payloads differ"
+        for name, (ms, sizes, _) in results.items():
+            print(
+                f"{words:>6} {name:<8} {ms:>10.1f} {sizes['identity'] / 1024:>12.1f}"
+                f" {sizes['gzip'] / 1024:>8.1f} {sizes['br'] / 1024:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    cli()
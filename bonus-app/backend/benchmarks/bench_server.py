@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Server throughput benchmark
+Starts the API as the single-process `uvicorn main:app` and as the gunicorn
+multi-worker setup (gunicorn.conf.py), drives both with the same concurrent
+read mix (vocabulary list, learning question, progress stats) and reports
+requests/s and latency percentiles. Uses a throwaway SQLite database unless
+--database-url points at a migrated one.
+
+Usage (from bonus-app/backend):
+    python benchmarks/bench_server.py [--seconds 20] [--clients 32] [--workers N]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND = Path(__file__).resolve().parent.parent
+WORDS = 300
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def prepare(database_url):
+    """Migrate the database and create a user with a vocabulary; returns the user id"""
+    env = dict(os.environ, DATABASE_URL=database_url)
+    subprocess.run(["alembic", "upgrade", "head"], cwd=BACKEND, env=env, check=True, capture_output=True)
+    sys.path.insert(0, str(BACKEND))
+    os.environ["DATABASE_URL"] = database_url
+    from models import User, Vocabulary
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    with Session(create_engine(database_url)) as db:
+        user = User(username=f"bench_server_{int(time.time())}", native_language="en")
+        db.add(user)
+        db.flush()
+        db.add_all([
+            Vocabulary(user_id=user.id, word_spanish=f"palabra{i}", word_native=f"word{i}", word_type="noun",
+                       is_verb=False, times_correct=i % 4, times_incorrect=i % 3)
+            for i in range(WORDS)
+        ])
+        db.commit()
+        return user.id
+
+
+def start_server(mode, port, database_url, workers):
+    env = dict(os.environ, DATABASE_URL=database_url, OPENAI_API_KEY="", PYTHONUNBUFFERED="1")
+    if mode == "uvicorn":
+        command = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+                   "--log-level", "warning"]
+    else:
+        command = ["gunicorn", "-c", "gunicorn.conf.py", "main:app", "--bind", f"127.0.0.1:{port}",
+                   "--log-level", "warning"]
+        if workers:
+            command += ["--workers", str(workers)]
+    process = subprocess.Popen(command, cwd=BACKEND, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{mode} did not start")
+
+
+def drive(port, user_id, seconds, clients):
+    paths = [f"/api/vocabulary/{user_id}", f"/api/learning/{user_id}/question", f"/api/users/{user_id}/stats"]
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + seconds
+
+    def client():
+        local, failed = [], 0
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=30) as http:
+            while time.monotonic() < stop_at:
+                start = time.perf_counter()
+                path = random.choice(paths)
+                try:
+                    try:
+                        ok = http.get(path).status_code == 200
+                    except (httpx.RemoteProtocolError, httpx.ReadError):
+                        # A recycled worker closed the keep-alive connection as the
+                        # request went out; retry once like browsers do for GETs
+                        ok = http.get(path).status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    local.append((time.perf_counter() - start) * 1000)
+                else:
+                    failed += 1
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    began = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0], time.monotonic() - began
+
+
+def cli():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url")
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--workers", type=int, help="gunicorn workers (default: gunicorn.conf.py)")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench_server.db"
+    user_id = prepare(database_url)
+    print(f"{os.cpu_count()} CPUs, {args.clients} clients, {args.seconds:.0f} s per mode")
+    print(f"{'mode':<10} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for mode in ("uvicorn", "gunicorn"):
+        process = start_server(mode, args.port, database_url, args.workers)
+        try:
+            drive(args.port, user_id, 2, args.clients)  # warm-up
+            latencies, errors, elapsed = drive(args.port, user_id, args.seconds, args.clients)
+        finally:
+            process.terminate()
+            process.wait(timeout=60)
+        print(
+            f"{mode:<10} {len(latencies) / elapsed:>8.0f} {statistics.median(latencies):>8.1f}"
+            f" {percentile(latencies, 0.95):>8.1f} {percentile(latencies, 0.99):>8.1f} {errors:>7}"
+        )
+
+
+if __name__ == "__main__":
+    cli()
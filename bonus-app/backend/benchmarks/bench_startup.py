@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Backend startup benchmark
+Measures `import main` (with a per-package breakdown from `python -X
+importtime`) and the time from launching `uvicorn main:app` to the first 200
+on `/`, then appends the run to benchmarks/results/startup.jsonl so startup
+time can be tracked across commits.
+
+Usage (from bonus-app/backend):
+    python benchmarks/bench_startup.py [--runs 5] [--top 12] [--no-record]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+BACKEND = Path(__file__).resolve().parent.parent
+RESULTS = Path(__file__).resolve().parent / "results" / "startup.jsonl"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def _env():
+    return dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{tempfile.mkdtemp()}/bench_startup.db",
+        # A configured provider, as in production; nothing is sent to it
+        OPENAI_API_KEY=os.getenv("OPENAI_API_KEY") or "sk-startup-bench",
+        PYTHONDONTWRITEBYTECODE="0",
+    )
+
+
+def import_breakdown(env):
+    """(total seconds, {top-level package: cumulative seconds}) for one `import main`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND, env=env, capture_output=True, text=True, check=True
+    )
+    # Children are printed before their parent, two spaces deeper: main's own
+    # imports are the depth-2 lines right before the "main" line
+    packages, children = defaultdict(float), []
+    total = 0.0
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative, depth, module = int(match.group(2)) / 1e6, len(match.group(3)) // 2, match.group(4)
+        if depth == 1:
+            children.append((module, cumulative))
+        elif depth == 0:
+            if module == "main":
+                total = cumulative
+                for child, seconds in children:
+                    packages[child.split(".")[0]] += seconds
+            children = []
+    return total, packages
+
+
+def time_to_first_200(env, port):
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - start < 60:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/", timeout=0.5).status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.HTTPError:
+                time.sleep(0.01)
+        raise RuntimeError("server did not answer within 60 s")
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=BACKEND,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def cli():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--no-record", action="store_true", help="Do not append to results/startup.jsonl")
+    args = parser.parse_args()
+
+    env = _env()
+    # The first run warms the OS file cache and writes bytecode; it is not counted
+    import_breakdown(env)
+    runs = [import_breakdown(env) for _ in range(args.runs)]
+    import_total = statistics.median(total for total, _ in runs)
+    packages = {
+        name: statistics.median(run[1].get(name, 0.0) for run in runs)
+        for name in {name for _, breakdown in runs for name in breakdown}
+    }
+    first_200 = statistics.median(time_to_first_200(env, args.port) for _ in range(args.runs))
+
+    print(f"import main:           {import_total * 1000:8.1f} ms")
+    print(f"time to first 200 on /: {first_200 * 1000:7.1f} ms")
+    print("slowest top-level imports of main (cumulative):")
+    top = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]
+    for name, seconds in top:
+        print(f"  {name:<24} {seconds * 1000:8.1f} ms")
+
+    if not args.no_record:
+        RESULTS.parent.mkdir(exist_ok=True)
+        with open(RESULTS, "a") as results:
+            results.write(json.dumps({
+                "date": datetime.utcnow().isoformat(timespec="seconds"),
+                "revision": git_revision(),
+                "python": sys.version.split()[0],
+                "import_main_ms": round(import_total * 1000, 1),
+                "first_200_ms": round(first_200 * 1000, 1),
+                "top_imports_ms": {name: round(seconds * 1000, 1) for name, seconds in top},
+            }) + "\n")
+        print(f"recorded in {RESULTS.relative_to(BACKEND)}")
+
+
+if __name__ == "__main__":
+    cli()
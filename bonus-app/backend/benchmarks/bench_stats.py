@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Progress statistics benchmark
+Times stats.get_user_stats() against a naive GROUP BY over learning_sessions
+as one user's answer history grows, on a throwaway SQLite database. The
+aggregates are filled with stats.rebuild(), the backfill job.
+
+Usage (from bonus-app/backend):
+    python benchmarks/bench_stats.py [--sizes 1000 10000 100000] [--repeat 50]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+_tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/bench_stats.db"
+os.environ["OPENAI_API_KEY"] = ""
+
+from sqlalchemy import case, func
+
+import main
+import stats
+from main import SessionLocal, User, Vocabulary, LearningSession
+from models import Base
+
+WORD_TYPES = ["noun", "verb", "adjective", "adverb"]
+VOCABULARY_SIZE = 200
+HISTORY_DAYS = 730
+
+
+def naive_stats(db, user_id):
+    """What the endpoint would cost without the aggregates"""
+    day = func.date(LearningSession.session_date)
+    hits = func.sum(case((LearningSession.is_correct, 1), else_=0))
+    db.query(func.count(LearningSession.id), hits).filter(LearningSession.user_id == user_id).one()
+    db.query(day, func.count(LearningSession.id), hits).filter(
+        LearningSession.user_id == user_id,
+        LearningSession.session_date >= datetime.utcnow() - timedelta(days=30)
+    ).group_by(day).all()
+    db.query(Vocabulary.word_type, func.count(LearningSession.id), hits).join(
+        Vocabulary, Vocabulary.id == LearningSession.vocabulary_id
+    ).filter(LearningSession.user_id == user_id).group_by(Vocabulary.word_type).all()
+
+
+def seed(db, user_id, vocab_ids, sessions):
+    now = datetime.utcnow()
+    rows = [
+        {
+            "user_id": user_id,
+            "vocabulary_id": random.choice(vocab_ids),
+            "user_answer": "respuesta",
+            "correct_answer": "respuesta",
+            "is_correct": random.random() < 0.7,
+            "explanation": "",
+            "session_date": now - timedelta(seconds=random.randrange(HISTORY_DAYS * 86400)),
+        }
+        for _ in range(sessions)
+    ]
+    db.bulk_insert_mappings(LearningSession, rows)
+    db.commit()
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def cli():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=main.engine)
+    random.seed(0)
+
+    print(f"{'sessions':>10} {'aggregates ms':>14} {'naive ms':>10}")
+    for size in args.sizes:
+        db = SessionLocal()
+        user = User(username=f"bench{size}", native_language="en")
+        db.add(user)
+        db.flush()
+        vocab = [
+            Vocabulary(user_id=user.id, word_spanish=f"palabra{i}", word_native=f"word{i}",
+                       word_type=WORD_TYPES[i % len(WORD_TYPES)], times_correct=i % 7, times_incorrect=i % 5)
+            for i in range(VOCABULARY_SIZE)
+        ]
+        db.add_all(vocab)
+        db.commit()
+        user_id = user.id
+        seed(db, user_id, [v.id for v in vocab], size)
+        stats.rebuild(db, user_id=user_id)
+
+        aggregated = timed(lambda: stats.get_user_stats(db, user_id), args.repeat)
+        naive = timed(lambda: naive_stats(db, user_id), max(1, args.repeat // 10))
+        print(f"{size:>10} {aggregated:>14.2f} {naive:>10.2f}")
+        db.close()
+
+
+if __name__ == "__main__":
+    cli()
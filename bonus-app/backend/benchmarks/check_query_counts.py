@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Query count check for list endpoints
+Counts the SQL statements behind GET /api/vocabulary/{user_id}?include=conjugation,
+GET /api/conjugations and GET /api/learning/{user_id}/questions for decks of
+increasing size and fails if the count grows with the number of words (an
+N+1 pattern). Runs in-process against a throwaway SQLite database.
+
+Usage (from bonus-app/backend):
+    python benchmarks/check_query_counts.py [--sizes 5 50 500]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/check_query_counts.db"
+os.environ["OPENAI_API_KEY"] = ""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import main
+from main import SessionLocal, User, Vocabulary, VerbConjugation, app
+from models import Base
+
+VERBS = ["hablar", "comer", "vivir", "tener", "poder", "querer", "decir", "hacer"]
+
+
+class Counter:
+    def __init__(self, engine):
+        self.statements = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.statements += 1
+
+
+def seed(words: int):
+    """A deck of `words` words, half of them verbs; every other verb has a stored conjugation"""
+    db = SessionLocal()
+    user = User(username=f"check_query_counts_{words}", native_language="en")
+    db.add(user)
+    db.flush()
+    deck = []
+    for i in range(words):
+        is_verb = i % 2 == 0
+        vocab = Vocabulary(user_id=user.id, word_spanish=VERBS[i % len(VERBS)] if is_verb else f"palabra{i}",
+                           word_native=f"word{i}", word_type="verb" if is_verb else "noun", is_verb=is_verb)
+        if is_verb and i % 4 == 0:
+            vocab.verb_conjugation = VerbConjugation(**main.conjugation_engine.conjugate(vocab.word_spanish))
+        deck.append(vocab)
+    db.add_all(deck)
+    db.commit()
+    ids = user.id, [vocab.id for vocab in deck]
+    db.close()
+    return ids
+
+
+def cli():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 50, 500])
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=main.engine)
+    counter = Counter(main.engine)
+    client = TestClient(app)
+    decks = {size: seed(size) for size in args.sizes}
+
+    endpoints = {
+        "vocabulary?include=conjugation": lambda user_id, ids: (f"/api/vocabulary/{user_id}", {"include": "conjugation"}),
+        # Half of the verbs have no stored conjugation: generated and inserted in the same request
+        "conjugations?ids=...": lambda user_id, ids: ("/api/conjugations", {"ids": ids[:main.MAX_BULK_CONJUGATIONS]}),
+        "learning questions": lambda user_id, ids: (f"/api/learning/{user_id}/questions", {"count": 50}),
+    }
+    failed = False
+    print(f"{'endpoint':<32} " + " ".join(f"{size:>6} words" for size in args.sizes))
+    for name, request in endpoints.items():
+        counts = []
+        for size in args.sizes:
+            path, params = request(*decks[size])
+            counter.statements = 0
+            response = client.get(path, params=params)
+            response.raise_for_status()
+            counts.append(counter.statements)
+        constant = len(set(counts)) == 1
+        failed |= not constant
+        print(f"{name:<32} " + " ".join(f"{count:>12}" for count in counts) + ("" if constant else "   <- grows with size"))
+
+    if failed:
+        sys.exit("Query count depends on list size")
+    print("OK: query counts are constant")
+
+
+if __name__ == "__main__":
+    cli()
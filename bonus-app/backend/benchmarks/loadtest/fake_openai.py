@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Stub OpenAI-compatible server for load tests
+Answers POST /v1/chat/completions (plain and `stream: true`) for the
+backend's prompts (word analysis, single and batched, conjugation, grading)
+and its streamed explanations, with configurable latency and injected failures.
+Standard library only, so load tests run offline. GET /stats returns
+request and failure counters.
+
+Point the backend at it with OPENAI_BASE_URL=http://127.0.0.1:<port>/v1.
+
+Usage (from bonus-app/backend):
+    python benchmarks/loadtest/fake_openai.py [--port 9100] [--latency-ms 300] [--error-rate 0.02]
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fixtures import translation_of
+
+ENDINGS = {
+    "ar": ["o", "as", "a", "amos", "áis", "an"],
+    "er": ["o", "es", "e", "emos", "éis", "en"],
+    "ir": ["o", "es", "e", "imos", "ís", "en"],
+}
+PERSONS = ["yo", "tu", "el_ella_usted", "nosotros", "vosotros", "ellos_ellas_ustedes"]
+
+
+class Behaviour:
+    """Latency and failure profile; shared by every handler thread"""
+
+    def __init__(self, latency: float, jitter: float, token_delay: float, tokens: int,
+                 error_rate: float, rate_limit_rate: float):
+        self.latency = latency
+        self.jitter = jitter
+        self.token_delay = token_delay
+        self.tokens = tokens
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.counts = {"requests": 0, "streams": 0, "errors": 0, "rate_limited": 0}
+        self._lock = threading.Lock()
+
+    def count(self, key: str):
+        with self._lock:
+            self.counts[key] += 1
+
+    def delay(self):
+        time.sleep(max(0.0, random.gauss(self.latency, self.jitter)))
+
+
+def conjugate(verb: str) -> dict:
+    infinitive = verb.removesuffix("se")
+    stem, ending = infinitive[:-2], ENDINGS.get(infinitive[-2:], ENDINGS["ar"])
+    return dict(zip(PERSONS, (stem + suffix for suffix in ending)))
+
+
+def analyze(text: str) -> dict:
+    verb = re.search(r"(ar|er|ir)(se)?$", text.split()[0]) is not None and " " not in text
+    return {"word_spanish": text, "word_native": translation_of(text), "word_type": "verb" if verb else "noun",
+            "is_verb": verb}
+
+
+def complete(prompt: str) -> dict:
+    """The JSON the backend expects for each of its prompts"""
+    batch = re.search(r"in order:\n(\[.*\])", prompt)
+    if batch:
+        words = [analyze(term) for term in json.loads(batch.group(1))]
+        return {"words": [dict(word, conjugation=conjugate(word["word_spanish"]) if word["is_verb"] else None)
+                          for word in words]}
+    word = re.search(r"The Spanish word: (.+)", prompt)
+    if word:
+        return analyze(word.group(1).strip())
+    verb = re.search(r"conjugation for the Spanish verb: (\S+)", prompt)
+    if verb:
+        return conjugate(verb.group(1))
+    correct = re.search(r"The correct answer is: (.+)", prompt)
+    answered = re.search(r"The user answered: (.+)", prompt)
+    expected = correct.group(1).strip() if correct else ""
+    is_correct = bool(answered) and answered.group(1).strip().lower() == expected.lower()
+    return {"is_correct": is_correct, "correct_answer": expected,
+            "explanation": "Well done!" if is_correct else f"The right word is '{expected}'. Keep practicing!"}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    behaviour: Behaviour
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict, headers: dict = None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            return self._send_json(200, self.behaviour.counts)
+        self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.path.endswith("/chat/completions"):
+            return self._send_json(404, {"error": {"message": "not found"}})
+
+        behaviour = self.behaviour
+        behaviour.count("requests")
+        roll = random.random()
+        if roll < behaviour.rate_limit_rate:
+            behaviour.count("rate_limited")
+            return self._send_json(429, {"error": {"message": "Rate limit reached", "type": "requests"}},
+                                   {"Retry-After": "1"})
+        if roll < behaviour.rate_limit_rate + behaviour.error_rate:
+            behaviour.count("errors")
+            behaviour.delay()
+            return self._send_json(500, {"error": {"message": "The server had an error", "type": "server_error"}})
+
+        prompt = request["messages"][-1]["content"]
+        behaviour.delay()
+        if request.get("stream"):
+            behaviour.count("streams")
+            return self._stream(request["model"])
+        self._send_json(200, {
+            "id": f"chatcmpl-{random.getrandbits(48):x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": json.dumps(complete(prompt), ensure_ascii=False)},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": 40, "total_tokens": len(prompt) // 4 + 40},
+        })
+
+    def _stream(self, model: str):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        chunk_id = f"chatcmpl-{random.getrandbits(48):x}"
+        for i in range(self.behaviour.tokens):
+            delta = {"content": "palabra " if i else "Explicación: "}
+            self._event({"id": chunk_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                         "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+            time.sleep(self.behaviour.token_delay)
+        self._event({"id": chunk_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                     "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def _event(self, data: dict):
+        self.wfile.write(f"data: {json.dumps(data, ensure_ascii=False)}\n\n".encode())
+        self.wfile.flush()
+
+
+def serve(port: int, behaviour: Behaviour) -> ThreadingHTTPServer:
+    handler = type("BoundHandler", (Handler,), {"behaviour": behaviour})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def cli():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=300, help="Mean time to response / first token")
+    parser.add_argument("--jitter-ms", type=float, default=100, help="Standard deviation of the latency")
+    parser.add_argument("--token-ms", type=float, default=20, help="Delay between streamed tokens")
+    parser.add_argument("--tokens", type=int, default=30, help="Tokens per streamed explanation")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests answered with a 429")
+    args = parser.parse_args()
+
+    behaviour = Behaviour(args.latency_ms / 1000, args.jitter_ms / 1000, args.token_ms / 1000, args.tokens,
+                          args.error_rate, args.rate_limit_rate)
+    server = serve(args.port, behaviour)
+    print(f"fake OpenAI listening on http://127.0.0.1:{args.port}/v1", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    cli()
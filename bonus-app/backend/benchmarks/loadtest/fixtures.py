@@ -0,0 +1,178 @@
+"""
+Load test fixtures
+A realistic word pool, databases (SQLite or Postgres) migrated with Alembic
+and seeded with users, decks of varying size and answer history, and sample
+media for the upload endpoints.
+"""
+
+import io
+import math
+import os
+import random
+import struct
+import subprocess
+import sys
+import wave
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND = Path(__file__).resolve().parent.parent.parent
+
+# (spanish, english, word type)
+WORDS: List[Tuple[str, str, str]] = [
+    ("casa", "house", "noun"), ("perro", "dog", "noun"), ("gato", "cat", "noun"), ("libro", "book", "noun"),
+    ("mesa", "table", "noun"), ("silla", "chair", "noun"), ("ventana", "window", "noun"), ("puerta", "door", "noun"),
+    ("ciudad", "city", "noun"), ("calle", "street", "noun"), ("coche", "car", "noun"), ("tren", "train", "noun"),
+    ("agua", "water", "noun"), ("pan", "bread", "noun"), ("leche", "milk", "noun"), ("manzana", "apple", "noun"),
+    ("naranja", "orange", "noun"), ("queso", "cheese", "noun"), ("café", "coffee", "noun"), ("té", "tea", "noun"),
+    ("árbol", "tree", "noun"), ("flor", "flower", "noun"), ("mar", "sea", "noun"), ("montaña", "mountain", "noun"),
+    ("río", "river", "noun"), ("cielo", "sky", "noun"), ("sol", "sun", "noun"), ("luna", "moon", "noun"),
+    ("año", "year", "noun"), ("día", "day", "noun"), ("noche", "night", "noun"), ("semana", "week", "noun"),
+    ("amigo", "friend", "noun"), ("familia", "family", "noun"), ("madre", "mother", "noun"), ("padre", "father", "noun"),
+    ("hermano", "brother", "noun"), ("niño", "child", "noun"), ("mujer", "woman", "noun"), ("hombre", "man", "noun"),
+    ("trabajo", "work", "noun"), ("escuela", "school", "noun"), ("tienda", "shop", "noun"), ("mercado", "market", "noun"),
+    ("dinero", "money", "noun"), ("tiempo", "time", "noun"), ("mañana", "morning", "noun"), ("corazón", "heart", "noun"),
+    ("canción", "song", "noun"), ("pregunta", "question", "noun"), ("respuesta", "answer", "noun"),
+    ("rojo", "red", "adjective"), ("azul", "blue", "adjective"), ("verde", "green", "adjective"),
+    ("grande", "big", "adjective"), ("pequeño", "small", "adjective"), ("nuevo", "new", "adjective"),
+    ("viejo", "old", "adjective"), ("bonito", "pretty", "adjective"), ("feliz", "happy", "adjective"),
+    ("triste", "sad", "adjective"), ("fácil", "easy", "adjective"), ("difícil", "difficult", "adjective"),
+    ("caliente", "hot", "adjective"), ("frío", "cold", "adjective"), ("rápido", "fast", "adjective"),
+    ("lento", "slow", "adjective"), ("limpio", "clean", "adjective"), ("sucio", "dirty", "adjective"),
+    ("siempre", "always", "adverb"), ("nunca", "never", "adverb"), ("hoy", "today", "adverb"),
+    ("ayer", "yesterday", "adverb"), ("aquí", "here", "adverb"), ("allí", "there", "adverb"),
+    ("bien", "well", "adverb"), ("mal", "badly", "adverb"), ("también", "also", "adverb"), ("muy", "very", "adverb"),
+    ("hablar", "to speak", "verb"), ("comer", "to eat", "verb"), ("vivir", "to live", "verb"), ("ser", "to be", "verb"),
+    ("estar", "to be", "verb"), ("tener", "to have", "verb"), ("hacer", "to do", "verb"), ("poder", "can", "verb"),
+    ("decir", "to say", "verb"), ("ir", "to go", "verb"), ("ver", "to see", "verb"), ("dar", "to give", "verb"),
+    ("saber", "to know", "verb"), ("querer", "to want", "verb"), ("llegar", "to arrive", "verb"),
+    ("pasar", "to pass", "verb"), ("deber", "must", "verb"), ("poner", "to put", "verb"), ("parecer", "to seem", "verb"),
+    ("quedar", "to stay", "verb"), ("creer", "to believe", "verb"), ("llevar", "to carry", "verb"),
+    ("dejar", "to leave", "verb"), ("seguir", "to follow", "verb"), ("encontrar", "to find", "verb"),
+    ("llamar", "to call", "verb"), ("venir", "to come", "verb"), ("pensar", "to think", "verb"),
+    ("salir", "to go out", "verb"), ("volver", "to return", "verb"), ("tomar", "to take", "verb"),
+    ("conocer", "to know", "verb"), ("vestirse", "to get dressed", "verb"), ("sentir", "to feel", "verb"),
+    ("trabajar", "to work", "verb"), ("escribir", "to write", "verb"), ("leer", "to read", "verb"),
+    ("aprender", "to learn", "verb"), ("abrir", "to open", "verb"), ("cantar", "to sing", "verb"),
+    ("bailar", "to dance", "verb"), ("dormir", "to sleep", "verb"), ("jugar", "to play", "verb"),
+    # Rare verbs the local conjugation engine leaves to the LLM
+    ("agredir", "to assault", "verb"), ("abolir", "to abolish", "verb"), ("balbucir", "to stammer", "verb"),
+]
+TRANSLATIONS: Dict[str, str] = {spanish: english for spanish, english, _ in WORDS}
+
+
+def translation_of(spanish: str) -> str:
+    return TRANSLATIONS.get(spanish.lower(), f"{spanish} (translation)")
+
+
+def new_phrase(rng: random.Random) -> Tuple[str, str, str]:
+    """A word to add: mostly a noun phrase ("casa roja"), sometimes a verb"""
+    nouns = [word for word in WORDS if word[2] == "noun"]
+    adjectives = [word for word in WORDS if word[2] == "adjective"]
+    if rng.random() < 0.25:
+        return rng.choice([word for word in WORDS if word[2] == "verb"])
+    noun, adjective = rng.choice(nouns), rng.choice(adjectives)
+    return f"{noun[0]} {adjective[0]}", f"{adjective[1]} {noun[1]}", "noun"
+
+
+def migrate(database_url: str):
+    env = dict(os.environ, DATABASE_URL=database_url)
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=BACKEND, env=env, check=True,
+                   capture_output=True)
+
+
+def seed(database_url: str, users: int, min_words: int, max_words: int, history_days: int,
+         seed_value: int = 0) -> List[dict]:
+    """Create `users` learners; returns [{"id", "words": [ids], "verbs": [ids]}]
+
+    Deck sizes follow a long-tailed distribution between min_words and
+    max_words, like real users: most decks are small, a few are large. Each
+    user gets a few answers per word spread over the last `history_days` days,
+    written through the same batch path as buffered answers so the progress
+    aggregates match the raw history.
+    """
+    sys.path.insert(0, str(BACKEND))
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from answer_buffer import write_answers
+    from models import User, VerbConjugation, Vocabulary
+    from conjugation import ConjugationEngine
+
+    rng = random.Random(seed_value)
+    engine = create_engine(database_url)
+    conjugator = ConjugationEngine()
+    now = datetime.utcnow()
+    run = now.strftime("%Y%m%d%H%M%S")
+    learners = []
+    with Session(engine) as db:
+        for i in range(users):
+            size = min(max_words, len(WORDS), int(min_words * rng.paretovariate(1.2)))
+            user = User(username=f"loadtest_{run}_{i}", native_language=rng.choice(["en", "ua"]))
+            db.add(user)
+            db.flush()
+            deck = []
+            for spanish, native, word_type in rng.sample(WORDS, size):
+                vocab = Vocabulary(user_id=user.id, word_spanish=spanish, word_native=native, word_type=word_type,
+                                   is_verb=word_type == "verb", times_correct=0, times_incorrect=0,
+                                   created_at=now - timedelta(days=history_days))
+                conjugation = conjugator.conjugate(spanish) if word_type == "verb" else None
+                if conjugation:
+                    vocab.verb_conjugation = VerbConjugation(**conjugation)
+                deck.append(vocab)
+            db.add_all(deck)
+            db.flush()
+
+            answers = []
+            for vocab in deck:
+                for _ in range(rng.randint(0, 6)):
+                    correct = rng.random() < 0.7
+                    answers.append({
+                        "user_id": user.id, "vocabulary_id": vocab.id,
+                        "user_answer": vocab.word_spanish if correct else "no sé",
+                        "correct_answer": vocab.word_spanish, "is_correct": correct,
+                        "explanation": "", "word_type": vocab.word_type,
+                        "session_date": now - timedelta(days=rng.random() * history_days),
+                    })
+            if answers:
+                write_answers(db, sorted(answers, key=lambda answer: answer["session_date"]))
+            db.commit()
+            learners.append({
+                "id": user.id,
+                "words": [vocab.id for vocab in deck],
+                "verbs": [vocab.id for vocab in deck if vocab.is_verb],
+            })
+    engine.dispose()
+    return learners
+
+
+def sample_image(text: str) -> bytes:
+    """A PNG with `text` in large dark letters, as a phone photo of a flashcard (or, with
+    several lines, a word list) would OCR"""
+    from PIL import Image, ImageDraw, ImageFont
+
+    try:
+        font = ImageFont.load_default(size=64)
+    except TypeError:  # Pillow < 10.1 has a single bitmap size
+        font = ImageFont.load_default()
+    lines = text.splitlines() or [""]
+    image = Image.new("RGB", (80 + 40 * max(len(line) for line in lines), 60 + 80 * len(lines)), "white")
+    ImageDraw.Draw(image).text((40, 30), text, fill="black", font=font)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def sample_audio(index: int, rate: int = 16000) -> bytes:
+    """A short mono WAV (a tone) whose frame count encodes `index` for the speech stub"""
+    frames = rate // 2 + index
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b"".join(
+            struct.pack("<h", int(8000 * math.sin(2 * math.pi * 440 * n / rate))) for n in range(frames)
+        ))
+    return buffer.getvalue()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test
+Migrates and seeds a database (a throwaway SQLite file by default, or any
+DATABASE_URL such as a local Postgres), starts the stub OpenAI server and the
+instrumented backend as subprocesses, and drives them with concurrent clients
+running weighted scenarios for a fixed time. Reports, per endpoint:
+throughput, 4xx and error counts, latency percentiles (time to first event for
+streams) and SQL statements per request; then the LLM traffic seen by the
+stub and the backend's resilience counters. Runs fully offline.
+
+Usage (from bonus-app/backend):
+    python benchmarks/loadtest/run.py [--users 50] [--clients 16] [--duration 60]
+        [--scenarios learning_loop:6 browse:2 bulk_add:1 media:1]
+        [--database-url postgresql://...] [--llm-latency-ms 300] [--llm-error-rate 0.02] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import httpx
+
+from fixtures import BACKEND, migrate, seed
+from scenarios import SCENARIOS, Recorder, Visit
+
+HERE = Path(__file__).resolve().parent
+
+
+def start(args, env, url):
+    process = subprocess.Popen([sys.executable, *args], cwd=HERE, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            sys.exit(f"{args[0]} exited:\n{process.stderr.read()}")
+        try:
+            httpx.get(url, timeout=0.5)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.kill()
+    sys.exit(f"{args[0]} did not start")
+
+
+def drive(base_url, learners, scenarios, weights, clients, duration, recorder):
+    deadline = time.monotonic() + duration
+
+    def client_loop(index):
+        rng = random.Random(index)
+        with httpx.Client(base_url=base_url, timeout=60) as client:
+            while time.monotonic() < deadline:
+                scenario = rng.choices(scenarios, weights)[0]
+                SCENARIOS[scenario](Visit(client, recorder, rng.choice(learners), rng))
+
+    threads = [threading.Thread(target=client_loop, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def percentile(values, q):
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def report(recorder, queries, elapsed):
+    rows = []
+    for route in sorted(recorder.latencies):
+        latencies = recorder.latencies[route]
+        served = queries.get(route, {})
+        rows.append({
+            "endpoint": route,
+            "requests": len(latencies),
+            "4xx": recorder.client_errors[route],
+            "errors": recorder.errors[route],
+            "rps": len(latencies) / elapsed,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "queries_per_request": served["queries"] / served["requests"] if served.get("requests") else None,
+        })
+    return rows
+
+
+def cli():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", help="Default: a new SQLite file")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--min-words", type=int, default=15, help="Smallest seeded deck; sizes are long-tailed")
+    parser.add_argument("--max-words", type=int, default=150)
+    parser.add_argument("--history-days", type=int, default=60)
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent simulated users")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds")
+    parser.add_argument("--scenarios", nargs="+", default=["learning_loop:6", "browse:2", "bulk_add:1", "media:1"],
+                        help="name:weight, from " + ", ".join(SCENARIOS))
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--llm-port", type=int, default=9100)
+    parser.add_argument("--llm-latency-ms", type=float, default=300)
+    parser.add_argument("--llm-token-ms", type=float, default=20)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    scenarios, weights = zip(*((name, float(weight)) for name, weight in (s.split(":") for s in args.scenarios)))
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/loadtest.db"
+    print(f"database: {database_url.split('@')[-1]}")
+    migrate(database_url)
+    start_seed = time.perf_counter()
+    learners = seed(database_url, args.users, args.min_words, args.max_words, args.history_days)
+    words = sum(len(learner["words"]) for learner in learners)
+    print(f"seeded {len(learners)} users, {words} words in {time.perf_counter() - start_seed:.1f}s")
+
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        OPENAI_API_KEY="sk-loadtest",
+        OPENAI_BASE_URL=f"http://127.0.0.1:{args.llm_port}/v1",
+        LLM_PROVIDER="openai",
+        MEDIA_CACHE_DIR=f"{tempfile.mkdtemp()}/media_cache",
+        PYTHONPATH=str(BACKEND),
+    )
+    llm_url = f"http://127.0.0.1:{args.llm_port}"
+    base_url = f"http://127.0.0.1:{args.port}"
+    processes = [
+        start(["fake_openai.py", "--port", str(args.llm_port), "--latency-ms", str(args.llm_latency_ms),
+               "--token-ms", str(args.llm_token_ms), "--error-rate", str(args.llm_error_rate),
+               "--rate-limit-rate", str(args.llm_rate_limit_rate)], env, f"{llm_url}/stats"),
+    ]
+    try:
+        processes.append(start(["serve.py", "--port", str(args.port)], env, f"{base_url}/"))
+        httpx.get(f"{base_url}/__loadtest/stats", params={"reset": 1})
+
+        recorder = Recorder()
+        print(f"running {args.clients} clients for {args.duration:.0f}s: {' '.join(args.scenarios)}")
+        start_run = time.perf_counter()
+        drive(base_url, learners, scenarios, weights, args.clients, args.duration, recorder)
+        elapsed = time.perf_counter() - start_run
+
+        rows = report(recorder, httpx.get(f"{base_url}/__loadtest/stats").json(), elapsed)
+        llm_stub = httpx.get(f"{llm_url}/stats").json()
+        llm_client = httpx.get(f"{base_url}/api/llm/stats").json()
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+    print(f"\n{'endpoint':<46} {'requests':>8} {'4xx':>5} {'errors':>6} {'req/s':>7}"
+          f" {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8}")
+    for row in rows:
+        queries = "-" if row["queries_per_request"] is None else f"{row['queries_per_request']:.1f}"
+        print(f"{row['endpoint']:<46} {row['requests']:>8} {row['4xx']:>5} {row['errors']:>6} {row['rps']:>7.1f}"
+              f" {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {queries:>8}")
+    total = sum(row["requests"] for row in rows)
+    print(f"{'total':<46} {total:>8} {'':>5} {sum(row['errors'] for row in rows):>6} {total / elapsed:>7.1f}")
+    print(f"\nstub LLM: {json.dumps(llm_stub)}")
+    print(f"backend LLM client: {json.dumps(llm_client)}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "database": database_url.split(":")[0], "users": len(learners), "clients": args.clients,
+            "duration": elapsed, "scenarios": args.scenarios, "endpoints": rows,
+            "llm_stub": llm_stub, "llm_client": llm_client,
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,137 @@
+"""
+Load test scenarios
+Each scenario is one scripted visit by a seeded learner, issuing the requests
+the frontend would. Latencies are recorded under the route template, the same
+key the instrumented server uses for its query counts.
+"""
+
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+import httpx
+
+from fixtures import new_phrase, sample_audio, sample_image
+
+ANSWER_CORRECT_RATE = 0.7
+
+
+class Recorder:
+    """Latencies and outcomes per "METHOD /route", shared by every client thread"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.client_errors: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add(self, route: str, seconds: float, status: int):
+        with self._lock:
+            self.latencies[route].append(seconds)
+            if status >= 500 or status == 0:
+                self.errors[route] += 1
+            elif status >= 400:
+                self.client_errors[route] += 1
+
+
+class Visit:
+    """A client session for one learner; records every request it makes"""
+
+    def __init__(self, client: httpx.Client, recorder: Recorder, learner: dict, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.learner = learner
+        self.rng = rng
+
+    def request(self, method: str, route: str, **kwargs) -> httpx.Response:
+        path = route.format(user_id=self.learner["id"])
+        start = time.perf_counter()
+        try:
+            response = self.client.request(method, path, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.add(f"{method} {route}", time.perf_counter() - start, 0)
+            return None
+        self.recorder.add(f"{method} {route}", time.perf_counter() - start, response.status_code)
+        return response
+
+    def stream(self, route: str, **kwargs) -> bool:
+        """POST to an event stream and read it to the end; the recorded latency is time to the first event"""
+        path = route.format(user_id=self.learner["id"])
+        start = time.perf_counter()
+        status = 0
+        try:
+            with self.client.stream("POST", path, **kwargs) as response:
+                status = response.status_code
+                first = None
+                for line in response.iter_lines():
+                    if first is None and line.startswith("event: "):
+                        first = time.perf_counter() - start
+            self.recorder.add(f"POST {route}", first or time.perf_counter() - start, status)
+        except httpx.HTTPError:
+            self.recorder.add(f"POST {route}", time.perf_counter() - start, status)
+        return status == 200
+
+
+def bulk_add(visit: Visit):
+    """Type in a handful of new words, as after a lesson"""
+    for _ in range(visit.rng.randint(3, 8)):
+        spanish, native, word_type = new_phrase(visit.rng)
+        response = visit.request("POST", "/api/vocabulary/{user_id}",
+                                 json={"word_spanish": spanish, "word_native": native, "word_type": word_type})
+        if response is not None and response.status_code == 200:
+            word = response.json()
+            visit.learner["words"].append(word["id"])
+            if word["is_verb"]:
+                visit.learner["verbs"].append(word["id"])
+
+
+def learning_loop(visit: Visit):
+    """A practice round: fetch a batch of cards, answer them, look at the stats"""
+    response = visit.request("GET", "/api/learning/{user_id}/questions", params={"count": 10})
+    if response is None or response.status_code != 200:
+        return
+    for card in response.json():
+        correct = visit.rng.random() < ANSWER_CORRECT_RATE
+        answer = {"vocabulary_id": card["vocabulary_id"],
+                  "user_answer": card["correct_answer"] if correct else "no lo sé"}
+        if visit.rng.random() < 0.5:
+            visit.stream("/api/learning/{user_id}/answer/stream", json=answer)
+        else:
+            visit.request("POST", "/api/learning/{user_id}/answer", json=answer)
+    visit.request("GET", "/api/users/{user_id}/stats")
+
+
+def browse(visit: Visit):
+    """Open the word list with conjugations, then the progress page"""
+    visit.request("GET", "/api/vocabulary/{user_id}", params={"include": "conjugation"})
+    if visit.learner["verbs"]:
+        visit.request("GET", "/api/conjugations", params={"ids": visit.learner["verbs"][:200]})
+    visit.request("GET", "/api/users/{user_id}/stats")
+
+
+def media(visit: Visit):
+    """Add one word from a photo and one from a voice recording, then a photographed word list"""
+    spanish, _, _ = new_phrase(visit.rng)
+    visit.request("POST", "/api/vocabulary/{user_id}/from-image",
+                  files={"file": ("card.png", sample_image(spanish), "image/png")})
+    visit.request("POST", "/api/vocabulary/{user_id}/from-audio",
+                  files={"file": ("word.wav", sample_audio(visit.rng.randrange(1000)), "audio/wav")})
+    page = "\n".join(f"{i + 1}. {spanish} - {native}"
+                     for i, (spanish, native, _) in enumerate(new_phrase(visit.rng) for _ in range(10)))
+    response = visit.request("POST", "/api/vocabulary/{user_id}/from-image/batch",
+                             files={"file": ("page.png", sample_image(page), "image/png")})
+    if response is not None and response.status_code == 200:
+        for word in response.json()["added"]:
+            visit.learner["words"].append(word["id"])
+            if word["is_verb"]:
+                visit.learner["verbs"].append(word["id"])
+
+
+SCENARIOS: Dict[str, Callable[[Visit], None]] = {
+    "bulk_add": bulk_add,
+    "learning_loop": learning_loop,
+    "browse": browse,
+    "media": media,
+}
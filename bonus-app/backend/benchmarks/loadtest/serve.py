@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Instrumented backend for load tests
+Serves main.app with uvicorn and counts SQL statements per endpoint: an ASGI
+middleware records which route is handling the request, and an engine event
+attributes every statement to it (threadpool endpoints inherit the context).
+GET /__loadtest/stats returns {"METHOD /route": {"requests", "queries"}};
+add ?reset=1 to clear the counters after reading them.
+
+--speech stub replaces the Google Web Speech call, the one network dependency
+besides the LLM, with a recognizer that reads a word out of the clip length
+(see fixtures.sample_audio). OCR still needs a local tesseract with the
+Spanish language pack, and audio decoding needs ffmpeg.
+
+Usage (from bonus-app/backend):
+    DATABASE_URL=... OPENAI_BASE_URL=http://127.0.0.1:9100/v1 \
+        python benchmarks/loadtest/serve.py [--port 8800] [--thread-limit 40] [--speech stub]
+"""
+
+import argparse
+import asyncio
+import contextvars
+import sys
+import threading
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import anyio.to_thread
+import uvicorn
+from sqlalchemy import event
+from starlette.routing import Match
+
+import main
+from fixtures import WORDS
+
+current_route = contextvars.ContextVar("current_route", default="(outside a request)")
+
+
+class Counters:
+    def __init__(self):
+        self.routes = defaultdict(lambda: {"requests": 0, "queries": 0})
+        self._lock = threading.Lock()
+
+    def add(self, route: str, key: str):
+        with self._lock:
+            self.routes[route][key] += 1
+
+    def snapshot(self, reset: bool) -> dict:
+        with self._lock:
+            routes = {route: dict(counts) for route, counts in self.routes.items()}
+            if reset:
+                self.routes.clear()
+        return routes
+
+
+class RouteContext:
+    """Names the matched route ("GET /api/users/{user_id}") for the rest of the request"""
+
+    def __init__(self, app, counters: Counters):
+        self.app = app
+        self.counters = counters
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        if scope["path"] == "/__loadtest/stats":
+            return await self.stats(scope, send)
+        route = f"{scope['method']} {scope['path']}"
+        for candidate in main.app.routes:
+            if candidate.matches(scope)[0] == Match.FULL:
+                route = f"{scope['method']} {candidate.path}"
+                break
+        self.counters.add(route, "requests")
+        token = current_route.set(route)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_route.reset(token)
+
+    async def stats(self, scope, send):
+        body = main.orjson.dumps(self.counters.snapshot(reset=b"reset=1" in scope["query_string"]))
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+
+
+def stub_speech_recognition():
+    import speech_recognition as sr
+
+    def recognize(recognizer, audio_data, language=None, **kwargs):
+        frames = len(audio_data.frame_data) // audio_data.sample_width
+        return WORDS[frames % len(WORDS)][0]
+
+    sr.Recognizer.recognize_google = recognize
+
+
+def cli():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--thread-limit", type=int, default=40, help="Threadpool size for sync endpoints")
+    parser.add_argument("--speech", choices=["google", "stub"], default="stub")
+    args = parser.parse_args()
+
+    if args.speech == "stub":
+        stub_speech_recognition()
+    counters = Counters()
+    event.listen(main.engine, "before_cursor_execute", lambda *_: counters.add(current_route.get(), "queries"))
+
+    config = uvicorn.Config(RouteContext(main.app, counters), port=args.port, log_level="warning")
+    server = uvicorn.Server(config)
+
+    async def serve():
+        anyio.to_thread.current_default_thread_limiter().total_tokens = args.thread_limit
+        await server.serve()
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,335 @@
+"""
+Rule-based Spanish conjugation engine (simple present tense)
+Handles regular -ar/-er/-ir verbs, common stem-changing and spelling-change
+patterns and a bundled table of irregular verbs, so only verbs it cannot
+classify confidently need an LLM call
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+# Column order of VerbConjugation
+PERSONS = ("yo", "tu", "el_ella_usted", "nosotros", "vosotros", "ellos_ellas_ustedes")
+
+# Persons whose stem is stressed (the "boot"): yo, tú, él, ellos
+STRESSED = (0, 1, 2, 5)
+
+ENDINGS = {
+    "ar": ("o", "as", "a", "amos", "áis", "an"),
+    "er": ("o", "es", "e", "emos", "éis", "en"),
+    "ir": ("o", "es", "e", "imos", "ís", "en"),
+}
+
+REFLEXIVE_PRONOUNS = ("me", "te", "se", "nos", "os", "se")
+
+VOWELS = "aeiouáéíóúü"
+
+IRREGULAR: Dict[str, Tuple[str, ...]] = {
+    "ser": ("soy", "eres", "es", "somos", "sois", "son"),
+    "estar": ("estoy", "estás", "está", "estamos", "estáis", "están"),
+    "ir": ("voy", "vas", "va", "vamos", "vais", "van"),
+    "haber": ("he", "has", "ha", "hemos", "habéis", "han"),
+    "tener": ("tengo", "tienes", "tiene", "tenemos", "tenéis", "tienen"),
+    "venir": ("vengo", "vienes", "viene", "venimos", "venís", "vienen"),
+    "decir": ("digo", "dices", "dice", "decimos", "decís", "dicen"),
+    "hacer": ("hago", "haces", "hace", "hacemos", "hacéis", "hacen"),
+    "poner": ("pongo", "pones", "pone", "ponemos", "ponéis", "ponen"),
+    "salir": ("salgo", "sales", "sale", "salimos", "salís", "salen"),
+    "asir": ("asgo", "ases", "ase", "asimos", "asís", "asen"),
+    "valer": ("valgo", "vales", "vale", "valemos", "valéis", "valen"),
+    "traer": ("traigo", "traes", "trae", "traemos", "traéis", "traen"),
+    "caer": ("caigo", "caes", "cae", "caemos", "caéis", "caen"),
+    "oír": ("oigo", "oyes", "oye", "oímos", "oís", "oyen"),
+    "ver": ("veo", "ves", "ve", "vemos", "veis", "ven"),
+    "dar": ("doy", "das", "da", "damos", "dais", "dan"),
+    "saber": ("sé", "sabes", "sabe", "sabemos", "sabéis", "saben"),
+    "caber": ("quepo", "cabes", "cabe", "cabemos", "cabéis", "caben"),
+    "oler": ("huelo", "hueles", "huele", "olemos", "oléis", "huelen"),
+    "reír": ("río", "ríes", "ríe", "reímos", "reís", "ríen"),
+    "sonreír": ("sonrío", "sonríes", "sonríe", "sonreímos", "sonreís", "sonríen"),
+    "freír": ("frío", "fríes", "fríe", "freímos", "freís", "fríen"),
+    "errar": ("yerro", "yerras", "yerra", "erramos", "erráis", "yerran"),
+    "huir": ("huyo", "huyes", "huye", "huimos", "huis", "huyen"),
+    "mecer": ("mezo", "meces", "mece", "mecemos", "mecéis", "mecen"),
+    "prohibir": ("prohíbo", "prohíbes", "prohíbe", "prohibimos", "prohibís", "prohíben"),
+    "reunir": ("reúno", "reúnes", "reúne", "reunimos", "reunís", "reúnen"),
+    "aislar": ("aíslo", "aíslas", "aísla", "aislamos", "aisláis", "aíslan"),
+    "satisfacer": ("satisfago", "satisfaces", "satisface", "satisfacemos", "satisfacéis", "satisfacen"),
+    "rehusar": ("rehúso", "rehúsas", "rehúsa", "rehusamos", "rehusáis", "rehúsan"),
+}
+
+# Spellings users type without the written accent
+IRREGULAR["oir"] = IRREGULAR["oír"]
+IRREGULAR["reir"] = IRREGULAR["reír"]
+IRREGULAR["sonreir"] = IRREGULAR["sonreír"]
+IRREGULAR["freir"] = IRREGULAR["freír"]
+
+# Irregular verbs whose prefixed compounds conjugate the same way
+# (mantener -> mantengo, componer -> compongo, predecir -> predigo, ...)
+COMPOUND_BASES = ("tener", "venir", "poner", "hacer", "decir", "traer", "salir", "caer")
+COMPOUND_PREFIXES = {
+    "a", "con", "contra", "de", "des", "dis", "entre", "ex", "im",
+    "inter", "man", "ob", "o", "pre", "pro", "re", "sobre", "sos", "su", "sus",
+    "com", "tras", "abs", "ben", "mal",
+}
+
+STEM_CHANGES: Dict[str, Tuple[str, str]] = {}
+for _verbs, _change in (
+    ((
+        "pensar", "cerrar", "empezar", "comenzar", "despertar", "sentar", "calentar",
+        "confesar", "gobernar", "merendar", "negar", "nevar", "recomendar", "regar",
+        "sembrar", "temblar", "tropezar", "atravesar", "apretar", "fregar", "helar",
+        "manifestar", "acertar", "querer", "entender", "perder", "defender",
+        "encender", "tender", "atender", "extender", "descender", "ascender",
+        "sentir", "preferir", "mentir", "divertir", "convertir", "sugerir", "herir",
+        "advertir", "consentir", "referir", "hervir", "requerir", "invertir",
+        "digerir", "transferir", "arrepentir", "tentar", "alentar", "mentar",
+    ), ("e", "ie")),
+    ((
+        "contar", "costar", "encontrar", "mostrar", "recordar", "acostar", "almorzar",
+        "aprobar", "probar", "comprobar", "colgar", "rogar", "sonar", "soñar", "volar",
+        "tostar", "forzar", "renovar", "demostrar", "consolar", "poder", "volver",
+        "devolver", "envolver", "resolver", "mover", "promover", "doler", "llover",
+        "morder", "soler", "torcer", "retorcer", "destorcer", "cocer", "recocer",
+        "escocer", "dormir", "morir", "acordar", "colar", "rodar",
+    ), ("o", "ue")),
+    ((
+        "pedir", "servir", "repetir", "seguir", "conseguir", "perseguir", "vestir",
+        "medir", "impedir", "despedir", "competir", "corregir", "elegir", "gemir",
+        "rendir", "teñir", "reñir", "expedir", "proseguir",
+    ), ("e", "i")),
+    (("jugar",), ("u", "ue")),
+    (("adquirir", "inquirir"), ("i", "ie")),
+):
+    for _verb in _verbs:
+        STEM_CHANGES[_verb] = _change
+
+# -iar/-uar verbs that stress (and accent) the i/u: enviar -> envío, continuar -> continúo
+ACCENTED_IAR_UAR = {
+    "enviar", "confiar", "variar", "enfriar", "esquiar", "vaciar", "desafiar",
+    "ampliar", "espiar", "fotografiar", "resfriar", "desviar",
+    "continuar", "actuar", "graduar", "evaluar", "situar", "acentuar", "efectuar",
+    "insinuar", "habituar", "valuar",
+}
+
+# Regular verbs the stem heuristic alone would not trust (see _confident_regular)
+KNOWN_REGULAR = {
+    # -ar with e/o in the last stem syllable
+    "entrar", "llevar", "dejar", "esperar", "llegar", "presentar", "representar",
+    "cenar", "celebrar", "enseñar", "besar", "pesar", "regresar", "tocar", "tomar",
+    "comprar", "nombrar", "votar", "notar", "borrar", "cobrar", "robar", "ahorrar",
+    "adorar", "ignorar", "mejorar", "llorar", "molestar", "protestar", "respetar",
+    "aceptar", "observar", "conservar", "reservar", "prestar", "ordenar", "contestar",
+    "detestar", "levantar", "aumentar", "comentar", "inventar", "intentar",
+    "experimentar", "alimentar", "frenar", "llenar", "sellar", "secar", "pescar",
+    "quedar", "quemar", "quejar", "tolerar", "operar", "recuperar", "considerar",
+    "generar", "acelerar", "importar", "soportar", "reportar", "exportar", "cortar",
+    "comportar", "adoptar", "controlar", "enfocar", "provocar", "colocar", "evocar",
+    "invocar", "convocar", "equivocar", "ahogar", "apoyar", "bordar", "dudar",
+    "entregar", "cargar", "navegar", "interrogar", "alegrar", "explorar", "elevar",
+    "revelar", "rechazar", "adelantar", "lamentar", "fomentar", "documentar",
+    "orientar", "ocupar", "bajar", "echar", "pegar", "remar", "formar",
+    "informar", "transformar", "reformar", "conformar", "gozar", "rozar", "mojar",
+    "cocinar", "descansar", "expresar", "interesar", "procesar", "progresar",
+    "confortar", "sospechar", "aprovechar", "estrechar", "lograr",
+    # -er with e/o
+    "comer", "beber", "aprender", "leer", "creer", "correr", "responder",
+    "comprender", "vender", "temer", "deber", "meter", "prometer", "romper",
+    "esconder", "coser", "toser", "ofender", "depender", "sorprender",
+    "suspender", "ceder", "proceder", "poseer", "proveer", "emprender",
+    "corresponder", "recorrer", "socorrer", "barrer", "exceder", "anteceder",
+    "conceder", "someter", "cometer", "acometer", "arremeter", "pretender",
+    "prender", "desprender", "reprender", "comprometer", "suceder", "coger",
+    "escoger", "recoger", "acoger", "proteger",
+    # -cer with e/o before the c (-ecer is handled by its suffix)
+    "conocer", "reconocer", "desconocer", "vencer", "convencer", "ejercer",
+    # diphthongs and hiatus-looking stems that are in fact regular
+    "bailar", "peinar", "causar", "pausar", "cuidar", "reinar", "aceitar",
+    "deleitar", "afeitar", "recaudar", "aplaudir", "descuidar",
+    # -iar/-uar that keep the stress on the ending
+    "estudiar", "cambiar", "limpiar", "copiar", "anunciar", "apreciar", "odiar",
+    "iniciar", "negociar", "pronunciar", "renunciar", "denunciar", "financiar",
+    "asociar", "diferenciar", "envidiar", "remediar", "auxiliar", "conciliar",
+    "reconciliar", "premiar", "vanagloriar", "averiguar", "apaciguar", "santiguar",
+    "menguar", "atestiguar", "adecuar", "licuar", "evacuar", "anticuar", "elogiar",
+    "contagiar", "presenciar", "silenciar", "sentenciar", "abreviar", "aliviar",
+    "agraviar", "obsequiar", "angustiar", "incendiar", "acariciar", "codiciar",
+    "desperdiciar", "potenciar", "beneficiar", "vendimiar", "mediar", "viciar",
+}
+
+# Suffixes that are always regular in the present tense
+REGULAR_SUFFIXES = ("ear", "ionar", "izar", "ificar")
+
+
+def _last_vowel_index(stem: str) -> int:
+    for i in range(len(stem) - 1, -1, -1):
+        if stem[i] in VOWELS:
+            return i
+    return -1
+
+
+def _change_stem(stem: str, old: str, new: str) -> Optional[str]:
+    """Replace the last occurrence of `old` in the stem (the stressed vowel)"""
+    i = stem.rfind(old)
+    if i == -1:
+        return None
+    return stem[:i] + new + stem[i + len(old):]
+
+
+def _accent(vowel: str) -> str:
+    return {"i": "í", "u": "ú"}[vowel]
+
+
+def _confident_regular(verb: str, stem: str) -> bool:
+    """Whether an unlisted verb can be trusted to be regular.
+
+    Stem changes only hit an e or o in the last stem syllable and the
+    written-accent verbs (envío, reúno, prohíbo) need an i/u in hiatus, so a
+    verb without either is regular; anything else needs a human-curated
+    list entry or the LLM.
+    """
+    if verb in KNOWN_REGULAR:
+        return True
+    if verb.endswith(REGULAR_SUFFIXES):
+        return True
+    if verb.endswith(("iar", "uar")):
+        return False
+    i = _last_vowel_index(stem)
+    if i == -1 or stem[i] in "eo":
+        return False
+    if stem[i] in "iu":
+        # A weak vowel after a strong one may be a stressed hiatus (aíslo, reúno, prohíbo)
+        if i > 0 and stem[i - 1] in "aeo":
+            return False
+        if i > 1 and stem[i - 1] == "h" and stem[i - 2] in "aeo":
+            return False
+    return True
+
+
+def _conjugate_base(verb: str) -> Optional[Tuple[Tuple[str, ...], str]]:
+    """Conjugate a non-reflexive infinitive; returns (forms, category) or None"""
+    if verb in IRREGULAR:
+        return IRREGULAR[verb], "irregular"
+
+    for base in COMPOUND_BASES:
+        if verb.endswith(base) and verb[:-len(base)] in COMPOUND_PREFIXES:
+            prefix = verb[:-len(base)]
+            return tuple(prefix + form for form in IRREGULAR[base]), "irregular"
+
+    if len(verb) < 3 or verb[-2:] not in ENDINGS or _last_vowel_index(verb[:-2]) == -1:
+        return None
+    stem = verb[:-2]
+    endings = ENDINGS[verb[-2:]]
+    stems = [stem] * 6
+    category = "regular"
+
+    change = STEM_CHANGES.get(verb)
+    if change:
+        changed = _change_stem(stem, *change)
+        if changed is None:
+            return None
+        for p in STRESSED:
+            stems[p] = changed
+        category = "stem_change"
+    elif verb in ACCENTED_IAR_UAR:
+        accented = stem[:-1] + _accent(stem[-1])
+        for p in STRESSED:
+            stems[p] = accented
+        category = "spelling_change"
+    elif verb.endswith("uir") and not verb.endswith(("guir", "quir")):
+        # construir -> construyo, construyes, construye, construimos, construís, construyen
+        for p in STRESSED:
+            stems[p] = stem + "y"
+        category = "spelling_change"
+    elif verb.endswith("üir"):
+        # argüir -> arguyo, arguyes, arguye, argüimos, argüís, arguyen: the y makes the u sound
+        for p in STRESSED:
+            stems[p] = stem[:-1] + "uy"
+        category = "spelling_change"
+    elif verb.endswith(("cer", "cir")):
+        # Listed stem-changing members (cocer, torcer) were handled above; an
+        # unlisted e/o before the c may be one too (escocer -> escuezo), except
+        # in -ecer, which always takes -zco (parecer, ofrecer)
+        if not verb.endswith("ecer") and not _confident_regular(verb, stem[:-1]):
+            return None
+        category = "spelling_change"
+    elif verb.endswith(("ger", "gir", "guir", "quir")):
+        # The u of -guir/-quir is silent, so judge the vowel before it
+        if not _confident_regular(verb, stem[:-1] if verb.endswith(("guir", "quir")) else stem):
+            return None
+        category = "spelling_change"
+    elif not _confident_regular(verb, stem):
+        return None
+
+    forms = [s + e for s, e in zip(stems, endings)]
+
+    # Spelling changes that only touch the yo form
+    yo_stem = stems[0]
+    if verb.endswith(("cer", "cir")):
+        # conocer -> conozco, conducir -> conduzco; vencer -> venzo, cocer -> cuezo
+        suffix = "zco" if stem[-2] in VOWELS and not change else "zo"
+        forms[0] = yo_stem[:-1] + suffix
+    elif verb.endswith("guir"):
+        # distinguir -> distingo, seguir -> sigo
+        forms[0] = yo_stem[:-1] + "o"
+    elif verb.endswith("quir"):
+        # delinquir -> delinco
+        forms[0] = yo_stem[:-2] + "co"
+    elif verb.endswith(("ger", "gir")):
+        # coger -> cojo, elegir -> elijo
+        forms[0] = yo_stem[:-1] + "jo"
+
+    return tuple(forms), category
+
+
+def conjugate(verb: str) -> Optional[Tuple[Dict[str, str], str]]:
+    """Present-tense forms keyed like VerbConjugation, plus the pattern used.
+
+    Returns None when the verb is not a single infinitive or cannot be
+    classified confidently, in which case the caller should ask the LLM.
+    """
+    verb = verb.strip().lower()
+    if not verb or " " in verb:
+        return None
+
+    pronouns = None
+    if verb.endswith(("arse", "erse", "irse", "írse")):
+        pronouns = REFLEXIVE_PRONOUNS
+        verb = verb[:-2]
+
+    result = _conjugate_base(verb)
+    if result is None:
+        return None
+    forms, category = result
+    if pronouns:
+        forms = tuple(f"{p} {f}" for p, f in zip(pronouns, forms))
+    return dict(zip(PERSONS, forms)), category
+
+
+class ConjugationEngine:
+    """Thread-safe front end to conjugate() that keeps hit-rate statistics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits: Dict[str, int] = {}
+        self.misses = 0
+
+    def conjugate(self, verb: str) -> Optional[Dict[str, str]]:
+        result = conjugate(verb)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits[result[1]] = self.hits.get(result[1], 0) + 1
+        return result[0]
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = sum(self.hits.values())
+            total = hits + self.misses
+            return {
+                "hits": hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / total, 4) if total else None,
+                "hits_by_pattern": dict(self.hits),
+            }
@@ -0,0 +1,57 @@
+"""
+Gunicorn configuration for production serving
+Multiple Uvicorn worker processes behind one gunicorn master:
+
+    gunicorn -c gunicorn.conf.py main:app
+
+The app and the heavy media/AI libraries are imported once in the master
+before forking, so workers start fast and share that memory copy-on-write.
+Workers are recycled after a bounded number of requests, and a recycled or
+stopping worker gets enough time to finish in-flight LLM calls.
+"""
+
+import os
+import random
+
+
+def _cpu_count() -> int:
+    try:
+        # Honours CPU affinity / container cpusets, unlike os.cpu_count()
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+# Requests spend most of their time waiting on the database and the LLM
+workers = int(os.getenv("WEB_CONCURRENCY") or _cpu_count() * 2 + 1)
+preload_app = True
+
+# Recycle workers to cap slow memory growth; jitter keeps them from restarting together
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+
+# A stopping worker finishes its requests first; the longest is an LLM call
+# with its whole retry budget (LLM_TIMEOUT_SECONDS)
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT") or float(os.getenv("LLM_TIMEOUT_SECONDS", "20")) + 10)
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server):
+    # The app imports these lazily; load them in the master so every worker
+    # inherits them instead of paying for the import on its first request
+    import main
+    main.preload_heavy_modules()
+
+
+def post_fork(server, worker):
+    # Connections opened in the master must not be shared between processes
+    import main
+    main.engine.dispose(close=False)
+    # Forked workers inherit one random state; reseed so retry jitter differs per worker
+    random.seed()
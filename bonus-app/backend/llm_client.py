@@ -0,0 +1,315 @@
+"""
+Resilience layer for LLM calls
+Per-call deadlines, rate-limit aware retries with jitter, a token-bucket
+limiter and a circuit breaker shared by every endpoint that talks to the model
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional, Tuple, Type, Union
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits and server errors
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMUnavailableError(Exception):
+    """Raised when a call is refused up front (breaker open, rate budget or deadline spent)"""
+
+
+class TokenBucket:
+    """Token-bucket limiter: `rate` tokens per second, bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout: float) -> bool:
+        """Take one token, waiting at most `timeout` seconds for it"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def drain(self, seconds: float):
+        """Hold back new calls for `seconds`, e.g. after the server sent Retry-After"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures.
+
+    While open every call is refused until `reset_timeout` has passed, then a
+    single trial call is let through (half-open); its outcome closes or
+    re-opens the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def release(self):
+        """Give back a half-open trial slot that was granted but never used"""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    """HTTP status of an SDK/HTTP error, if it carries one"""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds the server asked us to wait (Retry-After header), if any"""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class ResilientLLMClient:
+    """Wraps LLM calls with a deadline, retries, rate limiting and a circuit breaker.
+
+    `call(fn)` invokes `fn(timeout)` where `timeout` is the time left before
+    the per-call deadline. Transient failures (retryable HTTP statuses and
+    `transient_errors`) are retried with jittered exponential backoff, or
+    after the server's Retry-After when it sends one. A transient failure
+    that runs out of attempts or time counts against the circuit breaker and
+    is raised as `LLMUnavailableError`, like a call refused up front because
+    the breaker is open or no rate-limit token frees up before the deadline.
+    Anything else (a 400 or 404 for one bad request) says nothing about the
+    service's health: it is re-raised as is and leaves the breaker alone.
+    `transient_errors` may also be a callable returning the exception types,
+    so a provider's SDK is only imported once an error needs classifying.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float,
+        bucket: TokenBucket,
+        breaker: CircuitBreaker,
+        transient_errors: Union[Tuple[Type[BaseException], ...], Callable[[], Tuple]] = (),
+    ):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.bucket = bucket
+        self.breaker = breaker
+        self.transient_errors = transient_errors
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self._idle = threading.Condition()
+
+    def _is_transient(self, exc: BaseException) -> bool:
+        transient_errors = self.transient_errors() if callable(self.transient_errors) else self.transient_errors
+        if transient_errors and isinstance(exc, transient_errors):
+            return True
+        return _status_code(exc) in RETRYABLE_STATUS
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter keeps retrying workers from synchronising on the same instant
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def call(self, fn: Callable[[float], Any]) -> Any:
+        if not self.breaker.allow():
+            self.rejected += 1
+            raise LLMUnavailableError("LLM circuit breaker is open")
+
+        with self._idle:
+            self.in_flight += 1
+        try:
+            return self._call(fn)
+        finally:
+            with self._idle:
+                self.in_flight -= 1
+                if not self.in_flight:
+                    self._idle.notify_all()
+
+    def stream(self, fn: Callable[[float], Iterator[str]]) -> Iterator[str]:
+        """Like call(), for a streamed completion: `fn(timeout)` returns an iterator of text chunks.
+
+        Opening the stream and waiting for its first chunk are retried like a
+        call. Once a chunk has reached the caller a failure is raised instead,
+        since output already shown cannot be taken back. The stream counts as
+        in flight until it is exhausted or closed, and must end by the deadline.
+        """
+        if not self.breaker.allow():
+            self.rejected += 1
+            raise LLMUnavailableError("LLM circuit breaker is open")
+
+        with self._idle:
+            self.in_flight += 1
+        try:
+            deadline = time.monotonic() + self.timeout
+            first, chunks = self._call(lambda timeout: _first_chunk(fn(timeout)), deadline)
+            if first is None:
+                return
+            yield first
+            try:
+                for chunk in chunks:
+                    if time.monotonic() > deadline:
+                        raise LLMUnavailableError("LLM stream deadline exceeded")
+                    yield chunk
+            except GeneratorExit:
+                raise
+            except Exception:
+                self.failures += 1
+                self.breaker.record_failure()
+                raise
+        finally:
+            with self._idle:
+                self.in_flight -= 1
+                if not self.in_flight:
+                    self._idle.notify_all()
+
+    def wait_idle(self, timeout: float) -> bool:
+        """Block until no call is in flight (e.g. while a worker shuts down); False on timeout"""
+        with self._idle:
+            return self._idle.wait_for(lambda: not self.in_flight, timeout)
+
+    def _call(self, fn: Callable[[float], Any], deadline: Optional[float] = None) -> Any:
+        deadline = deadline or time.monotonic() + self.timeout
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.bucket.acquire(timeout=remaining):
+                self.rejected += 1
+                self.breaker.release()
+                raise LLMUnavailableError("LLM call deadline exceeded waiting for rate limit")
+
+            self.calls += 1
+            try:
+                result = fn(deadline - time.monotonic())
+            except Exception as e:
+                retry_after = _retry_after(e)
+                if retry_after is not None:
+                    self.bucket.drain(retry_after)
+                delay = retry_after if retry_after is not None else self._backoff(attempt)
+                transient = self._is_transient(e)
+                if transient and attempt < self.max_retries and time.monotonic() + delay < deadline:
+                    attempt += 1
+                    self.retries += 1
+                    if retry_after is None:
+                        # With Retry-After the drained bucket already makes us wait
+                        time.sleep(delay)
+                    continue
+                self.failures += 1
+                if not transient:
+                    # Free a half-open trial slot without judging the service by it
+                    self.breaker.release()
+                    raise
+                self.breaker.record_failure()
+                raise LLMUnavailableError(f"LLM unavailable: {e}") from e
+            self.breaker.record_success()
+            return result
+
+    def stats(self) -> dict:
+        return {
+            "breaker_state": self.breaker.state,
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "in_flight": self.in_flight,
+        }
+
+
+def _first_chunk(chunks: Iterator[str]) -> Tuple[Optional[str], Iterator[str]]:
+    """Pull the first chunk so connection and early stream errors surface inside the retry loop"""
+    chunks = iter(chunks)
+    return next(chunks, None), chunks
+
+
+def client_from_env(
+    transient_errors: Union[Tuple[Type[BaseException], ...], Callable[[], Tuple]] = ()
+) -> ResilientLLMClient:
+    """Build a client sized from LLM_* environment variables"""
+    requests_per_minute = float(os.getenv("LLM_RATE_LIMIT_RPM", "3500"))
+    return ResilientLLMClient(
+        timeout=float(os.getenv("LLM_TIMEOUT_SECONDS", "20")),
+        max_retries=int(os.getenv("LLM_MAX_RETRIES", "3")),
+        backoff_base=float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5")),
+        backoff_max=float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "8")),
+        bucket=TokenBucket(
+            rate=requests_per_minute / 60,
+            capacity=float(os.getenv("LLM_RATE_LIMIT_BURST", "20")),
+        ),
+        breaker=CircuitBreaker(
+            failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", "5")),
+            reset_timeout=float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30")),
+        ),
+        transient_errors=transient_errors,
+    )
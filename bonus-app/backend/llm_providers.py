@@ -0,0 +1,240 @@
+"""
+LLM provider abstraction
+Lets each AI task (word analysis, conjugation, grading) target OpenAI or a
+local Ollama server with its own model, selected through environment variables
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+from llm_client import ResilientLLMClient, client_from_env
+
+logger = logging.getLogger(__name__)
+
+# Tasks the backend asks the model to do; each can pick its own provider/model
+TASKS = ("word", "conjugation", "grading")
+
+DEFAULT_MODELS = {
+    "openai": "gpt-3.5-turbo",
+    "ollama": "llama3.2:3b",
+}
+
+
+class OpenAIProvider:
+    """OpenAI chat completions
+
+    The SDK takes longer to import than the rest of the app, so it is loaded
+    on the first call rather than at startup.
+    """
+
+    name = "openai"
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from openai import OpenAI
+
+                    # Retries are handled by llm_client (Retry-After aware, breaker-counted), not the SDK
+                    self._client = OpenAI(api_key=self.api_key, max_retries=0)
+        return self._client
+
+    def transient_errors(self) -> tuple:
+        from openai import APIConnectionError
+
+        # APITimeoutError is a subclass of APIConnectionError
+        return (APIConnectionError,)
+
+    def chat(self, model: str, messages: List[dict], temperature: float, timeout: float) -> str:
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            timeout=timeout
+        )
+        return response.choices[0].message.content
+
+    def chat_stream(self, model: str, messages: List[dict], temperature: float, timeout: float) -> Iterator[str]:
+        stream = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            timeout=timeout,
+            stream=True
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def warm_up(self, model: str):
+        pass
+
+
+class OllamaProvider:
+    """Local Ollama server over a pooled keep-alive HTTP connection"""
+
+    name = "ollama"
+
+    def __init__(self, base_url: str, keep_alive: str, pool_size: int):
+        import httpx
+
+        self.keep_alive = keep_alive
+        self.client = httpx.Client(
+            base_url=base_url,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=300
+            ),
+            timeout=None
+        )
+        self.transient_errors = (httpx.TransportError,)
+
+    def chat(self, model: str, messages: List[dict], temperature: float, timeout: float) -> str:
+        response = self.client.post("/api/chat", json={
+            "model": model,
+            "messages": messages,
+            "stream": False,
+            "format": "json",
+            "keep_alive": self.keep_alive,
+            "options": {"temperature": temperature}
+        }, timeout=timeout)
+        response.raise_for_status()
+        return response.json()["message"]["content"]
+
+    def chat_stream(self, model: str, messages: List[dict], temperature: float, timeout: float) -> Iterator[str]:
+        # Plain text, one JSON object per line as the model produces it
+        with self.client.stream("POST", "/api/chat", json={
+            "model": model,
+            "messages": messages,
+            "stream": True,
+            "keep_alive": self.keep_alive,
+            "options": {"temperature": temperature}
+        }, timeout=timeout) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                message = json.loads(line)
+                if message.get("message", {}).get("content"):
+                    yield message["message"]["content"]
+                if message.get("done"):
+                    return
+
+    def warm_up(self, model: str):
+        """Load the model into memory so the first real request does not pay for it"""
+        response = self.client.post("/api/generate", json={
+            "model": model,
+            "keep_alive": self.keep_alive
+        }, timeout=120)
+        response.raise_for_status()
+
+
+class TaskLLM:
+    """A provider/model pair bound to one task, called through the resilience layer"""
+
+    def __init__(self, task: str, provider, model: str, client: ResilientLLMClient):
+        self.task = task
+        self.provider = provider
+        self.model = model
+        self.client = client
+
+    def chat_json(self, system_prompt: str, prompt: str, temperature: float) -> dict:
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ]
+        content = self.client.call(
+            lambda timeout: self.provider.chat(self.model, messages, temperature, timeout)
+        )
+        return json.loads(content)
+
+    def stream_text(self, system_prompt: str, prompt: str, temperature: float) -> Iterator[str]:
+        """Free-text completion, yielded in chunks as the model produces them"""
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ]
+        return self.client.stream(
+            lambda timeout: self.provider.chat_stream(self.model, messages, temperature, timeout)
+        )
+
+
+def _create_provider(name: str):
+    if name == "openai":
+        api_key = os.getenv("OPENAI_API_KEY", "")
+        return OpenAIProvider(api_key) if api_key else None
+    if name == "ollama":
+        return OllamaProvider(
+            base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
+            keep_alive=os.getenv("OLLAMA_KEEP_ALIVE", "30m"),
+            pool_size=int(os.getenv("OLLAMA_POOL_SIZE", "10"))
+        )
+    raise ValueError(f"Unknown LLM provider: {name}")
+
+
+class LLMRegistry:
+    """Task -> TaskLLM mapping built from the environment.
+
+    LLM_PROVIDER picks the default backend ("openai" or "ollama"); each task
+    can override it with LLM_PROVIDER_<TASK> and choose a model with
+    LLM_MODEL_<TASK>, e.g. a small model for grading and a larger one for
+    conjugation. Providers (and so their connection pools, rate limits and
+    circuit breakers) are shared between tasks that use the same backend.
+    A task whose provider is not configured maps to None.
+    """
+
+    def __init__(self):
+        self.providers = {}
+        self.clients: Dict[str, ResilientLLMClient] = {}
+        self.tasks: Dict[str, Optional[TaskLLM]] = {}
+
+        # Empty values (e.g. unset docker-compose passthroughs) fall back to the defaults
+        default_provider = os.getenv("LLM_PROVIDER") or "openai"
+        for task in TASKS:
+            name = os.getenv(f"LLM_PROVIDER_{task.upper()}") or default_provider
+            if name not in self.providers:
+                self.providers[name] = _create_provider(name)
+            provider = self.providers[name]
+            if provider is None:
+                self.tasks[task] = None
+                continue
+            if name not in self.clients:
+                self.clients[name] = client_from_env(transient_errors=provider.transient_errors)
+            model = os.getenv(f"LLM_MODEL_{task.upper()}") or DEFAULT_MODELS[name]
+            self.tasks[task] = TaskLLM(task, provider, model, self.clients[name])
+
+    def get(self, task: str) -> Optional[TaskLLM]:
+        return self.tasks.get(task)
+
+    def warm_up(self):
+        """Preload every configured model; failures are left for the first real call to report"""
+        for llm in {(l.provider.name, l.model): l for l in self.tasks.values() if l}.values():
+            try:
+                llm.provider.warm_up(llm.model)
+            except Exception as e:
+                logger.warning("LLM warm-up failed for %s/%s: %s", llm.provider.name, llm.model, e)
+
+    def drain(self, timeout: float) -> bool:
+        """Wait up to `timeout` seconds in total for in-flight calls to finish"""
+        deadline = time.monotonic() + timeout
+        return all(client.wait_idle(max(0.0, deadline - time.monotonic())) for client in self.clients.values())
+
+    def stats(self) -> dict:
+        return {
+            "tasks": {
+                task: {"provider": llm.provider.name, "model": llm.model} if llm else None
+                for task, llm in self.tasks.items()
+            },
+            "providers": {name: client.stats() for name, client in self.clients.items()},
+        }
@@ -3,89 +3,79 @@ Spanish Learning Application - Backend API
 FastAPI backend for AI-driven Spanish learning app
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Depends
+from fastapi import FastAPI, HTTPException, UploadFile, File, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, Text, ForeignKey, DateTime
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session, relationship
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from brotli_asgi import BrotliMiddleware
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker, selectinload, Session
 from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import datetime, date
 import os
 from dotenv import load_dotenv
-from openai import OpenAI
 from io import BytesIO
-from PIL import Image
-import pytesseract
-import speech_recognition as sr
-from pydub import AudioSegment
+import importlib
 import json
+import orjson
+import re
+import logging
+import threading
+import time
+from contextlib import closing
+from singleflight import SingleFlight
+from llm_client import LLMUnavailableError
+from llm_providers import LLMRegistry
+from conjugation import ConjugationEngine
+import search
+import stats
+from answer_buffer import buffer_from_env, write_answers
+from media_cache import cache_from_env
+from models import User, Vocabulary, VerbConjugation, LearningSession
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Database setup
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://spanish_user:spanish_pass@db:5432/spanish_learning")
 engine = create_engine(DATABASE_URL)
+search.install(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
-
-# OpenAI setup
-openai_api_key = os.getenv("OPENAI_API_KEY", "")
-openai_client = OpenAI(api_key=openai_api_key) if openai_api_key else None
-
-# Database Models
-class User(Base):
-    __tablename__ = "users"
-    id = Column(Integer, primary_key=True, index=True)
-    username = Column(String, unique=True, index=True)
-    native_language = Column(String)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    vocabulary = relationship("Vocabulary", back_populates="user")
-    learning_sessions = relationship("LearningSession", back_populates="user")
-
-class Vocabulary(Base):
-    __tablename__ = "vocabulary"
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
-    word_spanish = Column(String)
-    word_native = Column(String)
-    word_type = Column(String)
-    is_verb = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    last_reviewed = Column(DateTime, nullable=True)
-    times_correct = Column(Integer, default=0)
-    times_incorrect = Column(Integer, default=0)
-    user = relationship("User", back_populates="vocabulary")
-    verb_conjugation = relationship("VerbConjugation", back_populates="vocabulary", uselist=False)
-    learning_sessions = relationship("LearningSession", back_populates="vocabulary")
-
-class VerbConjugation(Base):
-    __tablename__ = "verb_conjugations"
-    id = Column(Integer, primary_key=True, index=True)
-    vocabulary_id = Column(Integer, ForeignKey("vocabulary.id"))
-    yo = Column(String)
-    tu = Column(String)
-    el_ella_usted = Column(String)
-    nosotros = Column(String)
-    vosotros = Column(String)
-    ellos_ellas_ustedes = Column(String)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    vocabulary = relationship("Vocabulary", back_populates="verb_conjugation")
-
-class LearningSession(Base):
-    __tablename__ = "learning_sessions"
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
-    vocabulary_id = Column(Integer, ForeignKey("vocabulary.id"))
-    user_answer = Column(Text)
-    correct_answer = Column(Text)
-    is_correct = Column(Boolean)
-    explanation = Column(Text)
-    session_date = Column(DateTime, default=datetime.utcnow)
-    user = relationship("User", back_populates="learning_sessions")
-    vocabulary = relationship("Vocabulary", back_populates="learning_sessions")
-
-Base.metadata.create_all(bind=engine)
+# The schema is managed by Alembic (`alembic upgrade head`), never at import time
+
+# Answer logging: synchronous commits, or write-behind batches (ANSWER_WRITE_MODE=buffered)
+answer_buffer = buffer_from_env(SessionLocal)
+
+# LLM setup: OpenAI or a local Ollama server, chosen per task (see llm_providers)
+llms = LLMRegistry()
+
+# Regular, stem-changing and tabled irregular verbs are conjugated locally
+conjugation_engine = ConjugationEngine()
+
+# Concurrent identical LLM calls share one in-flight request
+llm_singleflight = SingleFlight()
+
+# Re-uploaded photos and voice clips reuse their OCR/speech and LLM results (see media_cache)
+media_cache = cache_from_env()
+
+# Media and AI libraries are imported on first use of their endpoints, keeping
+# them off the cold-start path; a pre-fork server loads them once in the master
+HEAVY_MODULES = ("PIL.Image", "pytesseract", "speech_recognition", "pydub", "openai", "httpx")
+
+def preload_heavy_modules():
+    """Import HEAVY_MODULES now; missing optional ones are logged and skipped"""
+    for module in HEAVY_MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            logger.warning("Could not preload %s: %s", module, e)
+
+def llm_key(task: str, *parts: str) -> tuple:
+    """Normalized coalescing key: case and whitespace do not change the prompt's meaning"""
+    return (task,) + tuple(" ".join(str(p).split()).lower() for p in parts)
 
 # Pydantic Models
 class UserCreate(BaseModel):
@@ -119,11 +109,37 @@ class VerbConjugationResponse(BaseModel):
     vosotros: str
     ellos_ellas_ustedes: str
 
+class VocabularyListItem(VocabularyResponse):
+    # Only present with ?include=conjugation; null for words without a stored conjugation
+    conjugation: Optional[VerbConjugationResponse] = None
+
+class VocabularyBatchResponse(BaseModel):
+    text: str  # what OCR or speech recognition read
+    added: List[VocabularyResponse]
+    existing: List[str]  # terms already in the vocabulary
+    failed: List[str]  # terms the LLM could not analyze this time; not stored, so a retry analyzes them again
+    ignored: List[str]  # terms beyond MAX_BATCH_WORDS
+
+class VocabularySearchResult(VocabularyResponse):
+    # Trigram word similarity of the query to the closer of the two words, 0 to 1
+    score: float
+
+class VocabularyConjugation(VerbConjugationResponse):
+    vocabulary_id: int
+
 class LearningQuestion(BaseModel):
     vocabulary_id: int
     question: str
     correct_answer: str
 
+class QuestionCard(BaseModel):
+    vocabulary_id: int
+    question: str
+    correct_answer: str
+    word_type: str
+    is_verb: bool
+    conjugation: Optional[VerbConjugationResponse] = None
+
 class LearningAnswer(BaseModel):
     vocabulary_id: int
     user_answer: str
@@ -133,6 +149,38 @@ class LearningResponse(BaseModel):
     correct_answer: str
     explanation: str
 
+class DailyStats(BaseModel):
+    day: date
+    answers: int
+    correct: int
+    accuracy: float
+
+class WordTypeStats(BaseModel):
+    word_type: str
+    answers: int
+    correct: int
+    accuracy: float
+
+class HardWord(BaseModel):
+    vocabulary_id: int
+    word_spanish: str
+    word_native: str
+    times_correct: int
+    times_incorrect: int
+    accuracy: float
+
+class UserStatsResponse(BaseModel):
+    user_id: int
+    total_answers: int
+    correct_answers: int
+    accuracy: float
+    current_streak: int
+    longest_streak: int
+    last_active_day: Optional[date]
+    daily: List[DailyStats]
+    by_word_type: List[WordTypeStats]
+    hardest_words: List[HardWord]
+
 # FastAPI app
 app = FastAPI(title="Spanish Learning API", version="1.0.0")
 
@@ -144,6 +192,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Brotli for clients that accept it, gzip for the rest. Bodies under
+# COMPRESSION_MIN_BYTES go out as-is: on them compression costs more than it saves.
+# Event streams are left alone so each event reaches the client as soon as it is sent
+app.add_middleware(
+    BrotliMiddleware,
+    quality=int(os.getenv("BROTLI_QUALITY", "4")),
+    minimum_size=int(os.getenv("COMPRESSION_MIN_BYTES", "1024")),
+    excluded_handlers=[r"/stream$"],
+)
+
+@app.on_event("startup")
+def warm_up_llms():
+    # Load local models in the background so startup is not blocked on them
+    threading.Thread(target=llms.warm_up, daemon=True).start()
+
+@app.on_event("shutdown")
+def drain_and_flush():
+    # Let LLM calls still running (warm-up, coalesced leaders) finish within their
+    # deadline, then write out buffered answers; runs on every worker exit/recycle
+    if not llms.drain(float(os.getenv("LLM_TIMEOUT_SECONDS", "20"))):
+        logger.warning("Shutting down with LLM calls still in flight")
+    if answer_buffer is not None:
+        answer_buffer.close()
+
 # Dependency
 def get_db():
     db = SessionLocal()
@@ -155,6 +227,9 @@ def get_db():
 # AI Helper Functions
 def extract_text_from_image(image_bytes: bytes) -> str:
     """Extract text from image using OCR"""
+    from PIL import Image
+    import pytesseract
+
     try:
         image = Image.open(BytesIO(image_bytes))
         text = pytesseract.image_to_string(image, lang='spa')
@@ -164,6 +239,9 @@ def extract_text_from_image(image_bytes: bytes) -> str:
 
 def extract_text_from_audio(audio_bytes: bytes) -> str:
     """Extract text from audio using speech recognition"""
+    import speech_recognition as sr
+    from pydub import AudioSegment
+
     try:
         recognizer = sr.Recognizer()
         audio_file = BytesIO(audio_bytes)
@@ -179,17 +257,50 @@ def extract_text_from_audio(audio_bytes: bytes) -> str:
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error processing audio: {str(e)}")
 
-def process_word_with_ai(word_text: str, native_language: str) -> dict:
-    """Use OpenAI to process and extract word information"""
-    if not openai_client:
+def _fallback_word_data(word_text: str) -> dict:
+    return {
+        "word_spanish": word_text,
+        "word_native": "Translation needed",
+        "word_type": "unknown",
+        "is_verb": False
+    }
+
+def _fallback_conjugation(word: str) -> dict:
+    return {
+        "yo": word,
+        "tu": word,
+        "el_ella_usted": word,
+        "nosotros": word,
+        "vosotros": word,
+        "ellos_ellas_ustedes": word
+    }
+
+def _fallback_answer_check(user_answer: str, word_spanish: str, explanation: Optional[str] = None) -> dict:
+    is_correct = user_answer.lower().strip() == word_spanish.lower().strip()
+    return {
+        "is_correct": is_correct,
+        "correct_answer": word_spanish,
+        "explanation": explanation or f"The correct answer is '{word_spanish}'. {'' if is_correct else 'Keep practicing!'}"
+    }
+
+def process_word_with_ai(word_text: str, native_language: str) -> Optional[dict]:
+    """Use the LLM to process and extract word information.
+
+    Without a configured LLM this is the basic fallback entry; None means the
+    LLM is temporarily unavailable (breaker open, rate budget or deadline
+    spent) and the caller should ask for a retry.
+    """
+    llm = llms.get("word")
+    if not llm:
         # Fallback if no API key
-        return {
-            "word_spanish": word_text,
-            "word_native": "Translation needed",
-            "word_type": "unknown",
-            "is_verb": False
-        }
+        return _fallback_word_data(word_text)
     
+    return llm_singleflight.do(
+        llm_key("word", word_text, native_language),
+        lambda: _process_word_with_llm(llm, word_text, native_language)
+    )
+
+def _process_word_with_llm(llm, word_text: str, native_language: str) -> Optional[dict]:
     try:
         prompt = f"""Analyze this Spanish word/phrase and provide:
 1. The Spanish word: {word_text}
@@ -205,32 +316,90 @@ Respond in JSON format:
     "is_verb": true/false
 }}"""
         
-        response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a Spanish language expert. Respond only with valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3
-        )
+        return llm.chat_json("You are a Spanish language expert. Respond only with valid JSON.", prompt, 0.3)
+    except LLMUnavailableError:
+        # Breaker open or rate budget spent: fail fast instead of queuing
+        return None
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"AI processing error: {str(e)}")
+
+def process_words_with_ai(terms: List[str], native_language: str) -> List[Optional[dict]]:
+    """Word analysis, with conjugations for verbs, for many terms in one LLM request
+
+    Without an LLM every term gets the baseline analysis; None marks a term the
+    LLM could not analyze right now.
+    """
+    llm = llms.get("word")
+    if not llm:
+        return [_fallback_word_data(term) for term in terms]
+
+    return llm_singleflight.do(
+        llm_key("words", native_language, *terms),
+        lambda: _process_words_with_llm(llm, terms, native_language)
+    )
+
+def _process_words_with_llm(llm, terms: List[str], native_language: str) -> List[Optional[dict]]:
+    try:
+        prompt = f"""Analyze each of these Spanish words/phrases, in order:
+{json.dumps(terms, ensure_ascii=False)}
+
+For each one provide:
+1. The Spanish word, with its spelling corrected if it was misread
+2. Translation to {native_language}
+3. Word type (noun, verb, adjective, adverb, etc.)
+4. If it's a verb, indicate yes and give its simple present tense conjugation
+
+Respond in JSON format, one entry per word in the same order:
+{{
+    "words": [
+        {{
+            "word_spanish": "word in Spanish",
+            "word_native": "translation",
+            "word_type": "type",
+            "is_verb": true/false,
+            "conjugation": {{"yo": "...", "tu": "...", "el_ella_usted": "...", "nosotros": "...", "vosotros": "...", "ellos_ellas_ustedes": "..."}} or null
+        }}
+    ]
+}}"""
         
-        result = json.loads(response.choices[0].message.content)
-        return result
+        words = llm.chat_json("You are a Spanish language expert. Respond only with valid JSON.", prompt, 0.3).get("words")
+    except LLMUnavailableError:
+        return [None] * len(terms)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI processing error: {str(e)}")
 
-def get_verb_conjugation(word: str) -> dict:
-    """Get verb conjugation for simple present tense"""
-    if not openai_client:
-        return {
-            "yo": word,
-            "tu": word,
-            "el_ella_usted": word,
-            "nosotros": word,
-            "vosotros": word,
-            "ellos_ellas_ustedes": word
-        }
+    if not isinstance(words, list) or len(words) != len(terms):
+        # Entries that do not line up with the terms cannot be matched to them
+        logger.warning("Batch word analysis returned %s entries for %d terms",
+                       len(words) if isinstance(words, list) else "no", len(terms))
+        return [None] * len(terms)
+    return [
+        word if isinstance(word, dict) and word.get("word_spanish") and word.get("word_native") and word.get("word_type")
+        else None
+        for word in words
+    ]
+
+def get_verb_conjugation(word: str) -> Optional[dict]:
+    """Get verb conjugation for simple present tense.
+
+    None when no LLM can provide it right now (none configured, or breaker
+    open): callers answer with _fallback_conjugation but do not store it, so
+    a later request generates the real forms.
+    """
+    local = conjugation_engine.conjugate(word)
+    if local:
+        return local
+    
+    llm = llms.get("conjugation")
+    if not llm:
+        return None
     
+    return llm_singleflight.do(
+        llm_key("conjugation", word),
+        lambda: _get_verb_conjugation_from_llm(llm, word)
+    )
+
+def _get_verb_conjugation_from_llm(llm, word: str) -> Optional[dict]:
     try:
         prompt = f"""Provide the simple present tense conjugation for the Spanish verb: {word}
 
@@ -244,30 +413,24 @@ Respond in JSON format:
     "ellos_ellas_ustedes": "conjugation"
 }}"""
         
-        response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a Spanish grammar expert. Respond only with valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.2
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        return result
+        return llm.chat_json("You are a Spanish grammar expert. Respond only with valid JSON.", prompt, 0.2)
+    except LLMUnavailableError:
+        return None
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Conjugation error: {str(e)}")
 
 def check_answer_and_explain(user_answer: str, correct_answer: str, word_spanish: str, native_language: str) -> dict:
     """Check if answer is correct and provide explanation"""
-    if not openai_client:
-        is_correct = user_answer.lower().strip() == word_spanish.lower().strip()
-        return {
-            "is_correct": is_correct,
-            "correct_answer": word_spanish,
-            "explanation": "AI explanation not available without API key"
-        }
+    llm = llms.get("grading")
+    if not llm:
+        return _fallback_answer_check(user_answer, word_spanish, "AI explanation not available without API key")
     
+    return llm_singleflight.do(
+        llm_key("grading", user_answer, correct_answer, word_spanish, native_language),
+        lambda: _check_answer_with_llm(llm, user_answer, correct_answer, word_spanish, native_language)
+    )
+
+def _check_answer_with_llm(llm, user_answer: str, correct_answer: str, word_spanish: str, native_language: str) -> dict:
     try:
         prompt = f"""The user is learning Spanish. They were asked to translate "{correct_answer}" from {native_language} to Spanish.
 The correct answer is: {word_spanish}
@@ -282,31 +445,63 @@ Respond in JSON format:
     "explanation": "helpful explanation in {native_language}"
 }}"""
         
-        response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a helpful Spanish teacher. Respond only with valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        return result
-    except Exception as e:
-        # Fallback to simple comparison
-        is_correct = user_answer.lower().strip() == word_spanish.lower().strip()
-        return {
-            "is_correct": is_correct,
-            "correct_answer": word_spanish,
-            "explanation": f"The correct answer is '{word_spanish}'. {'' if is_correct else 'Keep practicing!'}"
-        }
+        return llm.chat_json("You are a helpful Spanish teacher. Respond only with valid JSON.", prompt, 0.3)
+    except Exception:
+        # Fallback to simple comparison (also covers an open breaker)
+        return _fallback_answer_check(user_answer, word_spanish)
+
+def grade_answer(user_answer: str, word_spanish: str) -> bool:
+    """Instant local verdict: an answer is right if it is the same word by the duplicate check's
+    rules (search.duplicate_key: case, acute accents and diaereses aside), whatever its spacing"""
+    return search.duplicate_key(" ".join(user_answer.split())) == search.duplicate_key(" ".join(word_spanish.split()))
+
+def stream_explanation(user_answer: str, correct_answer: str, word_spanish: str, native_language: str,
+                       is_correct: bool) -> Iterator[str]:
+    """Explanation of an already graded answer, in chunks as the model writes it"""
+    llm = llms.get("grading")
+    if not llm:
+        yield "AI explanation not available without API key"
+        return
+
+    prompt = f"""The user is learning Spanish. They were asked to translate "{correct_answer}" from {native_language} to Spanish.
+The correct answer is: {word_spanish}
+The user answered: {user_answer}
+The answer was graded as {"correct" if is_correct else "incorrect"}.
+
+In {native_language}, give the user a short, helpful explanation (at most three sentences). Reply with the explanation only."""
+
+    yield from llm.stream_text("You are a helpful Spanish teacher.", prompt, 0.3)
+
+def save_answer(entry: dict):
+    """Log a graded answer outside any request session: buffered, or committed right away"""
+    if answer_buffer is not None:
+        answer_buffer.add(entry)
+        return
+    db = SessionLocal()
+    try:
+        write_answers(db, [entry])
+        db.commit()
+    finally:
+        db.close()
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
 # API Routes
 @app.get("/")
 def read_root():
     return {"message": "Spanish Learning API", "version": "1.0.0"}
 
+@app.get("/api/llm/stats")
+def get_llm_stats():
+    """LLM call counters: coalesced duplicates, retries, failures and circuit breaker state"""
+    return {
+        "singleflight": llm_singleflight.stats(),
+        "conjugation_engine": conjugation_engine.stats(),
+        "media_cache": media_cache.stats() if media_cache is not None else None,
+        **llms.stats()
+    }
+
 @app.post("/api/users", response_model=UserResponse)
 def create_user(user: UserCreate, db: Session = Depends(get_db)):
     if user.native_language not in ['en', 'ua']:
@@ -325,113 +520,379 @@ def get_user(user_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
-@app.post("/api/vocabulary/{user_id}", response_model=VocabularyResponse)
-def add_word_text(user_id: int, word: VocabularyCreate, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    vocab = Vocabulary(
-        user_id=user_id,
-        word_spanish=word.word_spanish,
-        word_native=word.word_native,
-        word_type=word.word_type,
-        is_verb=word.word_type.lower() == 'verb'
-    )
-    db.add(vocab)
-    db.commit()
-    db.refresh(vocab)
-    
-    # If verb, get conjugation
-    if vocab.is_verb:
-        conjugation_data = get_verb_conjugation(word.word_spanish)
-        conjugation = VerbConjugation(
-            vocabulary_id=vocab.id,
-            **conjugation_data
-        )
-        db.add(conjugation)
-        db.commit()
-    
-    return vocab
+@app.get("/api/users/{user_id}/stats", response_model=UserStatsResponse)
+def get_user_stats(
+    user_id: int,
+    days: int = Query(30, ge=1, le=365),
+    hardest: int = Query(10, ge=0, le=100),
+    db: Session = Depends(get_db)
+):
+    """Progress summary served from the incrementally maintained aggregates (see stats.py)"""
+    get_user_or_404(db, user_id)
+    return stats.get_user_stats(db, user_id, days=days, hardest=hardest)
 
-@app.post("/api/vocabulary/{user_id}/from-image")
-def add_word_from_image(user_id: int, file: UploadFile = File(...), db: Session = Depends(get_db)):
+def get_user_or_404(db: Session, user_id: int) -> User:
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+def ingest_word(db: Session, user_id: int, word_data: dict) -> VocabularyResponse:
+    """Store a vocabulary entry and, for verbs, its conjugation in one transaction.
+
+    Any LLM work happens before the first write and with the pooled connection
+    released, so no transaction stays open across a network call. Both rows go
+    out in a single flush (INSERT ... RETURNING for the ids) and one commit; the
+    response is built from the flushed state instead of refreshing after commit.
+    A word the user already has (ignoring case, acute accents and diaereses) is
+    rejected with a 409 before any of that, through the duplicate key's index.
+    """
+    duplicate = search.find_duplicate(db, user_id, word_data["word_spanish"])
+    if duplicate:
+        raise HTTPException(status_code=409, detail=f"'{duplicate.word_spanish}' is already in your vocabulary")
+
+    is_verb = bool(word_data.get("is_verb", False))
+    conjugation_data = None
+    if is_verb:
+        db.close()
+        conjugation_data = get_verb_conjugation(word_data["word_spanish"])
     
-    image_bytes = file.file.read()
-    extracted_text = extract_text_from_image(image_bytes)
-    
-    if not extracted_text:
-        raise HTTPException(status_code=400, detail="No text found in image")
-    
-    # Process with AI
-    word_data = process_word_with_ai(extracted_text, user.native_language)
-    
+    now = datetime.utcnow()
     vocab = Vocabulary(
         user_id=user_id,
         word_spanish=word_data["word_spanish"],
         word_native=word_data["word_native"],
         word_type=word_data["word_type"],
-        is_verb=word_data.get("is_verb", False)
+        is_verb=is_verb,
+        created_at=now,
+        times_correct=0,
+        times_incorrect=0
     )
+    if conjugation_data:
+        vocab.verb_conjugation = VerbConjugation(created_at=now, **conjugation_data)
     db.add(vocab)
-    db.commit()
-    db.refresh(vocab)
+    db.flush()
     
-    if vocab.is_verb:
-        conjugation_data = get_verb_conjugation(word_data["word_spanish"])
-        conjugation = VerbConjugation(
-            vocabulary_id=vocab.id,
-            **conjugation_data
+    response = VocabularyResponse(
+        id=vocab.id,
+        word_spanish=vocab.word_spanish,
+        word_native=vocab.word_native,
+        word_type=vocab.word_type,
+        is_verb=vocab.is_verb,
+        created_at=vocab.created_at
+    )
+    db.commit()
+    return response
+
+def ingest_words(db: Session, user_id: int, words: List[dict]) -> List[VocabularyResponse]:
+    """Store many vocabulary entries and their verbs' conjugations in one flush and one commit.
+
+    Conjugations come from the local engine, else from the batch analysis;
+    unlike ingest_word this never makes another LLM call per verb. Verbs with
+    neither are stored without one, for the conjugation endpoints to generate.
+    """
+    now = datetime.utcnow()
+    entries = []
+    for word_data in words:
+        is_verb = bool(word_data.get("is_verb", False))
+        vocab = Vocabulary(
+            user_id=user_id,
+            word_spanish=word_data["word_spanish"],
+            word_native=word_data["word_native"],
+            word_type=word_data["word_type"],
+            is_verb=is_verb,
+            created_at=now,
+            times_correct=0,
+            times_incorrect=0
         )
-        db.add(conjugation)
-        db.commit()
-    
-    return vocab
+        if is_verb:
+            suggested = word_data.get("conjugation")
+            conjugation = conjugation_engine.conjugate(vocab.word_spanish) or (
+                {field: str(suggested[field]) for field in CONJUGATION_FIELDS}
+                if isinstance(suggested, dict) and all(suggested.get(field) for field in CONJUGATION_FIELDS)
+                else None
+            )
+            if conjugation:
+                vocab.verb_conjugation = VerbConjugation(created_at=now, **conjugation)
+        entries.append(vocab)
+    # One multi-row INSERT per table (insertmanyvalues returns the ids)
+    db.add_all(entries)
+    db.flush()
 
-@app.post("/api/vocabulary/{user_id}/from-audio")
-def add_word_from_audio(user_id: int, file: UploadFile = File(...), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    audio_bytes = file.file.read()
-    extracted_text = extract_text_from_audio(audio_bytes)
+    responses = [
+        VocabularyResponse(
+            id=vocab.id,
+            word_spanish=vocab.word_spanish,
+            word_native=vocab.word_native,
+            word_type=vocab.word_type,
+            is_verb=vocab.is_verb,
+            created_at=vocab.created_at
+        )
+        for vocab in entries
+    ]
+    db.commit()
+    return responses
+
+def read_upload(file: UploadFile, extract_text, media: str) -> Tuple[Optional[str], dict]:
+    """(media cache key, cache entry) for an upload; OCR/speech recognition fills in the
+    entry's text unless the same file was uploaded before"""
+    content = file.file.read()
+    key = media_cache.key(media, content) if media_cache is not None else None
+    cached = (media_cache.get(key) if key else None) or {"text": None, "word_data": {}}
+    if cached["text"] is None:
+        cached["text"] = extract_text(content)
+    if not cached["text"]:
+        raise HTTPException(status_code=400, detail=f"No text found in {media}")
+    return key, cached
+
+def add_word_from_media(db: Session, user_id: int, file: UploadFile, extract_text, media: str) -> VocabularyResponse:
+    """Shared body of the image and audio upload endpoints; re-uploads are served from media_cache"""
+    native_language = get_user_or_404(db, user_id).native_language
+    # OCR/speech recognition and the LLM are slow: give the connection back meanwhile
+    db.close()
     
-    if not extracted_text:
-        raise HTTPException(status_code=400, detail="No text found in audio")
+    key, cached = read_upload(file, extract_text, media)
+    extracted_text = cached["text"]
     
     # Process with AI
-    word_data = process_word_with_ai(extracted_text, user.native_language)
-    
-    vocab = Vocabulary(
-        user_id=user_id,
-        word_spanish=word_data["word_spanish"],
-        word_native=word_data["word_native"],
-        word_type=word_data["word_type"],
-        is_verb=word_data.get("is_verb", False)
-    )
-    db.add(vocab)
-    db.commit()
-    db.refresh(vocab)
-    
-    if vocab.is_verb:
-        conjugation_data = get_verb_conjugation(word_data["word_spanish"])
-        conjugation = VerbConjugation(
-            vocabulary_id=vocab.id,
-            **conjugation_data
+    word_data = cached["word_data"].get(native_language)
+    if word_data is None:
+        word_data = process_word_with_ai(extracted_text, native_language)
+        if key:
+            # Only LLM analyses are kept, so configuring an LLM later takes effect on re-uploads
+            if word_data is not None and llms.get("word"):
+                cached["word_data"][native_language] = word_data
+            media_cache.put(key, cached)
+        if word_data is None:
+            # Storing a placeholder would make the retry a duplicate; the
+            # extracted text is cached, so the retry only repeats the analysis
+            raise HTTPException(status_code=503, detail=f"Could not analyze '{extracted_text}' right now, please try again")
+    return ingest_word(db, user_id, word_data)
+
+# Terms taken from one batch upload: their analysis has to fit in one LLM response
+MAX_BATCH_WORDS = int(os.getenv("MAX_BATCH_WORDS", "50"))
+# Longer runs of words are sentences or headings, not vocabulary
+MAX_TERM_WORDS = 4
+LIST_MARKER = re.compile(r"^\s*(?:\d+[.)]|[-•*·–—])\s+")
+TRANSLATION_SEPARATOR = re.compile(r"\s+[-–—=]\s+|\s*:\s+|\t")
+TERM_SEPARATOR = re.compile(r"[,;|•·/]")
+TERM_PUNCTUATION = " .,;:!?¡¿\"'«»()[]"
+
+def split_terms(text: str, media: str) -> List[str]:
+    """Candidate vocabulary terms in extracted text, in order, each once (by duplicate key).
+
+    OCR keeps a page's layout: a term per line or between commas, with list
+    numbering and any translation after " - ", " = " or ":" dropped. Speech
+    recognition returns no punctuation, so audio is split into single words.
+    """
+    if media == "audio":
+        parts = text.split()
+    else:
+        parts = [
+            part
+            for line in text.splitlines()
+            for part in TERM_SEPARATOR.split(TRANSLATION_SEPARATOR.split(LIST_MARKER.sub("", line), maxsplit=1)[0])
+        ]
+    terms, seen = [], set()
+    for part in parts:
+        term = " ".join(part.strip(TERM_PUNCTUATION).split())
+        key = search.duplicate_key(term)
+        if not any(char.isalpha() for char in term) or len(term.split()) > MAX_TERM_WORDS or key in seen:
+            continue
+        seen.add(key)
+        terms.append(term)
+    return terms
+
+def add_words_from_media(db: Session, user_id: int, file: UploadFile, extract_text, media: str) -> VocabularyBatchResponse:
+    """Shared body of the batch upload endpoints: every term on a page or in a clip.
+
+    Terms the user already has are dropped before the LLM sees them; the rest
+    are analyzed in one LLM request and inserted in one transaction. Terms the
+    LLM could not analyze right now are reported as failed instead of stored;
+    without an LLM every term is stored with the baseline analysis.
+    Analyses are cached per term with the upload, so a retry only pays for
+    what failed.
+    """
+    start = time.perf_counter()
+    native_language = get_user_or_404(db, user_id).native_language
+    db.close()
+
+    key, cached = read_upload(file, extract_text, media)
+    terms = split_terms(cached["text"], media)
+    if not terms:
+        raise HTTPException(status_code=400, detail=f"No words found in {media}")
+    terms, ignored = terms[:MAX_BATCH_WORDS], terms[MAX_BATCH_WORDS:]
+
+    known = search.existing_keys(db, user_id, terms)
+    existing = [term for term in terms if search.duplicate_key(term) in known]
+    new_terms = [term for term in terms if search.duplicate_key(term) not in known]
+    db.close()
+
+    first_batch = "words" not in cached
+    analyses: Dict[str, dict] = cached.setdefault("words", {}).setdefault(native_language, {})
+    missing = [term for term in new_terms if term not in analyses]
+    fresh = dict(zip(missing, process_words_with_ai(missing, native_language))) if missing else {}
+    if key and (missing or first_batch):
+        # Only LLM analyses are kept: failed terms are retried and configuring an LLM later takes effect
+        if llms.get("word"):
+            analyses.update({term: word for term, word in fresh.items() if word is not None})
+        media_cache.put(key, cached)
+    analyzed, failed = [], []
+    for term in new_terms:
+        word = fresh[term] if term in fresh else analyses[term]
+        if word is None:
+            # Not stored: a row would make the retry skip the term as existing
+            failed.append(term)
+        else:
+            analyzed.append((term, word))
+
+    # The analysis may correct a misread spelling into a word the user already has
+    corrected = [
+        word["word_spanish"] for term, word in analyzed
+        if search.duplicate_key(word["word_spanish"]) != search.duplicate_key(term)
+    ]
+    if corrected:
+        known |= search.existing_keys(db, user_id, corrected)
+    unique = []
+    for term, word in analyzed:
+        word_key = search.duplicate_key(word["word_spanish"])
+        if word_key in known:
+            existing.append(term)
+            continue
+        known.add(word_key)
+        unique.append(word)
+
+    added = ingest_words(db, user_id, unique) if unique else []
+    elapsed = time.perf_counter() - start
+    logger.info("Batch %s upload: %d words added, %d failed in %.2fs (%.1f words/s)",
+                media, len(added), len(failed), elapsed, len(added) / elapsed if elapsed else 0.0)
+    return VocabularyBatchResponse(text=cached["text"], added=added, existing=existing, failed=failed,
+                                   ignored=ignored)
+
+@app.post("/api/vocabulary/{user_id}", response_model=VocabularyResponse)
+def add_word_text(user_id: int, word: VocabularyCreate, db: Session = Depends(get_db)):
+    get_user_or_404(db, user_id)
+    return ingest_word(db, user_id, {
+        "word_spanish": word.word_spanish,
+        "word_native": word.word_native,
+        "word_type": word.word_type,
+        "is_verb": word.word_type.lower() == 'verb'
+    })
+
+@app.post("/api/vocabulary/{user_id}/from-image", response_model=VocabularyResponse)
+def add_word_from_image(user_id: int, file: UploadFile = File(...), db: Session = Depends(get_db)):
+    return add_word_from_media(db, user_id, file, extract_text_from_image, "image")
+
+@app.post("/api/vocabulary/{user_id}/from-audio", response_model=VocabularyResponse)
+def add_word_from_audio(user_id: int, file: UploadFile = File(...), db: Session = Depends(get_db)):
+    return add_word_from_media(db, user_id, file, extract_text_from_audio, "audio")
+
+@app.post("/api/vocabulary/{user_id}/from-image/batch", response_model=VocabularyBatchResponse)
+def add_words_from_image(user_id: int, file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """Every word on a photographed page or list, one per line or separated by commas"""
+    return add_words_from_media(db, user_id, file, extract_text_from_image, "image")
+
+@app.post("/api/vocabulary/{user_id}/from-audio/batch", response_model=VocabularyBatchResponse)
+def add_words_from_audio(user_id: int, file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """Every word in a recording of single words"""
+    return add_words_from_media(db, user_id, file, extract_text_from_audio, "audio")
+
+# The list endpoint reads exactly VocabularyResponse's columns, without loading ORM objects
+VOCABULARY_RESPONSE_COLUMNS = tuple(getattr(Vocabulary, field) for field in VocabularyResponse.model_fields)
+CONJUGATION_FIELDS = tuple(VerbConjugationResponse.model_fields)
+
+@app.get("/api/vocabulary/{user_id}", response_model=List[VocabularyListItem])
+def get_vocabulary(
+    user_id: int,
+    include: Optional[str] = Query(None, pattern="^conjugation$", description="`conjugation` adds each verb's conjugation"),
+    db: Session = Depends(get_db)
+):
+    query = select(*VOCABULARY_RESPONSE_COLUMNS).where(Vocabulary.user_id == user_id)
+    if include:
+        # One LEFT JOIN instead of a conjugation request or query per verb
+        query = query.add_columns(*(getattr(VerbConjugation, field) for field in CONJUGATION_FIELDS)).outerjoin(
+            VerbConjugation, VerbConjugation.vocabulary_id == Vocabulary.id
         )
-        db.add(conjugation)
-        db.commit()
-    
-    return vocab
+    # Rows from our own tables already have the response's shape; returning
+    # them through orjson skips building and validating a model per word
+    items = []
+    for row in db.execute(query).mappings():
+        item = {column.key: row[column.key] for column in VOCABULARY_RESPONSE_COLUMNS}
+        if include:
+            item["conjugation"] = {field: row[field] for field in CONJUGATION_FIELDS} if row["yo"] is not None else None
+        items.append(item)
+    return Response(orjson.dumps(items), media_type="application/json")
+
+@app.get("/api/vocabulary/{user_id}/search", response_model=List[VocabularySearchResult])
+def search_vocabulary(
+    user_id: int,
+    q: str = Query(..., min_length=1, max_length=255, description="Spanish or native text; case, accents and small typos are ignored"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """The user's words matching `q` in either language: exact matches first, then prefixes, then by similarity"""
+    return [
+        VocabularySearchResult(
+            id=vocab.id,
+            word_spanish=vocab.word_spanish,
+            word_native=vocab.word_native,
+            word_type=vocab.word_type,
+            is_verb=bool(vocab.is_verb),
+            created_at=vocab.created_at,
+            score=round(score, 4)
+        )
+        for vocab, score in search.search(db, user_id, q, limit)
+    ]
+
+# Upper bound on ids per bulk conjugation request
+MAX_BULK_CONJUGATIONS = 200
+
+@app.get("/api/conjugations", response_model=List[VocabularyConjugation])
+def get_conjugations(
+    ids: List[int] = Query(..., description="Vocabulary ids; words that are not verbs or do not exist are skipped"),
+    db: Session = Depends(get_db)
+):
+    """Conjugations of many verbs in one request, in the order of `ids`.
+
+    Like the single-word endpoint, conjugations not stored yet are generated
+    (local engine first, LLM for the rest) and stored.
+    """
+    if len(ids) > MAX_BULK_CONJUGATIONS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_CONJUGATIONS} ids per request")
+
+    verbs = (
+        db.query(Vocabulary)
+        .options(selectinload(Vocabulary.verb_conjugation))
+        .filter(Vocabulary.id.in_(ids), Vocabulary.is_verb.is_(True))
+        .all()
+    )
+    conjugations = {
+        vocab.id: VerbConjugationResponse.model_validate(vocab.verb_conjugation, from_attributes=True).model_dump()
+        for vocab in verbs if vocab.verb_conjugation is not None
+    }
+    missing = {vocab.id: vocab.word_spanish for vocab in verbs if vocab.verb_conjugation is None}
+    if missing:
+        # Generation may call the LLM; do not hold a connection meanwhile
+        db.close()
+        generated = {vocab_id: get_verb_conjugation(word) for vocab_id, word in missing.items()}
+        now = datetime.utcnow()
+        rows = [{"vocabulary_id": vocab_id, "created_at": now, **data} for vocab_id, data in generated.items() if data]
+        if rows:
+            # Rows a concurrent request stored first are skipped, not the whole batch; theirs and ours are equivalent
+            db.execute(
+                stats.dialect_insert(db)(VerbConjugation).on_conflict_do_nothing(index_elements=["vocabulary_id"]),
+                rows
+            )
+            db.commit()
+        # Verbs the LLM could not conjugate just now get placeholders, which are not stored
+        conjugations.update({
+            vocab_id: data or _fallback_conjugation(missing[vocab_id]) for vocab_id, data in generated.items()
+        })
 
-@app.get("/api/vocabulary/{user_id}", response_model=List[VocabularyResponse])
-def get_vocabulary(user_id: int, db: Session = Depends(get_db)):
-    vocab_list = db.query(Vocabulary).filter(Vocabulary.user_id == user_id).all()
-    return vocab_list
+    return [
+        VocabularyConjugation(vocabulary_id=vocab_id, **conjugations[vocab_id])
+        for vocab_id in dict.fromkeys(ids) if vocab_id in conjugations
+    ]
 
 @app.get("/api/vocabulary/{vocab_id}/conjugation", response_model=VerbConjugationResponse)
 def get_conjugation(vocab_id: int, db: Session = Depends(get_db)):
@@ -444,33 +905,89 @@ def get_conjugation(vocab_id: int, db: Session = Depends(get_db)):
     conjugation = db.query(VerbConjugation).filter(VerbConjugation.vocabulary_id == vocab_id).first()
     if not conjugation:
         # Generate conjugation on the fly
-        conjugation_data = get_verb_conjugation(vocab.word_spanish)
-        conjugation = VerbConjugation(
-            vocabulary_id=vocab_id,
-            **conjugation_data
-        )
-        db.add(conjugation)
-        db.commit()
-        db.refresh(conjugation)
+        word_spanish = vocab.word_spanish
+        db.close()
+        conjugation_data = get_verb_conjugation(word_spanish)
+        if not conjugation_data:
+            # No LLM right now: a placeholder, not stored, so the next request tries again
+            return VerbConjugationResponse(**_fallback_conjugation(word_spanish))
+        try:
+            db.add(VerbConjugation(vocabulary_id=vocab_id, **conjugation_data))
+            db.commit()
+        except IntegrityError:
+            # A concurrent request stored it first; theirs and ours are equivalent
+            db.rollback()
+        return VerbConjugationResponse(**conjugation_data)
     
     return conjugation
 
+def schedule_words(db: Session, user_id: int, count: int, exclude: List[int] = ()) -> List[Vocabulary]:
+    """The next words to review: never reviewed first, then least recently reviewed"""
+    query = db.query(Vocabulary).filter(Vocabulary.user_id == user_id)
+    if exclude:
+        query = query.filter(Vocabulary.id.notin_(exclude))
+    return query.order_by(Vocabulary.last_reviewed.asc().nulls_first(), Vocabulary.id).limit(count).all()
+
+def question_text(vocab: Vocabulary) -> str:
+    return f"Translate '{vocab.word_native}' to Spanish"
+
 @app.get("/api/learning/{user_id}/question", response_model=LearningQuestion)
 def get_learning_question(user_id: int, db: Session = Depends(get_db)):
-    """Get a random word for learning session"""
-    vocab = db.query(Vocabulary).filter(Vocabulary.user_id == user_id).first()
-    if not vocab:
+    """Get the next word to review"""
+    words = schedule_words(db, user_id, 1)
+    if not words:
         raise HTTPException(status_code=404, detail="No vocabulary found for user")
-    
-    user = db.query(User).filter(User.id == user_id).first()
-    question = f"Translate '{vocab.word_native}' to Spanish"
+    vocab = words[0]
     
     return LearningQuestion(
         vocabulary_id=vocab.id,
-        question=question,
+        question=question_text(vocab),
         correct_answer=vocab.word_spanish
     )
 
+@app.get("/api/learning/{user_id}/questions", response_model=List[QuestionCard])
+def get_learning_questions(
+    user_id: int,
+    count: int = Query(10, ge=1, le=50),
+    exclude: List[int] = Query([], description="Vocabulary ids to skip: cards the client still has queued "
+                                                "and words answered since its last fetch"),
+    db: Session = Depends(get_db)
+):
+    """The next `count` cards in review order, verb conjugations included, for a client-side queue.
+
+    Answers move their word to the back of the schedule, so refills that
+    pass the client's queued and recently answered ids never repeat a card
+    (even before buffered answers are flushed).
+    """
+    words = schedule_words(db, user_id, count, exclude)
+    if not words:
+        if not db.query(Vocabulary.id).filter(Vocabulary.user_id == user_id).first():
+            raise HTTPException(status_code=404, detail="No vocabulary found for user")
+        return []
+
+    verb_ids = [vocab.id for vocab in words if vocab.is_verb]
+    stored = {
+        conjugation.vocabulary_id: VerbConjugationResponse.model_validate(conjugation, from_attributes=True)
+        for conjugation in db.query(VerbConjugation).filter(VerbConjugation.vocabulary_id.in_(verb_ids))
+    } if verb_ids else {}
+
+    cards = []
+    for vocab in words:
+        conjugation = None
+        if vocab.is_verb:
+            # Stored at ingestion; otherwise the local engine, never an LLM call in a batch.
+            # Verbs it cannot conjugate are left to /api/vocabulary/{id}/conjugation
+            conjugation = stored.get(vocab.id) or conjugation_engine.conjugate(vocab.word_spanish)
+        cards.append(QuestionCard(
+            vocabulary_id=vocab.id,
+            question=question_text(vocab),
+            correct_answer=vocab.word_spanish,
+            word_type=vocab.word_type,
+            is_verb=bool(vocab.is_verb),
+            conjugation=conjugation
+        ))
+    return cards
+
 @app.post("/api/learning/{user_id}/answer", response_model=LearningResponse)
 def submit_answer(user_id: int, answer: LearningAnswer, db: Session = Depends(get_db)):
     """Submit answer and get feedback"""
@@ -488,12 +1005,28 @@ def submit_answer(user_id: int, answer: LearningAnswer, db: Session = Depends(ge
         user.native_language
     )
     
-    # Update vocabulary stats
+    answered_at = datetime.utcnow()
+    if answer_buffer is not None:
+        # Counters, session row and aggregates are written by the next batch flush
+        db.close()
+        answer_buffer.add({
+            "user_id": user_id,
+            "vocabulary_id": answer.vocabulary_id,
+            "user_answer": answer.user_answer,
+            "correct_answer": vocab.word_spanish,
+            "is_correct": result["is_correct"],
+            "explanation": result["explanation"],
+            "session_date": answered_at,
+            "word_type": vocab.word_type
+        })
+        return result
+    
+    # Update vocabulary stats; incremented in SQL so concurrent answers are not lost
     if result["is_correct"]:
-        vocab.times_correct += 1
+        vocab.times_correct = Vocabulary.times_correct + 1
     else:
-        vocab.times_incorrect += 1
-    vocab.last_reviewed = datetime.utcnow()
+        vocab.times_incorrect = Vocabulary.times_incorrect + 1
+    vocab.last_reviewed = answered_at
     
     # Save learning session
     session = LearningSession(
@@ -502,13 +1035,86 @@ def submit_answer(user_id: int, answer: LearningAnswer, db: Session = Depends(ge
         user_answer=answer.user_answer,
         correct_answer=vocab.word_spanish,
         is_correct=result["is_correct"],
-        explanation=result["explanation"]
+        explanation=result["explanation"],
+        session_date=answered_at
     )
     db.add(session)
+    # Progress aggregates commit together with the session they count
+    stats.record_answer(db, user_id, vocab.word_type, result["is_correct"], answered_at)
     db.commit()
     
     return result
 
+@app.post("/api/learning/{user_id}/answer/stream")
+def submit_answer_stream(user_id: int, answer: LearningAnswer, db: Session = Depends(get_db)):
+    """Submit an answer and get feedback as server-sent events.
+
+    `verdict` (is_correct, correct_answer) is sent at once from the local
+    grader, `explanation` events carry text chunks as the model writes them,
+    and `done` carries the full LearningResponse after the answer is saved.
+    """
+    vocab = db.query(Vocabulary).filter(Vocabulary.id == answer.vocabulary_id).first()
+    if not vocab:
+        raise HTTPException(status_code=404, detail="Vocabulary not found")
+    native_language = get_user_or_404(db, user_id).native_language
+
+    entry = {
+        "user_id": user_id,
+        "vocabulary_id": answer.vocabulary_id,
+        "user_answer": answer.user_answer,
+        "correct_answer": vocab.word_spanish,
+        "is_correct": grade_answer(answer.user_answer, vocab.word_spanish),
+        "explanation": "",
+        "session_date": datetime.utcnow(),
+        "word_type": vocab.word_type
+    }
+    word_native = vocab.word_native
+    # The stream saves through its own session; do not hold a connection while the model writes
+    db.close()
+
+    async def events():
+        # Async so that a client disconnect cancels it and the cleanup below runs;
+        # the model stream and the save still run in the thread pool
+        chunks = []
+        saved = False
+        try:
+            yield sse_event("verdict", {"is_correct": entry["is_correct"], "correct_answer": entry["correct_answer"]})
+            explanation = stream_explanation(
+                answer.user_answer, word_native, entry["correct_answer"], native_language, entry["is_correct"]
+            )
+            try:
+                with closing(explanation):
+                    async for chunk in iterate_in_threadpool(explanation):
+                        chunks.append(chunk)
+                        yield sse_event("explanation", {"text": chunk})
+            except Exception as e:
+                # Breaker open, deadline or provider failure: keep what arrived, or fall back
+                logger.warning("Explanation stream failed: %s", e)
+                if not chunks:
+                    chunks.append(_fallback_answer_check(answer.user_answer, entry["correct_answer"])["explanation"])
+                    yield sse_event("explanation", {"text": chunks[0]})
+            entry["explanation"] = "".join(chunks).strip()
+            saved = True  # set first: a failed save is not retried below
+            await run_in_threadpool(save_answer, entry)
+            yield sse_event("done", {
+                "is_correct": entry["is_correct"],
+                "correct_answer": entry["correct_answer"],
+                "explanation": entry["explanation"]
+            })
+        finally:
+            if not saved:
+                # The client left before the explanation finished; the answer still
+                # counts. Saved from a thread, since this task is being cancelled
+                entry["explanation"] = "".join(chunks).strip()
+                threading.Thread(target=save_answer, args=(entry,), name="save-answer").start()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Proxies must pass events through as they come (X-Accel-Buffering: nginx)
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
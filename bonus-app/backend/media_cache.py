@@ -0,0 +1,142 @@
+"""
+On-disk cache of media extraction results
+Image and audio uploads are keyed by a BLAKE2b hash of their bytes. An entry
+holds the text OCR or speech recognition found and the LLM's word analysis
+per native language, so re-uploading the same photo or clip (typically a
+retry after a failed request) skips tesseract, speech recognition and the
+LLM call:
+
+    {"text": "casa", "word_data": {"en": {"word_spanish": "casa", ...}}}
+
+Batch uploads (a page or clip of many words) keep their analyses per term
+under "words": {"en": {"casa": {...}, "perro": {...}}}.
+
+Entries are small JSON files under MEDIA_CACHE_DIR (the `uploads` volume in
+Docker), shared by every worker process. The store is bounded by
+MEDIA_CACHE_MAX_MB with least-recently-used eviction: a hit refreshes the
+file's mtime, and once the size written since the last scan passes the bound
+the directory is rescanned and the oldest entries removed down to 90% of it.
+Nothing touches the disk until the first upload (the first write scans the
+store), so worker start-up stays fast. MEDIA_CACHE_MAX_MB=0 disables the
+cache.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Eviction stops once the store is back under this share of its bound
+LOW_WATER = 0.9
+
+
+class MediaCache:
+    """Extraction results by content hash, bounded in bytes, least recently used evicted first"""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Size of the store on disk, as of the last scan plus this process's writes; None until the first write
+        self._bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(media: str, content: bytes) -> str:
+        # The media type personalizes the hash: the same bytes as image and as audio are different entries
+        return hashlib.blake2b(content, digest_size=20, person=media.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError):
+            # Evicted by another worker mid-read, or a damaged file
+            logger.warning("Discarding unreadable media cache entry %s", key)
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: dict):
+        path = self._path(key)
+        payload = json.dumps(entry, ensure_ascii=False).encode()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                # A re-put (a batch upload retried) replaces the entry instead of adding to the store
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            # Readers in other workers never see a partly written file
+            fd, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(temporary, path)
+        except OSError:
+            logger.exception("Could not write media cache entry %s", key)
+            return
+        with self._lock:
+            if self._bytes is None:
+                # Includes the entry just written
+                self._bytes = sum(size for _, _, size in self._entries())
+            else:
+                self._bytes += len(payload) - replaced
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        """(mtime, path, size) for every entry on disk, whichever worker wrote it"""
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            yield stat.st_mtime, path, stat.st_size
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if total <= self.max_bytes * LOW_WATER:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+        self._bytes = total
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+def cache_from_env() -> Optional[MediaCache]:
+    """A MediaCache under MEDIA_CACHE_DIR, or None when MEDIA_CACHE_MAX_MB is 0"""
+    max_mb = float(os.getenv("MEDIA_CACHE_MAX_MB", "256"))
+    if max_mb <= 0:
+        return None
+    return MediaCache(os.getenv("MEDIA_CACHE_DIR", "uploads/media_cache"), int(max_mb * 1024 * 1024))
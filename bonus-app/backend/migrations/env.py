@@ -0,0 +1,65 @@
+"""
+Alembic environment
+Runs migrations against DATABASE_URL using the models' metadata
+"""
+
+import os
+from logging.config import fileConfig
+
+from alembic import context
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, pool
+
+from models import Base
+
+load_dotenv()
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+PARTITION_PREFIX = "learning_sessions_"
+
+
+def include_name(name, type_, parent_names):
+    """Leave the monthly learning_sessions partitions out of autogenerate"""
+    return not (type_ == "table" and name.startswith(PARTITION_PREFIX))
+
+
+DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://spanish_user:spanish_pass@db:5432/spanish_learning")
+
+
+def run_migrations_offline():
+    """Emit the migration SQL without a database connection (alembic upgrade --sql)"""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        include_name=include_name,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=DATABASE_URL.startswith("sqlite"),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    connectable = create_engine(DATABASE_URL, poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+            # SQLite can only change constraints by rebuilding the table
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,87 @@
+"""Initial schema (the former init.sql)
+
+Tables that already exist - created by init.sql or by the old import-time
+Base.metadata.create_all() - are left alone, so existing databases can be
+brought under migration control with a plain `alembic upgrade head`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    if "users" not in tables:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("username", sa.String(100), nullable=False, unique=True),
+            sa.Column("native_language", sa.String(10), nullable=False),
+            sa.Column("created_at", sa.DateTime, server_default=sa.func.current_timestamp()),
+            sa.CheckConstraint("native_language IN ('en', 'ua')", name="users_native_language_check"),
+        )
+
+    if "vocabulary" not in tables:
+        op.create_table(
+            "vocabulary",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id", name="vocabulary_user_id_fkey", ondelete="CASCADE")),
+            sa.Column("word_spanish", sa.String(255), nullable=False),
+            sa.Column("word_native", sa.String(255), nullable=False),
+            sa.Column("word_type", sa.String(50), nullable=False),
+            sa.Column("is_verb", sa.Boolean, server_default=sa.false()),
+            sa.Column("created_at", sa.DateTime, server_default=sa.func.current_timestamp()),
+            sa.Column("last_reviewed", sa.DateTime),
+            sa.Column("times_correct", sa.Integer, server_default="0"),
+            sa.Column("times_incorrect", sa.Integer, server_default="0"),
+        )
+        op.create_index("idx_vocabulary_user_id", "vocabulary", ["user_id"])
+        op.create_index("idx_vocabulary_word_spanish", "vocabulary", ["word_spanish"])
+
+    if "verb_conjugations" not in tables:
+        op.create_table(
+            "verb_conjugations",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("vocabulary_id", sa.Integer, sa.ForeignKey("vocabulary.id", name="verb_conjugations_vocabulary_id_fkey", ondelete="CASCADE")),
+            sa.Column("yo", sa.String(255), nullable=False),
+            sa.Column("tu", sa.String(255), nullable=False),
+            sa.Column("el_ella_usted", sa.String(255), nullable=False),
+            sa.Column("nosotros", sa.String(255), nullable=False),
+            sa.Column("vosotros", sa.String(255), nullable=False),
+            sa.Column("ellos_ellas_ustedes", sa.String(255), nullable=False),
+            sa.Column("created_at", sa.DateTime, server_default=sa.func.current_timestamp()),
+        )
+        op.create_index("idx_verb_conjugations_vocabulary_id", "verb_conjugations", ["vocabulary_id"])
+
+    if "learning_sessions" not in tables:
+        op.create_table(
+            "learning_sessions",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id", name="learning_sessions_user_id_fkey", ondelete="CASCADE")),
+            sa.Column("vocabulary_id", sa.Integer, sa.ForeignKey("vocabulary.id", name="learning_sessions_vocabulary_id_fkey", ondelete="CASCADE")),
+            sa.Column("user_answer", sa.Text),
+            sa.Column("correct_answer", sa.Text),
+            sa.Column("is_correct", sa.Boolean),
+            sa.Column("explanation", sa.Text),
+            sa.Column("session_date", sa.DateTime, server_default=sa.func.current_timestamp()),
+        )
+        op.create_index("idx_learning_sessions_user_id", "learning_sessions", ["user_id"])
+        op.create_index("idx_learning_sessions_vocabulary_id", "learning_sessions", ["vocabulary_id"])
+
+
+def downgrade():
+    op.drop_table("learning_sessions")
+    op.drop_table("verb_conjugations")
+    op.drop_table("vocabulary")
+    op.drop_table("users")
@@ -0,0 +1,104 @@
+"""Align constraints with the models and index the hot queries
+
+- NOT NULL on every foreign key and required column, ON DELETE CASCADE on
+  every foreign key (databases created by create_all() had neither)
+- verb_conjugations.vocabulary_id becomes unique (it is used one-to-one);
+  older duplicates are removed first, keeping the newest row
+- (user_id, last_reviewed) on vocabulary for per-user listings and review
+  scheduling, (user_id, session_date) on learning_sessions for history;
+  the single-column user_id indexes they make redundant are dropped
+- the ix_<table>_id indexes create_all() added on primary keys are dropped
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# Postgres' default FK names; batch mode uses the same names for SQLite's unnamed FKs
+NAMING_CONVENTION = {"fk": "%(table_name)s_%(column_0_name)s_fkey"}
+
+FOREIGN_KEYS = {
+    "vocabulary": [("user_id", "users")],
+    "verb_conjugations": [("vocabulary_id", "vocabulary")],
+    "learning_sessions": [("user_id", "users"), ("vocabulary_id", "vocabulary")],
+}
+
+NOT_NULL = {
+    "users": {"username": sa.String(100), "native_language": sa.String(10)},
+    "vocabulary": {
+        "user_id": sa.Integer(),
+        "word_spanish": sa.String(255),
+        "word_native": sa.String(255),
+        "word_type": sa.String(50),
+    },
+    "verb_conjugations": {
+        "vocabulary_id": sa.Integer(),
+        **{person: sa.String(255) for person in (
+            "yo", "tu", "el_ella_usted", "nosotros", "vosotros", "ellos_ellas_ustedes"
+        )},
+    },
+    "learning_sessions": {"user_id": sa.Integer(), "vocabulary_id": sa.Integer()},
+}
+
+
+def _drop_index_if_exists(inspector, table, name):
+    if name in {index["name"] for index in inspector.get_indexes(table)}:
+        op.drop_index(name, table_name=table)
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    op.execute(
+        "DELETE FROM verb_conjugations WHERE id NOT IN "
+        "(SELECT MAX(id) FROM verb_conjugations GROUP BY vocabulary_id)"
+    )
+
+    for table, columns in NOT_NULL.items():
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch:
+            for column, type_ in columns.items():
+                batch.alter_column(column, existing_type=type_, nullable=False)
+            for column, referred in FOREIGN_KEYS.get(table, []):
+                name = f"{table}_{column}_fkey"
+                batch.drop_constraint(name, type_="foreignkey")
+                batch.create_foreign_key(name, referred, [column], ["id"], ondelete="CASCADE")
+
+    inspector = sa.inspect(bind)
+    for table in ("users", "vocabulary", "verb_conjugations", "learning_sessions"):
+        _drop_index_if_exists(inspector, table, f"ix_{table}_id")
+
+    _drop_index_if_exists(inspector, "verb_conjugations", "idx_verb_conjugations_vocabulary_id")
+    _drop_index_if_exists(inspector, "verb_conjugations", "ix_verb_conjugations_vocabulary_id")
+    op.create_index("uq_verb_conjugations_vocabulary_id", "verb_conjugations", ["vocabulary_id"], unique=True)
+
+    op.create_index("idx_vocabulary_user_last_reviewed", "vocabulary", ["user_id", "last_reviewed"])
+    _drop_index_if_exists(inspector, "vocabulary", "idx_vocabulary_user_id")
+    if "idx_vocabulary_word_spanish" not in {i["name"] for i in inspector.get_indexes("vocabulary")}:
+        op.create_index("idx_vocabulary_word_spanish", "vocabulary", ["word_spanish"])
+
+    op.create_index("idx_learning_sessions_user_date", "learning_sessions", ["user_id", "session_date"])
+    _drop_index_if_exists(inspector, "learning_sessions", "idx_learning_sessions_user_id")
+    if "idx_learning_sessions_vocabulary_id" not in {i["name"] for i in inspector.get_indexes("learning_sessions")}:
+        op.create_index("idx_learning_sessions_vocabulary_id", "learning_sessions", ["vocabulary_id"])
+
+
+def downgrade():
+    op.create_index("idx_learning_sessions_user_id", "learning_sessions", ["user_id"])
+    op.drop_index("idx_learning_sessions_user_date", table_name="learning_sessions")
+    op.create_index("idx_vocabulary_user_id", "vocabulary", ["user_id"])
+    op.drop_index("idx_vocabulary_user_last_reviewed", table_name="vocabulary")
+    op.drop_index("uq_verb_conjugations_vocabulary_id", table_name="verb_conjugations")
+    op.create_index("idx_verb_conjugations_vocabulary_id", "verb_conjugations", ["vocabulary_id"])
+
+    for table in FOREIGN_KEYS:
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch:
+            for column, _ in FOREIGN_KEYS[table]:
+                batch.alter_column(column, existing_type=sa.Integer(), nullable=True)
@@ -0,0 +1,55 @@
+"""Progress aggregates for the stats endpoint
+
+user_stats (totals and streaks), user_daily_stats (per day and word type)
+and user_word_type_stats are updated on every answer. Existing history is
+backfilled with `python stats.py rebuild` after upgrading.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def _user_fk():
+    return sa.ForeignKey("users.id", ondelete="CASCADE")
+
+
+def upgrade():
+    op.create_table(
+        "user_stats",
+        sa.Column("user_id", sa.Integer, _user_fk(), primary_key=True),
+        sa.Column("answers", sa.Integer, nullable=False),
+        sa.Column("correct", sa.Integer, nullable=False),
+        sa.Column("current_streak", sa.Integer, nullable=False),
+        sa.Column("longest_streak", sa.Integer, nullable=False),
+        sa.Column("last_active_day", sa.Date),
+    )
+    op.create_table(
+        "user_daily_stats",
+        sa.Column("user_id", sa.Integer, _user_fk(), primary_key=True),
+        sa.Column("day", sa.Date, primary_key=True),
+        sa.Column("word_type", sa.String(50), primary_key=True),
+        sa.Column("answers", sa.Integer, nullable=False),
+        sa.Column("correct", sa.Integer, nullable=False),
+    )
+    op.create_table(
+        "user_word_type_stats",
+        sa.Column("user_id", sa.Integer, _user_fk(), primary_key=True),
+        sa.Column("word_type", sa.String(50), primary_key=True),
+        sa.Column("answers", sa.Integer, nullable=False),
+        sa.Column("correct", sa.Integer, nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("user_word_type_stats")
+    op.drop_table("user_daily_stats")
+    op.drop_table("user_stats")
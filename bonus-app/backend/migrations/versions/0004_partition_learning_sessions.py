@@ -0,0 +1,118 @@
+"""Partition learning_sessions by month
+
+On Postgres the table is rebuilt as RANGE-partitioned on session_date with
+one partition per month plus a default partition; the primary key becomes
+(id, session_date) because it must contain the partition key. Partitions for
+every month with data and the next three months are created here, later ones
+by `python retention.py`. Other databases only get the NOT NULL on
+session_date that the partition key needs.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+COLUMNS = "id, user_id, vocabulary_id, user_answer, correct_answer, is_correct, explanation, session_date"
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _create_table(sequence: str, *constraints, **kwargs):
+    op.create_table(
+        "learning_sessions",
+        sa.Column("id", sa.Integer, nullable=False, server_default=sa.text(f"nextval('{sequence}'::regclass)")),
+        sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id", name="learning_sessions_user_id_fkey", ondelete="CASCADE"), nullable=False),
+        sa.Column("vocabulary_id", sa.Integer, sa.ForeignKey("vocabulary.id", name="learning_sessions_vocabulary_id_fkey", ondelete="CASCADE"), nullable=False),
+        sa.Column("user_answer", sa.Text),
+        sa.Column("correct_answer", sa.Text),
+        sa.Column("is_correct", sa.Boolean),
+        sa.Column("explanation", sa.Text),
+        sa.Column("session_date", sa.DateTime, nullable=False, server_default=sa.func.current_timestamp()),
+        *constraints,
+        **kwargs
+    )
+    op.create_index("idx_learning_sessions_user_date", "learning_sessions", ["user_id", "session_date"])
+    op.create_index("idx_learning_sessions_vocabulary_id", "learning_sessions", ["vocabulary_id"])
+
+
+def _set_aside_old_table(sequence: str):
+    """Rename the current table and free the names the new one needs"""
+    op.execute("ALTER TABLE learning_sessions RENAME TO learning_sessions_old")
+    op.execute("ALTER TABLE learning_sessions_old RENAME CONSTRAINT learning_sessions_pkey TO learning_sessions_old_pkey")
+    op.drop_index("idx_learning_sessions_user_date", table_name="learning_sessions_old")
+    op.drop_index("idx_learning_sessions_vocabulary_id", table_name="learning_sessions_old")
+    # Keep the id sequence alive when the old table is dropped
+    op.execute(f"ALTER SEQUENCE {sequence} OWNED BY NONE")
+
+
+def _replace_old_table(sequence: str):
+    op.execute(f"INSERT INTO learning_sessions ({COLUMNS}) SELECT {COLUMNS} FROM learning_sessions_old")
+    op.execute("DROP TABLE learning_sessions_old")
+    op.execute(f"ALTER SEQUENCE {sequence} OWNED BY learning_sessions.id")
+
+
+def upgrade():
+    bind = op.get_bind()
+    op.execute("UPDATE learning_sessions SET session_date = CURRENT_TIMESTAMP WHERE session_date IS NULL")
+
+    if bind.dialect.name != "postgresql":
+        with op.batch_alter_table("learning_sessions") as batch:
+            batch.alter_column("session_date", existing_type=sa.DateTime(), nullable=False)
+        return
+
+    sequence = bind.execute(sa.text("SELECT pg_get_serial_sequence('learning_sessions', 'id')")).scalar()
+    first, last = bind.execute(sa.text(
+        "SELECT MIN(session_date)::date, MAX(session_date)::date FROM learning_sessions"
+    )).one()
+
+    _set_aside_old_table(sequence)
+    _create_table(
+        sequence,
+        sa.PrimaryKeyConstraint("id", "session_date", name="learning_sessions_pkey"),
+        postgresql_partition_by="RANGE (session_date)"
+    )
+    op.execute("CREATE TABLE learning_sessions_default PARTITION OF learning_sessions DEFAULT")
+
+    today = date.today()
+    month = (first or today).replace(day=1)
+    last = max(last or today, today).replace(day=1)
+    for _ in range(MONTHS_AHEAD):
+        last = _next_month(last)
+    while month <= last:
+        upper = _next_month(month)
+        op.execute(
+            f"CREATE TABLE learning_sessions_{month:%Y_%m} PARTITION OF learning_sessions "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+
+    _replace_old_table(sequence)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        with op.batch_alter_table("learning_sessions") as batch:
+            batch.alter_column("session_date", existing_type=sa.DateTime(), nullable=True)
+        return
+
+    sequence = bind.execute(sa.text("SELECT pg_get_serial_sequence('learning_sessions', 'id')")).scalar()
+    _set_aside_old_table(sequence)
+    _create_table(sequence, sa.PrimaryKeyConstraint("id", name="learning_sessions_pkey"))
+    # Dropping the partitioned table drops its partitions too
+    _replace_old_table(sequence)
+    op.alter_column("learning_sessions", "session_date", existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,66 @@
+"""Trigram indexes for vocabulary search and duplicate detection
+
+On Postgres: the unaccent and pg_trgm extensions, an immutable
+search_key(text) = lower(unaccent(text)) that expression indexes can use,
+and GIN trigram indexes on search_key() of word_spanish and word_native,
+for the search endpoint's LIKE and `<%` filters. The duplicate check on add
+compares duplicate_key(text), which only drops acute accents and diaereses,
+through a B-tree index on (user_id, duplicate_key(word_spanish)). See
+search.py. Other databases register both
+functions on each connection instead and need no schema change.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "idx_vocabulary_word_spanish_trgm": "word_spanish",
+    "idx_vocabulary_word_native_trgm": "word_native",
+}
+DUPLICATE_INDEX = "idx_vocabulary_user_duplicate_key"
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # unaccent() is only STABLE (its dictionary could change); naming the
+    # dictionary makes the wrapper safe to declare IMMUTABLE for indexing
+    op.execute(
+        "CREATE FUNCTION search_key(text) RETURNS text "
+        "LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE "
+        "AS $$ SELECT lower(public.unaccent('public.unaccent'::regdictionary, $1)) $$"
+    )
+    for name, column in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON vocabulary USING gin (search_key({column}) gin_trgm_ops)")
+
+    # Core functions only: the acute accent (U+0301) and diaeresis (U+0308) are
+    # stripped from the decomposed text
+    op.execute(
+        "CREATE FUNCTION duplicate_key(text) RETURNS text "
+        "LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE "
+        "AS $$ SELECT normalize(regexp_replace(normalize(lower($1), NFD), '[\\u0301\\u0308]', '', 'g'), NFC) $$"
+    )
+    op.execute(f"CREATE INDEX {DUPLICATE_INDEX} ON vocabulary (user_id, duplicate_key(word_spanish))")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.drop_index(DUPLICATE_INDEX, table_name="vocabulary")
+    op.execute("DROP FUNCTION duplicate_key(text)")
+    for name in INDEXES:
+        op.drop_index(name, table_name="vocabulary")
+    op.execute("DROP FUNCTION search_key(text)")
+    # The extensions stay: other objects may have come to depend on them
@@ -0,0 +1,111 @@
+"""
+Database models
+The schema itself is owned by the Alembic migrations in migrations/; keep
+these definitions in step with them.
+"""
+
+from sqlalchemy import Column, Integer, String, Boolean, Text, ForeignKey, DateTime, Date, Index, CheckConstraint
+from sqlalchemy.orm import declarative_base, relationship
+from datetime import datetime
+
+Base = declarative_base()
+
+class User(Base):
+    __tablename__ = "users"
+    __table_args__ = (
+        CheckConstraint("native_language IN ('en', 'ua')", name="users_native_language_check"),
+    )
+    id = Column(Integer, primary_key=True)
+    username = Column(String(100), unique=True, nullable=False)
+    native_language = Column(String(10), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    vocabulary = relationship("Vocabulary", back_populates="user", passive_deletes=True)
+    learning_sessions = relationship("LearningSession", back_populates="user", passive_deletes=True)
+
+class Vocabulary(Base):
+    __tablename__ = "vocabulary"
+    __table_args__ = (
+        # Per-user listings and review scheduling (least recently reviewed first)
+        Index("idx_vocabulary_user_last_reviewed", "user_id", "last_reviewed"),
+        Index("idx_vocabulary_word_spanish", "word_spanish"),
+        # Postgres also has GIN trigram indexes on search_key(word_spanish) and
+        # search_key(word_native) for search (migration 0005, see search.py)
+    )
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    word_spanish = Column(String(255), nullable=False)
+    word_native = Column(String(255), nullable=False)
+    word_type = Column(String(50), nullable=False)
+    is_verb = Column(Boolean, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_reviewed = Column(DateTime, nullable=True)
+    times_correct = Column(Integer, default=0)
+    times_incorrect = Column(Integer, default=0)
+    user = relationship("User", back_populates="vocabulary")
+    verb_conjugation = relationship("VerbConjugation", back_populates="vocabulary", uselist=False, passive_deletes=True)
+    learning_sessions = relationship("LearningSession", back_populates="vocabulary", passive_deletes=True)
+
+class VerbConjugation(Base):
+    __tablename__ = "verb_conjugations"
+    __table_args__ = (
+        # One conjugation per vocabulary entry
+        Index("uq_verb_conjugations_vocabulary_id", "vocabulary_id", unique=True),
+    )
+    id = Column(Integer, primary_key=True)
+    vocabulary_id = Column(Integer, ForeignKey("vocabulary.id", ondelete="CASCADE"), nullable=False)
+    yo = Column(String(255), nullable=False)
+    tu = Column(String(255), nullable=False)
+    el_ella_usted = Column(String(255), nullable=False)
+    nosotros = Column(String(255), nullable=False)
+    vosotros = Column(String(255), nullable=False)
+    ellos_ellas_ustedes = Column(String(255), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    vocabulary = relationship("Vocabulary", back_populates="verb_conjugation")
+
+class LearningSession(Base):
+    # On Postgres this table is partitioned by month on session_date and its
+    # primary key is (id, session_date); see migration 0004 and retention.py
+    __tablename__ = "learning_sessions"
+    __table_args__ = (
+        # A user's answer history in time order
+        Index("idx_learning_sessions_user_date", "user_id", "session_date"),
+        Index("idx_learning_sessions_vocabulary_id", "vocabulary_id"),
+    )
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    vocabulary_id = Column(Integer, ForeignKey("vocabulary.id", ondelete="CASCADE"), nullable=False)
+    user_answer = Column(Text)
+    correct_answer = Column(Text)
+    is_correct = Column(Boolean)
+    explanation = Column(Text)
+    session_date = Column(DateTime, nullable=False, default=datetime.utcnow)
+    user = relationship("User", back_populates="learning_sessions")
+    vocabulary = relationship("Vocabulary", back_populates="learning_sessions")
+
+# Progress aggregates, maintained by stats.record_answer() on every answer so
+# reading them never touches learning_sessions (see stats.py)
+
+class UserStats(Base):
+    __tablename__ = "user_stats"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    answers = Column(Integer, nullable=False, default=0)
+    correct = Column(Integer, nullable=False, default=0)
+    current_streak = Column(Integer, nullable=False, default=0)
+    longest_streak = Column(Integer, nullable=False, default=0)
+    last_active_day = Column(Date, nullable=True)
+
+class UserDailyStats(Base):
+    __tablename__ = "user_daily_stats"
+    # The primary key (user_id, day, word_type) also serves per-user date ranges
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    word_type = Column(String(50), primary_key=True)
+    answers = Column(Integer, nullable=False, default=0)
+    correct = Column(Integer, nullable=False, default=0)
+
+class UserWordTypeStats(Base):
+    __tablename__ = "user_word_type_stats"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    word_type = Column(String(50), primary_key=True)
+    answers = Column(Integer, nullable=False, default=0)
+    correct = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,209 @@
+"""
+learning_sessions partition maintenance and retention
+Run daily (the `maintenance` service in docker-compose does):
+
+    python retention.py [--keep-months 12] [--months-ahead 3] [--archive-dir archive]
+
+1. Creates the monthly partitions for the coming months, moving any rows the
+   default partition already holds for them.
+2. For every month older than the retention window: writes the raw rows to
+   <archive-dir>/learning_sessions_YYYY_MM.jsonl.gz and then drops the month's
+   partition. Each step is idempotent, so an interrupted run is simply
+   repeated. The progress aggregates (see stats.py) were kept up to date as
+   the answers came in and are left alone: recomputing a user's totals here
+   would race with their new answers.
+
+On databases without partitioning (SQLite in development) step 1 is skipped
+and expired months are deleted instead of dropped.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from models import LearningSession
+
+SESSION_RETENTION_MONTHS = int(os.getenv("SESSION_RETENTION_MONTHS", "12"))
+SESSION_PARTITIONS_AHEAD = int(os.getenv("SESSION_PARTITIONS_AHEAD", "3"))
+SESSION_ARCHIVE_DIR = os.getenv("SESSION_ARCHIVE_DIR", "archive")
+
+DEFAULT_PARTITION = "learning_sessions_default"
+MONTHLY_PARTITION = re.compile(r"^learning_sessions_(\d{4})_(\d{2})$")
+ARCHIVE_BATCH = 5000
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"learning_sessions_{month:%Y_%m}"
+
+
+def _bounds(month: date):
+    return datetime.combine(month, time.min), datetime.combine(add_months(month, 1), time.min)
+
+
+def is_partitioned(db: Session) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(db.execute(text(
+        "SELECT 1 FROM pg_class WHERE relname = 'learning_sessions' AND relkind = 'p'"
+    )).scalar())
+
+
+def list_partitions(db: Session) -> List[date]:
+    """Months that have their own partition, oldest first"""
+    names = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'learning_sessions'::regclass"
+    )).scalars()
+    months = []
+    for name in names:
+        match = MONTHLY_PARTITION.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def ensure_partitions(db: Session, months_ahead: int = SESSION_PARTITIONS_AHEAD,
+                      today: Optional[date] = None) -> List[str]:
+    """Create the partitions for this month and the next `months_ahead` months.
+
+    Rows that already landed in the default partition for a new month are
+    moved into it before it is attached, so attaching never fails.
+    """
+    current = (today or datetime.utcnow().date()).replace(day=1)
+    existing = set(list_partitions(db))
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if month in existing:
+            continue
+        name = partition_name(month)
+        lower, upper = _bounds(month)
+        bounds = {"lower": lower, "upper": upper}
+        db.execute(text(f"CREATE TABLE {name} (LIKE learning_sessions INCLUDING DEFAULTS)"))
+        db.execute(text(
+            f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} "
+            "WHERE session_date >= :lower AND session_date < :upper"
+        ), bounds)
+        db.execute(text(
+            f"DELETE FROM {DEFAULT_PARTITION} WHERE session_date >= :lower AND session_date < :upper"
+        ), bounds)
+        db.execute(text(
+            f"ALTER TABLE learning_sessions ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        ))
+        db.commit()
+        created.append(name)
+    return created
+
+
+def expired_months(db: Session, cutoff: date, partitioned: bool) -> List[date]:
+    """Months before `cutoff` that still hold raw rows or a partition"""
+    months = set(month for month in list_partitions(db) if month < cutoff) if partitioned else set()
+    # Stray rows: the default partition on Postgres, the whole table elsewhere
+    table = DEFAULT_PARTITION if partitioned else "learning_sessions"
+    oldest = db.execute(
+        text(f"SELECT MIN(session_date) FROM {table} WHERE session_date < :cutoff"),
+        {"cutoff": datetime.combine(cutoff, time.min)}
+    ).scalar()
+    if oldest is not None:
+        if isinstance(oldest, str):
+            oldest = datetime.fromisoformat(oldest)
+        month = oldest.date().replace(day=1)
+        while month < cutoff:
+            months.add(month)
+            month = add_months(month, 1)
+    return sorted(months)
+
+
+def archive_month(db: Session, month: date, archive_dir: str) -> int:
+    """Write a month of raw sessions to a gzipped JSON Lines file; returns the row count"""
+    lower, upper = _bounds(month)
+    path = Path(archive_dir) / f"{partition_name(month)}.jsonl.gz"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(".partial")
+    columns = [column.name for column in LearningSession.__table__.columns]
+
+    rows = 0
+    result = db.execute(
+        LearningSession.__table__.select()
+        .where(LearningSession.session_date >= lower, LearningSession.session_date < upper)
+        .order_by(LearningSession.session_date, LearningSession.id)
+        .execution_options(yield_per=ARCHIVE_BATCH)
+    )
+    with gzip.open(partial, "wt", encoding="utf-8") as archive:
+        for row in result:
+            record = dict(zip(columns, row))
+            record["session_date"] = record["session_date"].isoformat()
+            archive.write(json.dumps(record, ensure_ascii=False) + "\n")
+            rows += 1
+        archive.flush()
+        os.fsync(archive.fileno())
+    # Only a complete archive ever carries the final name
+    os.replace(partial, path)
+    db.commit()
+    return rows
+
+
+def drop_month(db: Session, month: date, partitioned: bool):
+    lower, upper = _bounds(month)
+    if partitioned and month in list_partitions(db):
+        name = partition_name(month)
+        db.execute(text(f"ALTER TABLE learning_sessions DETACH PARTITION {name}"))
+        db.execute(text(f"DROP TABLE {name}"))
+    # Rows of the month outside its own partition (or in an unpartitioned table)
+    db.query(LearningSession).filter(
+        LearningSession.session_date >= lower,
+        LearningSession.session_date < upper
+    ).delete(synchronize_session=False)
+    db.commit()
+
+
+def apply_retention(db: Session, keep_months: int = SESSION_RETENTION_MONTHS,
+                    archive_dir: str = SESSION_ARCHIVE_DIR, today: Optional[date] = None) -> List[dict]:
+    """Archive and drop every month older than the last `keep_months` months"""
+    cutoff = add_months((today or datetime.utcnow().date()).replace(day=1), -keep_months)
+    partitioned = is_partitioned(db)
+    report = []
+    for month in expired_months(db, cutoff, partitioned):
+        archived = archive_month(db, month, archive_dir)
+        drop_month(db, month, partitioned)
+        report.append({"month": month, "rows": archived})
+    return report
+
+
+def cli():
+    parser = argparse.ArgumentParser(description="learning_sessions partition maintenance and retention")
+    parser.add_argument("--keep-months", type=int, default=SESSION_RETENTION_MONTHS,
+                        help="Months of raw sessions kept before the current month")
+    parser.add_argument("--months-ahead", type=int, default=SESSION_PARTITIONS_AHEAD)
+    parser.add_argument("--archive-dir", default=SESSION_ARCHIVE_DIR)
+    args = parser.parse_args()
+
+    from main import SessionLocal
+    db = SessionLocal()
+    try:
+        if is_partitioned(db):
+            for name in ensure_partitions(db, args.months_ahead):
+                print(f"Created partition {name}")
+        for month in apply_retention(db, args.keep_months, args.archive_dir):
+            print(f"{month['month']:%Y-%m}: archived and dropped {month['rows']} sessions")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    cli()
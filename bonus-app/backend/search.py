@@ -0,0 +1,181 @@
+"""
+Vocabulary search and duplicate detection
+Search compares words by their search key: lower case, all accents removed,
+so "arbol" finds "Árbol" and "ano" finds "año". Search matches substrings of
+the key (prefix search as the user types) and close misspellings, found and
+ranked by pg_trgm's trigram measures: similarity() of the whole word
+(misspellings, "prro" for "perro") and word_similarity() of the query to part
+of it (a word inside a phrase, "roj" in "casa roja").
+
+Duplicates are found by a stricter duplicate key that only drops acute
+accents and diaereses: "Árbol" and "arbol" are the same word, but the tilde
+stays, since "año" and "ano" (or "peña" and "pena") are different words.
+The local answer grader compares answers by the same key.
+
+- Postgres: search_key() and duplicate_key() are immutable SQL functions
+  (migration 0005). GIN trigram indexes on search_key(word_spanish) and
+  search_key(word_native) serve LIKE, `%` and `<%`; a B-tree index on
+  (user_id, duplicate_key(word_spanish)) serves the duplicate lookup.
+- SQLite (development): both functions are registered on each connection,
+  and search scores the user's words in memory with the same trigram measure.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import case, event, func, literal, or_, select
+from sqlalchemy.orm import Session
+
+from models import Vocabulary
+
+# pg_trgm's default similarity_threshold and word_similarity_threshold, which `%` and `<%` use
+SIMILARITY_THRESHOLD = 0.3
+WORD_SIMILARITY_THRESHOLD = 0.6
+
+WORD = re.compile(r"[^\W_]+")
+
+# Combining marks the duplicate key drops: acute accent and diaeresis
+DUPLICATE_MARKS = {"\u0301", "\u0308"}
+
+
+def search_key(text: str) -> str:
+    """What unaccent() and lower() make of `text`"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def duplicate_key(text: str) -> str:
+    """What the duplicate_key() SQL function makes of `text`: lower case without acute accents and diaereses"""
+    decomposed = unicodedata.normalize("NFD", text.lower())
+    return unicodedata.normalize("NFC", "".join(char for char in decomposed if char not in DUPLICATE_MARKS))
+
+
+def install(engine):
+    """Make search_key() and duplicate_key() callable from SQL on SQLite connections"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def register(connection, _):
+        connection.create_function("search_key", 1, search_key, deterministic=True)
+        connection.create_function("duplicate_key", 1, duplicate_key, deterministic=True)
+
+
+@lru_cache(maxsize=65536)
+def _trigrams(key: str) -> Tuple[str, ...]:
+    """pg_trgm's trigrams, in order: each word padded with two spaces in front and one behind"""
+    trigrams = []
+    for word in WORD.findall(key):
+        padded = f"  {word} "
+        trigrams.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return tuple(trigrams)
+
+
+def similarity(query_key: str, key: str) -> float:
+    """pg_trgm's similarity(): shared trigrams over all trigrams of the two"""
+    wanted, trigrams = set(_trigrams(query_key)), set(_trigrams(key))
+    if not wanted or not trigrams:
+        return 0.0
+    common = len(wanted & trigrams)
+    return common / (len(wanted) + len(trigrams) - common)
+
+
+def word_similarity(query_key: str, key: str) -> float:
+    """pg_trgm's word_similarity(): the best trigram similarity of the query to any extent of `key`"""
+    wanted = set(_trigrams(query_key))
+    trigrams = _trigrams(key)
+    best = 0.0
+    for start in range(len(trigrams)):
+        if trigrams[start] not in wanted:
+            continue
+        seen = set()
+        for trigram in trigrams[start:]:
+            seen.add(trigram)
+            common = len(seen & wanted)
+            best = max(best, common / (len(wanted) + len(seen) - common))
+    return best
+
+
+def find_duplicate(db: Session, user_id: int, word_spanish: str) -> Optional[Vocabulary]:
+    """The user's existing entry for this word, ignoring case, acute accents and diaereses"""
+    return db.scalars(
+        select(Vocabulary)
+        .where(Vocabulary.user_id == user_id,
+               func.duplicate_key(Vocabulary.word_spanish) == duplicate_key(word_spanish))
+        .limit(1)
+    ).first()
+
+
+def existing_keys(db: Session, user_id: int, words: Iterable[str]) -> Set[str]:
+    """Duplicate keys of those of `words` the user already has, in one query"""
+    keys = {duplicate_key(word) for word in words}
+    if not keys:
+        return set()
+    return {duplicate_key(word) for word in db.scalars(
+        select(Vocabulary.word_spanish)
+        .where(Vocabulary.user_id == user_id, func.duplicate_key(Vocabulary.word_spanish).in_(keys))
+    )}
+
+
+def search(db: Session, user_id: int, query: str, limit: int) -> List[Tuple[Vocabulary, float]]:
+    """The user's best matches for `query` in either language, with their similarity"""
+    key = search_key(query.strip())
+    if db.get_bind().dialect.name == "postgresql":
+        return _search_postgres(db, user_id, key, limit)
+    return _search_in_memory(db, user_id, key, limit)
+
+
+def _search_postgres(db: Session, user_id: int, key: str, limit: int) -> List[Tuple[Vocabulary, float]]:
+    spanish, native = func.search_key(Vocabulary.word_spanish), func.search_key(Vocabulary.word_native)
+    score = func.greatest(
+        func.similarity(key, spanish), func.similarity(key, native),
+        func.word_similarity(key, spanish), func.word_similarity(key, native),
+    )
+    rank = case(
+        (or_(spanish == key, native == key), 0),
+        (or_(spanish.startswith(key, autoescape=True), native.startswith(key, autoescape=True)), 1),
+        else_=2,
+    )
+    rows = db.execute(
+        select(Vocabulary, score)
+        .where(
+            Vocabulary.user_id == user_id,
+            or_(
+                spanish.contains(key, autoescape=True),
+                native.contains(key, autoescape=True),
+                spanish.op("%")(key),
+                native.op("%")(key),
+                literal(key).op("<%")(spanish),
+                literal(key).op("<%")(native),
+            )
+        )
+        .order_by(rank, score.desc(), Vocabulary.word_spanish, Vocabulary.id)
+        .limit(limit)
+    )
+    return [(vocab, float(similarity)) for vocab, similarity in rows]
+
+
+def _search_in_memory(db: Session, user_id: int, key: str, limit: int) -> List[Tuple[Vocabulary, float]]:
+    matches = []
+    for vocab_id, word_spanish, word_native in db.execute(
+        select(Vocabulary.id, Vocabulary.word_spanish, Vocabulary.word_native).where(Vocabulary.user_id == user_id)
+    ):
+        keys = search_key(word_spanish), search_key(word_native)
+        whole = max(similarity(key, candidate) for candidate in keys)
+        part = max(word_similarity(key, candidate) for candidate in keys)
+        if (not any(key in candidate for candidate in keys)
+                and whole < SIMILARITY_THRESHOLD and part < WORD_SIMILARITY_THRESHOLD):
+            continue
+        score = max(whole, part)
+        rank = 0 if key in keys else 1 if any(candidate.startswith(key) for candidate in keys) else 2
+        matches.append((rank, -score, word_spanish, vocab_id, score))
+    matches = sorted(matches)[:limit]
+    if not matches:
+        return []
+
+    vocabulary = {vocab.id: vocab for vocab in db.scalars(
+        select(Vocabulary).where(Vocabulary.id.in_([match[3] for match in matches]))
+    )}
+    return [(vocabulary[match[3]], match[4]) for match in matches]
@@ -0,0 +1,285 @@
+"""
+Per-user progress statistics
+Aggregates are updated incrementally on every answer, so reading them costs
+the same however long a user's learning_sessions history is:
+
+- user_stats: totals, current and longest daily streak
+- user_daily_stats: answers and correct answers per day and word type
+- user_word_type_stats: the same per word type, over all time
+
+Hardest words come from the per-word counters on vocabulary. `rebuild()`
+recomputes the aggregates from learning_sessions for backfills:
+
+    python stats.py rebuild [--user-id 1] [--since 2026-01-01]
+"""
+
+import argparse
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models import LearningSession, UserDailyStats, UserStats, UserWordTypeStats, Vocabulary
+
+# Keeps "IN (...)" lists well below SQLite's bound parameter limit
+DELETE_CHUNK = 500
+
+
+def dialect_insert(db: Session):
+    """The dialect's INSERT construct, which supports ON CONFLICT DO UPDATE"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    raise NotImplementedError(f"Progress statistics do not support {dialect}")
+
+
+def _word_type(word_type: Optional[str]) -> str:
+    return (word_type or "unknown").lower()
+
+
+def _accuracy(correct: int, answers: int) -> float:
+    return round(correct / answers, 3) if answers else 0.0
+
+
+def record_answer(db: Session, user_id: int, word_type: str, is_correct: bool, answered_at: datetime):
+    """Count one answer in every aggregate; runs in the caller's transaction"""
+    apply_answer_deltas(db, user_id, answered_at.date(), word_type, 1, 1 if is_correct else 0)
+
+
+def apply_answer_deltas(db: Session, user_id: int, day: date, word_type: str, answers: int, correct: int):
+    """Add `answers` answers, `correct` of them correct, given on `day` to every aggregate.
+
+    Each aggregate is a single upsert whose increments are computed by the
+    database, so concurrent answers from the same user never lose updates.
+    Batched writers merge their answers per (user, day, word type) first and
+    apply the days in order.
+    """
+    insert = dialect_insert(db)
+    word_type = _word_type(word_type)
+
+    for model, keys in (
+        (UserDailyStats, {"user_id": user_id, "day": day, "word_type": word_type}),
+        (UserWordTypeStats, {"user_id": user_id, "word_type": word_type}),
+    ):
+        stmt = insert(model).values(**keys, answers=answers, correct=correct)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={"answers": model.answers + answers, "correct": model.correct + correct}
+        ))
+
+    last_day = UserStats.last_active_day
+    streak = case(
+        # Same day, or a late write for an earlier day: the streak is unchanged
+        (last_day >= day, UserStats.current_streak),
+        (last_day == day - timedelta(days=1), UserStats.current_streak + 1),
+        else_=1
+    )
+    stmt = insert(UserStats).values(
+        user_id=user_id,
+        answers=answers,
+        correct=correct,
+        current_streak=1,
+        longest_streak=1,
+        last_active_day=day
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            "answers": UserStats.answers + answers,
+            "correct": UserStats.correct + correct,
+            "current_streak": streak,
+            "longest_streak": case((streak > UserStats.longest_streak, streak), else_=UserStats.longest_streak),
+            "last_active_day": case((last_day >= day, last_day), else_=day),
+        }
+    ))
+
+
+def get_user_stats(db: Session, user_id: int, days: int = 30, hardest: int = 10,
+                   today: Optional[date] = None) -> dict:
+    """Totals, streaks, the last `days` daily rollups, per-word-type accuracy and hardest words"""
+    today = today or datetime.utcnow().date()
+    totals = db.get(UserStats, user_id)
+    answers = totals.answers if totals else 0
+    correct = totals.correct if totals else 0
+    last_active_day = totals.last_active_day if totals else None
+    # A streak survives until the end of the day after the last answer
+    streak_alive = last_active_day is not None and last_active_day >= today - timedelta(days=1)
+
+    daily = (
+        db.query(UserDailyStats.day, func.sum(UserDailyStats.answers), func.sum(UserDailyStats.correct))
+        .filter(UserDailyStats.user_id == user_id, UserDailyStats.day >= today - timedelta(days=days - 1))
+        .group_by(UserDailyStats.day)
+        .order_by(UserDailyStats.day)
+        .all()
+    )
+    by_word_type = (
+        db.query(UserWordTypeStats)
+        .filter(UserWordTypeStats.user_id == user_id)
+        .order_by(UserWordTypeStats.answers.desc(), UserWordTypeStats.word_type)
+        .all()
+    )
+    hardest_words = (
+        db.query(Vocabulary)
+        .filter(Vocabulary.user_id == user_id, Vocabulary.times_incorrect > 0)
+        .order_by(Vocabulary.times_incorrect.desc(), Vocabulary.times_correct, Vocabulary.id)
+        .limit(hardest)
+        .all()
+    )
+
+    return {
+        "user_id": user_id,
+        "total_answers": answers,
+        "correct_answers": correct,
+        "accuracy": _accuracy(correct, answers),
+        "current_streak": totals.current_streak if streak_alive else 0,
+        "longest_streak": totals.longest_streak if totals else 0,
+        "last_active_day": last_active_day,
+        "daily": [
+            {"day": day, "answers": day_answers, "correct": day_correct,
+             "accuracy": _accuracy(day_correct, day_answers)}
+            for day, day_answers, day_correct in daily
+        ],
+        "by_word_type": [
+            {"word_type": row.word_type, "answers": row.answers, "correct": row.correct,
+             "accuracy": _accuracy(row.correct, row.answers)}
+            for row in by_word_type
+        ],
+        "hardest_words": [
+            {"vocabulary_id": vocab.id, "word_spanish": vocab.word_spanish, "word_native": vocab.word_native,
+             "times_correct": vocab.times_correct, "times_incorrect": vocab.times_incorrect,
+             "accuracy": _accuracy(vocab.times_correct, vocab.times_correct + vocab.times_incorrect)}
+            for vocab in hardest_words
+        ],
+    }
+
+
+def _streaks(days: List[date]) -> Tuple[int, int]:
+    """(streak ending on the last day, longest streak) for sorted distinct days"""
+    current = longest = 0
+    previous = None
+    for day in days:
+        current = current + 1 if previous is not None and day - previous == timedelta(days=1) else 1
+        longest = max(longest, current)
+        previous = day
+    return current, longest
+
+
+def _as_date(value) -> date:
+    # SQLite's date() returns text
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def _chunks(items: List, size: int) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def refresh_totals(db: Session, user_id: int):
+    """Recompute user_stats and user_word_type_stats from a user's daily rows"""
+    db.query(UserWordTypeStats).filter(UserWordTypeStats.user_id == user_id).delete(synchronize_session=False)
+    by_type = (
+        db.query(UserDailyStats.word_type, func.sum(UserDailyStats.answers), func.sum(UserDailyStats.correct))
+        .filter(UserDailyStats.user_id == user_id)
+        .group_by(UserDailyStats.word_type)
+        .all()
+    )
+    db.add_all([
+        UserWordTypeStats(user_id=user_id, word_type=word_type, answers=answers, correct=correct)
+        for word_type, answers, correct in by_type
+    ])
+
+    days = [
+        _as_date(day) for (day,) in
+        db.query(UserDailyStats.day)
+        .filter(UserDailyStats.user_id == user_id, UserDailyStats.answers > 0)
+        .distinct()
+        .order_by(UserDailyStats.day)
+    ]
+    current, longest = _streaks(days)
+    db.merge(UserStats(
+        user_id=user_id,
+        answers=sum(answers for _, answers, _ in by_type),
+        correct=sum(correct for _, _, correct in by_type),
+        current_streak=current,
+        longest_streak=longest,
+        last_active_day=days[-1] if days else None
+    ))
+
+
+def rebuild(db: Session, user_id: Optional[int] = None, since: Optional[date] = None,
+            until: Optional[date] = None) -> dict:
+    """Recompute the aggregates from learning_sessions, committing once per user.
+
+    `since` and `until` limit the days rebuilt to since <= day < until.
+
+    Only days that still have raw rows are overwritten, so days whose sessions
+    were archived by the retention job keep their aggregates.
+    """
+    day_col = func.date(LearningSession.session_date)
+    word_type_col = func.lower(Vocabulary.word_type)
+    query = (
+        db.query(
+            LearningSession.user_id,
+            day_col,
+            word_type_col,
+            func.count(LearningSession.id),
+            func.sum(case((LearningSession.is_correct, 1), else_=0))
+        )
+        .join(Vocabulary, Vocabulary.id == LearningSession.vocabulary_id)
+        .group_by(LearningSession.user_id, day_col, word_type_col)
+    )
+    if user_id is not None:
+        query = query.filter(LearningSession.user_id == user_id)
+    if since is not None:
+        query = query.filter(LearningSession.session_date >= datetime.combine(since, time.min))
+    if until is not None:
+        query = query.filter(LearningSession.session_date < datetime.combine(until, time.min))
+
+    raw: Dict[int, Dict[date, List[Tuple[str, int, int]]]] = defaultdict(lambda: defaultdict(list))
+    for row_user_id, day, word_type, answers, correct in query:
+        raw[row_user_id][_as_date(day)].append((_word_type(word_type), answers, correct or 0))
+
+    rebuilt_days = 0
+    for row_user_id, by_day in raw.items():
+        for days in _chunks(sorted(by_day), DELETE_CHUNK):
+            db.query(UserDailyStats).filter(
+                UserDailyStats.user_id == row_user_id,
+                UserDailyStats.day.in_(days)
+            ).delete(synchronize_session=False)
+        db.add_all([
+            UserDailyStats(user_id=row_user_id, day=day, word_type=word_type, answers=answers, correct=correct)
+            for day, rows in by_day.items()
+            for word_type, answers, correct in rows
+        ])
+        db.flush()
+        refresh_totals(db, row_user_id)
+        db.commit()
+        rebuilt_days += len(by_day)
+
+    return {"users": len(raw), "days": rebuilt_days}
+
+
+def cli():
+    parser = argparse.ArgumentParser(description="Progress statistics maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rebuild_parser = commands.add_parser("rebuild", help="Recompute the aggregates from learning_sessions")
+    rebuild_parser.add_argument("--user-id", type=int, help="Only this user (default: everyone)")
+    rebuild_parser.add_argument("--since", type=date.fromisoformat, help="Only days from YYYY-MM-DD on")
+    args = parser.parse_args()
+
+    from main import SessionLocal
+    db = SessionLocal()
+    try:
+        result = rebuild(db, user_id=args.user_id, since=args.since)
+    finally:
+        db.close()
+    print(f"Rebuilt {result['days']} user-days for {result['users']} users")
+
+
+if __name__ == "__main__":
+    cli()
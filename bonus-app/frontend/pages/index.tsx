@@ -1,8 +1,12 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
 import axios from 'axios'
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
 
+// Learning cards are fetched in batches and kept in a local queue
+const QUEUE_SIZE = 10
+const REFILL_AT = 3
+
 interface User {
   id: number
   username: string
@@ -39,6 +43,20 @@ interface VerbConjugation {
   ellos_ellas_ustedes: string
 }
 
+interface QuestionCard extends LearningQuestion {
+  word_type: string
+  is_verb: boolean
+  conjugation: VerbConjugation | null
+}
+
+interface PendingAnswer {
+  vocabulary_id: number
+  user_answer: string
+}
+
+const normalizeAnswer = (text: string) =>
+  text.trim().toLowerCase().normalize('NFD').replace(/[\u0301\u0308]/g, '').normalize('NFC')
+
 export default function Home() {
   const [user, setUser] = useState<User | null>(null)
   const [username, setUsername] = useState('')
@@ -50,10 +68,17 @@ export default function Home() {
   const [success, setSuccess] = useState('')
 
   // Learning state
-  const [currentQuestion, setCurrentQuestion] = useState<LearningQuestion | null>(null)
+  const [currentQuestion, setCurrentQuestion] = useState<QuestionCard | null>(null)
   const [userAnswer, setUserAnswer] = useState('')
   const [learningFeedback, setLearningFeedback] = useState<LearningResponse | null>(null)
   const [verbConjugation, setVerbConjugation] = useState<VerbConjugation | null>(null)
+  const queue = useRef<QuestionCard[]>([])
+  const refilling = useRef<Promise<void> | null>(null)
+  // Cards recently shown: the server may not have seen their answers yet, so a
+  // refill must not offer them again
+  const recentlyServed = useRef<number[]>([])
+  // Answers that could not be sent during a network stall, resent later
+  const pendingAnswers = useRef<PendingAnswer[]>([])
 
   // Add word state
   const [wordSpanish, setWordSpanish] = useState('')
@@ -166,16 +191,60 @@ export default function Home() {
     }
   }
 
+  const refillQueue = () => {
+    if (!user) return Promise.resolve()
+    if (!refilling.current) {
+      const exclude = [...queue.current.map(card => card.vocabulary_id), ...recentlyServed.current]
+      refilling.current = axios.get(`${API_URL}/api/learning/${user.id}/questions`, {
+        params: { count: QUEUE_SIZE - queue.current.length, exclude },
+        paramsSerializer: { indexes: null }
+      }).then(response => {
+        queue.current.push(...response.data)
+      }).finally(() => {
+        refilling.current = null
+      })
+    }
+    return refilling.current
+  }
+
+  const sendPendingAnswers = async () => {
+    if (!user) return
+    while (pendingAnswers.current.length > 0) {
+      try {
+        await axios.post(`${API_URL}/api/learning/${user.id}/answer`, pendingAnswers.current[0])
+      } catch (err: any) {
+        if (!err.response) return  // still offline; try again after the next answer
+      }
+      pendingAnswers.current.shift()
+    }
+  }
+
   const startLearning = async () => {
     if (!user) return
-    setLoading(true)
     setError('')
     setLearningFeedback(null)
     setVerbConjugation(null)
     setUserAnswer('')
     try {
-      const response = await axios.get(`${API_URL}/api/learning/${user.id}/question`)
-      setCurrentQuestion(response.data)
+      let card = queue.current.shift()
+      if (!card) {
+        setLoading(true)
+        await refillQueue()
+        card = queue.current.shift()
+      }
+      if (!card) {
+        // Small deck: every word was just shown, so start the rotation again
+        recentlyServed.current = []
+        await refillQueue()
+        card = queue.current.shift()
+      }
+      if (card) {
+        recentlyServed.current = [...recentlyServed.current, card.vocabulary_id].slice(-QUEUE_SIZE)
+      }
+      setCurrentQuestion(card || null)
+      if (queue.current.length <= REFILL_AT) {
+        refillQueue().catch(() => {})  // in the background; the queue covers a stall
+      }
     } catch (err: any) {
       setError(err.response?.data?.detail || 'Failed to get question')
     } finally {
@@ -183,6 +252,20 @@ export default function Home() {
     }
   }
 
+  const showConjugation = async (card: QuestionCard) => {
+    if (card.conjugation || !card.is_verb) {
+      setVerbConjugation(card.conjugation)
+      return
+    }
+    // Verbs without a stored conjugation that the server could not conjugate locally
+    try {
+      const response = await axios.get(`${API_URL}/api/vocabulary/${card.vocabulary_id}/conjugation`)
+      setVerbConjugation(response.data)
+    } catch (err) {
+      // Ignore conjugation errors
+    }
+  }
+
   const submitAnswer = async () => {
     if (!user || !currentQuestion || !userAnswer.trim()) {
       setError('Please enter an answer')
@@ -190,27 +273,26 @@ export default function Home() {
     }
     setLoading(true)
     setError('')
+    const answer = { vocabulary_id: currentQuestion.vocabulary_id, user_answer: userAnswer }
     try {
-      const response = await axios.post(`${API_URL}/api/learning/${user.id}/answer`, {
-        vocabulary_id: currentQuestion.vocabulary_id,
-        user_answer: userAnswer
-      })
+      const response = await axios.post(`${API_URL}/api/learning/${user.id}/answer`, answer)
       setLearningFeedback(response.data)
-      
-      // If it's a verb, get conjugation
-      const vocab = vocabulary.find(v => v.id === currentQuestion.vocabulary_id)
-      if (vocab?.is_verb) {
-        try {
-          const conjResponse = await axios.get(`${API_URL}/api/vocabulary/${vocab.id}/conjugation`)
-          setVerbConjugation(conjResponse.data)
-        } catch (err) {
-          // Ignore conjugation errors
-        }
-      }
-      
-      loadVocabulary()
+      showConjugation(currentQuestion)
+      sendPendingAnswers()
     } catch (err: any) {
-      setError(err.response?.data?.detail || 'Failed to submit answer')
+      if (err.response) {
+        setError(err.response.data?.detail || 'Failed to submit answer')
+      } else {
+        // Network stall: grade locally against the card, send the answer later
+        pendingAnswers.current.push(answer)
+        const isCorrect = normalizeAnswer(userAnswer) === normalizeAnswer(currentQuestion.correct_answer)
+        setLearningFeedback({
+          is_correct: isCorrect,
+          correct_answer: currentQuestion.correct_answer,
+          explanation: 'You are offline; this answer will be saved when the connection is back.'
+        })
+        showConjugation(currentQuestion)
+      }
     } finally {
       setLoading(false)
     }